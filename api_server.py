@@ -1,143 +1,369 @@
-from flask import Flask, jsonify, request
-import requests
-from bs4 import BeautifulSoup
+from flask import Flask, jsonify, request, g, has_request_context
 from flask_cors import CORS
-import json
 import os
 import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-import pandas as pd
 import threading
-import random
+from nepse_snapshot import NepseSnapshot, CompanyList
+from nepse_state import StateHolder, EMPTY_CACHE, cache_entry
+from nepse_leaderboard import resolve_metric, DIRECTIONS
+from nepse_indicators import calculate_indicators, DEFAULT_PERIODS, IndicatorState
+from nepse_history import HistoryStore, bars_to_records, to_date_strings
+from nepse_http import conditional, ResponseCache, note_freshness, data_is_stale
+from nepse_fetch import fetch
+from nepse_crawler import CompanyCrawler, print_progress
+from nepse_cache import SingleFlight, LRUCache, NOT_FOUND
+from nepse_persist import CacheStore
+from nepse_archive import IntradayArchive
+from nepse_ticks import TickBuffers, downsample
+from nepse_stream import StreamHub
+from nepse_alerts import AlertEngine
+from nepse_parsers import (
+    parse_todays_price, parse_stock_list, parse_company_list,
+    parse_company_detail, parse_merolagani_summary, parse_nepalipaisa_summary, default_market_overview
+)
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
 
 # कन्फिगरेसन
-DATA_CACHE_FILE = 'nepse_data_cache.json'
-STOCKS_LIST_FILE = 'nepse_stocks_list.json'
+DATA_CACHE_FILE = 'nepse_data_cache.bin'
+STOCKS_LIST_FILE = 'nepse_stocks_list.bin'
+LEGACY_DATA_CACHE_FILE = 'nepse_data_cache.json'
+LEGACY_STOCKS_LIST_FILE = 'nepse_stocks_list.json'
+CACHE_WRITE_DELAY = 5  # रिफ्रेसपछि यति सेकेन्डभित्रका परिवर्तनहरू एकै पटक डिस्कमा लेख्ने
+HISTORY_DIR = 'nepse_history'
+# start_date नदिँदा इन्टरभल अनुसार यति दिनको बार (३/६/१२ महिने बारका लागि पर्याप्त बार आऊन्)
+HISTORY_DEFAULT_DAYS = {'1d': 30, '1w': 90, '1m': 180, '3m': 3 * 365, '6m': 5 * 365, '1y': 10 * 365}
+INTRADAY_DB = 'nepse_intraday.db'
+INTRADAY_READERS = 4  # इन्ट्राडे आर्काइभका read-only कनेक्सनहरू
+TICK_MAX_SYMBOLS = 512
+TICK_CAPACITY = 256  # सिम्बल अनुसार एक सेसनमा राखिने टिकहरू
+MAX_SPARKLINE_SYMBOLS = 100
+MAX_QUOTE_SYMBOLS = 200  # एउटा /quotes रिक्वेस्टमा बढीमा यति सिम्बल
+ALERTS_DB = 'nepse_alerts.db'
+MAX_IMPORT_ALERTS = 1000  # एउटा बल्क इम्पोर्टमा बढीमा यति अलर्ट
+
+# पुश स्ट्रिम (js/realtime_data.js को WebSocket प्रोटोकल)
+STREAM_HOST = '0.0.0.0'
+STREAM_PORT = 5001
 CACHE_EXPIRY = 15 * 60  # 15 मिनेट (सेकेन्डमा)
+STOCKS_LIST_EXPIRY = 24 * 60 * 60  # 24 घण्टा
+MAX_STALE = 60 * 60  # म्याद सकिएपछि पनि यति समयसम्म पुरानो डाटा तुरुन्तै दिने (सेकेन्डमा)
+REFRESH_WORKERS = 4
+
+# कम्पनी विवरण क्रलर सेटिङहरू
+COMPANY_CRAWL_CONCURRENCY = 2
+COMPANY_CRAWL_DELAY = 1.0  # सेकेन्ड
+COMPANY_CRAWL_CHECKPOINT = 'company_details_crawl.json'
+COMPANY_CRAWL_INTERVAL = 60 * 60  # यति समयमा एक पटक म्याद सकिन लागेका विवरणहरू मात्र फेरि क्रल गर्ने
+COMPANY_CRAWL_VERBOSE = False  # True भए हरेक सिम्बलको प्रगति प्रिन्ट गर्ने
+
+# कम्पनी विवरण क्यास (विवरण पेज दिनमा बढीमा एक पटक फेरिन्छ)
+COMPANY_DETAILS_EXPIRY = 24 * 60 * 60
+COMPANY_DETAILS_MAX_ENTRIES = 1000
+COMPANY_DETAILS_MAX_BYTES = 16 * 1024 * 1024
+COMPANY_DETAILS_NEGATIVE_TTL = CACHE_EXPIRY  # अवस्थित नभएको सिम्बल यति समयसम्म फेरि नखोज्ने
+
+# सम्झिने इन्डिकेटर स्टेटहरूको अधिकतम संख्या (हरेक रिफ्रेसमा सबै अपडेट हुन्छन्)
+INDICATOR_STATES_MAX_ENTRIES = 512
+
+# अपस्ट्रिम पेजहरू
+TODAYS_PRICE_URL = 'https://www.nepalstock.com/todays_price'
+STOCK_LIST_URL = 'https://www.nepalstock.com/company'
+COMPANY_LIST_URL = 'https://merolagani.com/CompanyList.aspx'
+MARKET_SUMMARY_URL = 'https://merolagani.com/MarketSummary.aspx'
+NEPALIPAISA_URL = 'https://www.nepalipaisa.com/'
+COMPANY_DETAIL_URL = 'https://merolagani.com/CompanyDetail.aspx?symbol={symbol}'
 MARKET_HOURS = {
     'open_time': '11:00',  # बिहान ११ बजे
     'close_time': '15:00'  # दिउँसो ३ बजे
 }
+# कारोबार हुने दिनहरू: आइतबार देखि बिहीबार (datetime.weekday मा सोमबार = 0, आइतबार = 6)
+TRADING_DAYS = frozenset({6, 0, 1, 2, 3})
 
 # ग्लोबल भेरिएबलहरू
-nepse_data_cache = {
-    'data': [],
-    'last_updated': 0
-}
-stocks_list_cache = {
-    'data': [],
-    'last_updated': 0
-}
-market_overview_cache = {
-    'data': {},
-    'last_updated': 0
-}
-companies_list_cache = {
-    'data': [],
-    'last_updated': 0
-}
-company_details_cache = {}
+# सबै क्यास र स्न्यापसटहरू एउटै अपरिवर्तनीय स्टेटमा (प्रकाशन गर्दा पूरै स्टेट साटिन्छ)
+state_holder = StateHolder()
+
+# सिम्बल अनुसार कम्पनी विवरण (MAX_STALE सम्म पुरानो विवरण पनि दिन मिल्ने गरी TTL)
+company_details_cache = LRUCache(
+    max_entries=COMPANY_DETAILS_MAX_ENTRIES,
+    max_bytes=COMPANY_DETAILS_MAX_BYTES,
+    ttl=COMPANY_DETAILS_EXPIRY + MAX_STALE,
+    negative_ttl=COMPANY_DETAILS_NEGATIVE_TTL
+)
+
+# सिम्बल अनुसार इन्क्रिमेन्टल इन्डिकेटर स्टेट (धेरै प्रयोग नभएका पहिले हटाइन्छन्)
+indicator_states = LRUCache(max_entries=INDICATOR_STATES_MAX_ENTRIES, max_bytes=None)
+
+# डिस्कमा रहेको दैनिक OHLCV स्टोर
+history_store = HistoryStore(HISTORY_DIR)
+
+# प्रकाशित हरेक todays_price स्न्यापसटको इन्ट्राडे आर्काइभ
+intraday_archive = IntradayArchive(INTRADAY_DB, INTRADAY_READERS)
+
+# हालको सेसनका सिम्बल अनुसार टिक रिङ बफरहरू (मेमोरी सुरुमै छुट्याइन्छ)
+tick_buffers = TickBuffers(TICK_MAX_SYMBOLS, TICK_CAPACITY)
+
+# सब्स्क्राइबरहरूलाई फेरिएका कोटहरू पुश गर्ने WebSocket सर्भर
+stream_hub = StreamHub(STREAM_HOST, STREAM_PORT)
+
+# सिम्बल अनुसार क्रमबद्ध थ्रेसहोल्ड इन्डेक्स सहितका मूल्य अलर्टहरू
+alert_engine = AlertEngine(ALERTS_DB)
 
-# क्यास फाइलहरू लोड गर्ने
+# भर्सन अनुसार सिरियलाइज गरिएका रेस्पोन्सहरू
+response_cache = ResponseCache()
+
+# क्यास फाइलहरू (फेरिएका मात्र, ब्याकग्राउन्डमा एकै पटक लेखिने)
+cache_store = CacheStore(
+    {'nepse_data': DATA_CACHE_FILE, 'stocks_list': STOCKS_LIST_FILE},
+    {'nepse_data': LEGACY_DATA_CACHE_FILE, 'stocks_list': LEGACY_STOCKS_LIST_FILE},
+    delay=CACHE_WRITE_DELAY
+)
+cache_loaded = False
+cache_load_lock = threading.Lock()
+
+# स्रोत अनुसार एकै पटक एउटा मात्र अपस्ट्रिम फेच
+upstream = SingleFlight()
+
+# क्यास फाइलहरू लोड गर्ने (पहिलो पटक स्टेट चाहिँदा मात्र, एक पटक)
 def load_cache_files():
-    global nepse_data_cache, stocks_list_cache
+    global cache_loaded
     
-    # NEPSE डाटा क्यास लोड गर्ने
-    if os.path.exists(DATA_CACHE_FILE):
-        try:
-            with open(DATA_CACHE_FILE, 'r') as f:
-                nepse_data_cache = json.load(f)
-        except:
-            nepse_data_cache = {'data': [], 'last_updated': 0}
+    if cache_loaded:
+        return
     
-    # स्टक्स लिस्ट क्यास लोड गर्ने
-    if os.path.exists(STOCKS_LIST_FILE):
-        try:
-            with open(STOCKS_LIST_FILE, 'r') as f:
-                stocks_list_cache = json.load(f)
-        except:
-            stocks_list_cache = {'data': [], 'last_updated': 0}
+    with cache_load_lock:
+        if cache_loaded:
+            return
+        
+        changes = {}
+        
+        # NEPSE डाटा क्यास लोड गर्ने
+        nepse_data = cache_store.load('nepse_data')
+        if nepse_data and nepse_data.get('data'):
+            changes['snapshot'] = NepseSnapshot(nepse_data['data'], nepse_data['last_updated'])
+            changes['nepse_data'] = cache_entry(nepse_data['data'], nepse_data['last_updated'])
+        
+        # स्टक्स लिस्ट क्यास लोड गर्ने
+        stocks_list = cache_store.load('stocks_list')
+        if stocks_list and stocks_list.get('data'):
+            changes['stocks_list'] = cache_entry(stocks_list['data'], stocks_list['last_updated'])
+        
+        # बीचमै रिफ्रेस भइसकेको भए नयाँ डाटामाथि पुरानो नलेख्ने
+        state = state_holder.current()
+        changes = {
+            name: value for name, value in changes.items()
+            if name == 'snapshot' or getattr(state, name)['last_updated'] < value['last_updated']
+        }
+        if 'nepse_data' not in changes:
+            changes.pop('snapshot', None)
+        
+        if changes:
+            state_holder.publish(**changes)
+        
+        cache_loaded = True
 
-# क्यास फाइलहरू सेभ गर्ने
-def save_cache_files():
-    # NEPSE डाटा क्यास सेभ गर्ने
-    with open(DATA_CACHE_FILE, 'w') as f:
-        json.dump(nepse_data_cache, f)
-    
-    # स्टक्स लिस्ट क्यास सेभ गर्ने
-    with open(STOCKS_LIST_FILE, 'w') as f:
-        json.dump(stocks_list_cache, f)
+# फेरिएका क्यासहरू सेभ गर्न चिन्ह लगाउने (ब्याकग्राउन्डमा लेखिन्छ)
+def save_cache_files(state, names):
+    for name in names:
+        cache_store.mark(name, getattr(state, name))
 
-# बजार खुला छ कि छैन जाँच गर्ने
-def is_market_open():
-    now = datetime.now()
+# कारोबार हुने दिन हो कि (आइतबार देखि बिहीबार)
+def is_trading_day(moment):
+    return moment.weekday() in TRADING_DAYS
+
+# टाइमस्ट्याम्पको समयमा कारोबार सेसन चलिरहेको थियो कि
+def session_open(timestamp):
+    moment = datetime.fromtimestamp(timestamp)
     
-    # शनिबार वा आइतबार हो भने बजार बन्द हुन्छ
-    if now.weekday() >= 5:  # 5 = शनिबार, 6 = आइतबार
+    # शुक्रबार वा शनिबार हो भने बजार बन्द हुन्छ
+    if not is_trading_day(moment):
         return False
     
     # समय जाँच
-    current_time = now.strftime('%H:%M')
+    current_time = moment.strftime('%H:%M')
     return MARKET_HOURS['open_time'] <= current_time <= MARKET_HOURS['close_time']
 
-# सबै NEPSE सूचीकृत शेयरहरू प्राप्त गर्ने
-def fetch_all_stocks():
-    global stocks_list_cache
+# बजार खुला छ कि छैन जाँच गर्ने
+def is_market_open():
+    return session_open(time.time())
+
+# टाइमस्ट्याम्पको दिन कारोबार सेसन सुरु भइसकेको थियो कि (बन्द भएपछिको समय पनि)
+def session_started(timestamp):
+    moment = datetime.fromtimestamp(timestamp)
+    return is_trading_day(moment) and moment.strftime('%H:%M') >= MARKET_HOURS['open_time']
+
+# क्यासको म्याद सकिएको छ कि छैन जाँच गर्ने
+def is_stale(cache, expiry, current_time):
+    return not cache['data'] or current_time - cache['last_updated'] >= expiry
+
+# रिक्वेस्टको स्टेट प्राप्त गर्ने
+# रिक्वेस्टमा पहिलो पटक पढ्दा हालको स्टेट पिन हुन्छ, त्यसैले भ्यालिडेटर (ETag) र रेस्पोन्स दुवैले
+# एउटै रिफ्रेसको डाटा र मेटाडाटा देख्छन्। रिक्वेस्ट बाहिर (ब्याकग्राउन्ड थ्रेड) सधैं नयाँ स्टेट।
+def current_state():
+    load_cache_files()
     
-    current_time = time.time()
+    if not has_request_context():
+        return state_holder.current()
     
-    # क्यास अवधि समाप्त नभएको छ भने क्यास डाटा फर्काउने
-    if stocks_list_cache['data'] and current_time - stocks_list_cache['last_updated'] < 24 * 60 * 60:  # 24 घण्टा
-        return stocks_list_cache['data']
+    if 'state' not in g:
+        g.state = state_holder.current()
     
-    try:
-        url = 'https://www.nepalstock.com/company'
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
+    return g.state
+
+# क्यासबाट डाटा दिने (stale-while-revalidate)
+# ताजा भए सिधै दिने, म्याद सकिएको तर MAX_STALE भित्र भए पुरानै डाटा तुरुन्त दिएर ब्याकग्राउन्डमा
+# रिफ्रेस गर्ने, MAX_STALE पनि नाघेको (वा डाटा नै नभएको) भए रिफ्रेस सकिन्जेल पर्खने
+def serve_cached(key, get_cache, expiry, refresh, *args):
+    cache = get_cache(current_state())
+    age = time.time() - cache['last_updated']
+    
+    if cache['data'] and age < expiry + MAX_STALE:
+        if age >= expiry:
+            upstream.background(key, refresh, *args)
         
-        soup = BeautifulSoup(response.text, 'html.parser')
+        note_freshness(age, age >= expiry)
+        return cache['data']
+    
+    # एकै पटक आएका रिक्वेस्टहरूले एउटै अपस्ट्रिम फेच साझा गर्ने
+    data = upstream.do(key, refresh, *args)
+    
+    # रिफ्रेसले नयाँ स्टेट प्रकाशित गरेको हुन सक्छ, त्यसैले रिक्वेस्टमा फेरि पिन गर्ने
+    if has_request_context():
+        g.pop('state', None)
+    
+    # रिफ्रेस असफल भई पुरानै डाटा फर्किएको हुन सक्छ
+    cache = get_cache(current_state())
+    if cache['data']:
+        age = time.time() - cache['last_updated']
+        note_freshness(age, age >= expiry)
+    
+    return data
+
+# अपस्ट्रिम पेज डाउनलोड गर्ने
+def download_page(url):
+    response = fetch(url)
+    response.raise_for_status()
+    return response.text
+
+# डाउनलोड र पार्स गर्ने कामहरू (वर्कर थ्रेडमा चल्न मिल्ने, ग्लोबल स्टेट नछुने)
+def download_nepse_data():
+    return parse_todays_price(download_page(TODAYS_PRICE_URL))
+
+def download_stock_list():
+    return parse_stock_list(download_page(STOCK_LIST_URL))
+
+def download_companies():
+    return parse_company_list(download_page(COMPANY_LIST_URL))
+
+# बजार अवलोकनबाट NEPSE इन्डेक्स सब्स्क्राइबरहरूलाई पठाउने
+def publish_market_index(market_overview):
+    stream_hub.publish_index(
+        'NEPSE',
+        market_overview['nepse_index'],
+        market_overview['nepse_change'],
+        market_overview['nepse_change_percent']
+    )
+
+# रिफ्रेसका नतिजाहरू एकै पटक प्रकाशित गर्ने
+def publish_refresh(results, current_time):
+    stock_data = results.get('nepse_data')
+    stocks = results.get('stocks_list')
+    market_overview = results.get('market_overview')
+    companies = results.get('companies')
+    
+    # स्क्र्याप असफल भएको बजार अवलोकन प्रकाशित नगर्ने
+    if market_overview and market_overview['data_source'] == 'default':
+        market_overview = None
+    
+    # स्न्यापसट र सर्ट क्रमहरू लक बाहिरै बनाउने
+    snapshot = NepseSnapshot(stock_data, current_time) if stock_data else None
+    company_list = CompanyList(companies, current_time) if companies else None
+    
+    changes = {}
+    
+    if snapshot is not None:
+        changes['nepse_data'] = cache_entry(stock_data, current_time)
+        changes['snapshot'] = snapshot
+    
+    if stocks:
+        changes['stocks_list'] = cache_entry(stocks, current_time)
+    
+    if market_overview:
+        changes['market_overview'] = cache_entry(market_overview, current_time)
+    
+    if company_list is not None:
+        changes['companies'] = cache_entry(companies, current_time)
+        changes['company_list'] = company_list
+    
+    if not changes:
+        return current_state()
+    
+    # नयाँ स्टेट एकै पटक साट्ने, पाठकहरूले कहिल्यै आधा अपडेट गरिएको स्टेट नदेखून्
+    # नयाँ स्न्यापसटलाई लेखक लकभित्रै प्रकाशित स्न्यापसटसँग जोड्ने, ताकि कुनै डेल्टा नछुटोस्
+    def apply(current):
+        if snapshot is not None:
+            snapshot.link(current.snapshot)
+        return current.replace(**changes)
+    
+    state = state_holder.update(apply)
+    
+    # फेरिएका क्यास फाइलहरू मात्र सेभ गर्ने
+    save_cache_files(state, [name for name in ('nepse_data', 'stocks_list') if name in changes])
+    
+    # नयाँ स्न्यापसट इन्ट्राडे आर्काइभमा थप्ने (ब्याकग्राउन्डमा लेखिन्छ)
+    if snapshot is not None:
+        intraday_archive.append(snapshot)
         
-        # कम्पनी टेबल फेला पार्ने
-        table = soup.find('table', class_='table table-bordered table-striped table-hover')
+        # स्न्यापसटको समय सेसन भित्र पर्दा मात्र टिक थप्ने (टिकमा पनि त्यही समय राखिन्छ)
+        if session_open(snapshot.last_updated or time.time()):
+            tick_buffers.record(snapshot)
         
-        if not table:
-            return stocks_list_cache['data'] if stocks_list_cache['data'] else []
+        # फेरिएका कोटहरू सब्स्क्राइबरहरूलाई पठाउने
+        stream_hub.publish_quotes(snapshot)
         
-        stocks = []
-        rows = table.find_all('tr')[1:]  # हेडर रो छोड्ने
+        # इन्डिकेटर स्टेट र दैनिक बार (रिक्वेस्ट वा ब्याकग्राउन्ड, जुनसुकै रिफ्रेसबाट आए पनि)
+        try:
+            update_derived_state(snapshot)
+        except Exception as e:
+            print(f"इन्डिकेटर/दैनिक बार अपडेट गर्न त्रुटि: {str(e)}")
         
-        for row in rows:
-            columns = row.find_all('td')
-            if len(columns) >= 3:
-                symbol = columns[1].text.strip()
-                company_name = columns[2].text.strip()
-                sector = columns[3].text.strip() if len(columns) > 3 else "N/A"
-                
-                stocks.append({
-                    'symbol': symbol,
-                    'company_name': company_name,
-                    'sector': sector
-                })
+        # नयाँ LTP ले पुगेका मूल्य अलर्टहरू फायर गर्ने
+        try:
+            alert_engine.evaluate(snapshot)
+        except Exception as e:
+            print(f"अलर्ट जाँच्न त्रुटि: {str(e)}")
+    
+    if market_overview:
+        publish_market_index(market_overview)
+    
+    return state
+
+# सबै NEPSE सूचीकृत शेयरहरू प्राप्त गर्ने
+def fetch_all_stocks():
+    return serve_cached('stocks_list', lambda state: state.stocks_list, STOCKS_LIST_EXPIRY, refresh_all_stocks)
+
+# सबै सूचीकृत शेयरहरू अपस्ट्रिमबाट रिफ्रेस गर्ने
+def refresh_all_stocks():
+    current_time = time.time()
+    stocks_list_cache = state_holder.current().stocks_list
+    
+    # पर्खँदा अर्को थ्रेडले रिफ्रेस गरिसकेको हुन सक्छ
+    if not is_stale(stocks_list_cache, STOCKS_LIST_EXPIRY, current_time):
+        return stocks_list_cache['data']
+    
+    try:
+        stocks = download_stock_list()
         
         # यदि कुनै शेयर फेला परेन भने पुरानो क्यास फर्काउने
         if not stocks:
             return stocks_list_cache['data'] if stocks_list_cache['data'] else []
         
-        # क्यास अपडेट गर्ने
-        stocks_list_cache = {
-            'data': stocks,
-            'last_updated': current_time
-        }
-        
-        # क्यास फाइल सेभ गर्ने
-        save_cache_files()
+        publish_refresh({'stocks_list': stocks}, current_time)
         
         return stocks
     
@@ -147,84 +373,26 @@ def fetch_all_stocks():
 
 # NEPSE डाटा प्राप्त गर्ने
 def fetch_nepse_data():
-    global nepse_data_cache
-    
+    return serve_cached('nepse_data', lambda state: state.nepse_data, CACHE_EXPIRY, refresh_nepse_data)
+
+# NEPSE डाटा अपस्ट्रिमबाट रिफ्रेस गर्ने
+def refresh_nepse_data():
     current_time = time.time()
+    nepse_data_cache = state_holder.current().nepse_data
     
-    # क्यास अवधि समाप्त नभएको छ भने क्यास डाटा फर्काउने
-    if nepse_data_cache['data'] and current_time - nepse_data_cache['last_updated'] < CACHE_EXPIRY:
+    # पर्खँदा अर्को थ्रेडले रिफ्रेस गरिसकेको हुन सक्छ
+    if not is_stale(nepse_data_cache, CACHE_EXPIRY, current_time):
         return nepse_data_cache['data']
     
     try:
-        url = 'https://www.nepalstock.com/todays_price'
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # टेबल फेला पार्ने
-        table = soup.find('table', class_='table table-bordered table-striped table-hover')
-        
-        if not table:
-            return nepse_data_cache['data'] if nepse_data_cache['data'] else []
-        
-        stock_data = []
-        rows = table.find_all('tr')[1:]  # हेडर रो छोड्ने
-        
-        for row in rows:
-            columns = row.find_all('td')
-            if len(columns) >= 10:
-                try:
-                    symbol = columns[1].text.strip()
-                    
-                    # मूल्य डाटा प्राप्त गर्ने
-                    ltp = columns[6].text.strip()
-                    change_text = columns[7].text.strip()
-                    change = float(change_text) if change_text else 0
-                    high = columns[4].text.strip()
-                    low = columns[5].text.strip()
-                    open_price = columns[3].text.strip()
-                    qty = columns[10].text.strip().replace(',', '')
-                    
-                    # प्रतिशत परिवर्तन गणना गर्ने
-                    percent_change = 0
-                    if change != 0 and ltp:
-                        try:
-                            ltp_value = float(ltp.replace(',', ''))
-                            percent_change = round((change / (ltp_value - change)) * 100, 2)
-                        except:
-                            percent_change = 0
-                    
-                    stock_data.append({
-                        'symbol': symbol,
-                        'ltp': ltp,
-                        'change': change,
-                        'percent_change': percent_change,
-                        'high': high,
-                        'low': low,
-                        'open': open_price,
-                        'qty': qty
-                    })
-                except Exception as e:
-                    print(f"Error processing row: {str(e)}")
-                    continue
+        stock_data = download_nepse_data()
         
         # यदि कुनै डाटा फेला परेन भने पुरानो क्यास फर्काउने
         if not stock_data:
             return nepse_data_cache['data'] if nepse_data_cache['data'] else []
         
-        # क्यास अपडेट गर्ने
-        nepse_data_cache = {
-            'data': stock_data,
-            'last_updated': current_time
-        }
-        
-        # क्यास फाइल सेभ गर्ने
-        save_cache_files()
+        # क्यास र स्न्यापसट अपडेट गर्ने (स्ट्रिङ पार्सिङ यहीँ एक पटक मात्र हुन्छ)
+        publish_refresh({'nepse_data': stock_data}, current_time)
         
         return stock_data
     
@@ -232,344 +400,191 @@ def fetch_nepse_data():
         print(f"Error fetching NEPSE data: {str(e)}")
         return nepse_data_cache['data'] if nepse_data_cache['data'] else []
 
+# हालको NEPSE डाटा स्न्यापसट प्राप्त गर्ने
+def get_nepse_snapshot():
+    # क्यास अवधि समाप्त भएको छ भने डाटा रिफ्रेस गर्ने
+    fetch_nepse_data()
+    return current_state().snapshot
+
 # बजार अवलोकन डाटा प्राप्त गर्ने
 def fetch_market_overview():
+    return serve_cached('market_overview', lambda state: state.market_overview, CACHE_EXPIRY, refresh_market_overview)
+
+# बजार अवलोकन अपस्ट्रिमबाट रिफ्रेस गर्ने
+def refresh_market_overview():
+    current_time = time.time()
+    market_overview_cache = state_holder.current().market_overview
+    
+    # पर्खँदा अर्को थ्रेडले रिफ्रेस गरिसकेको हुन सक्छ
+    if not is_stale(market_overview_cache, CACHE_EXPIRY, current_time):
+        return market_overview_cache['data']
+    
+    market_overview = scrape_market_overview()
+    
+    # स्क्र्याप असफल भएमा पुरानो क्यास फर्काउने
+    if market_overview['data_source'] == 'default':
+        return market_overview_cache['data'] if market_overview_cache['data'] else market_overview
+    
+    publish_refresh({'market_overview': market_overview}, current_time)
+    
+    return market_overview
+
+# बजार अवलोकन डाटा स्क्र्याप गर्ने
+def scrape_market_overview():
     """
     मेरोलगानी वा नेपालीपैसा वेबसाइटबाट नेप्से बजार अवलोकन डाटा स्क्र्याप गर्ने
     """
+    market_status = "Open" if is_market_open() else "Closed"
+    
     try:
         # पहिले मेरोलगानी वेबसाइट प्रयास गर्ने
         try:
-            # मेरोलगानी वेबसाइटबाट डाटा स्क्र्याप गर्ने
-            url = 'https://merolagani.com/MarketSummary.aspx'
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            
-            response = requests.get(url, headers=headers, timeout=10)
-            response.raise_for_status()  # त्रुटि जाँच गर्ने
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # नेप्से इन्डेक्स डाटा प्राप्त गर्ने
-            nepse_index_div = soup.select_one('#ctl00_ContentPlaceHolder1_LiveNepse')
-            nepse_index = float(nepse_index_div.select_one('.price').text.strip().replace(',', '')) if nepse_index_div else None
-            
-            # नेप्से परिवर्तन प्राप्त गर्ने
-            nepse_change_div = nepse_index_div.select_one('.change') if nepse_index_div else None
-            nepse_change_text = nepse_change_div.text.strip() if nepse_change_div else "0.00 (0.00%)"
-            
-            # परिवर्तन मान र प्रतिशत प्राप्त गर्ने
-            import re
-            change_match = re.search(r'([\+\-]?\d+\.\d+)\s*\(([\+\-]?\d+\.\d+)%\)', nepse_change_text)
-            
-            if change_match:
-                nepse_change = float(change_match.group(1))
-                nepse_change_percent = float(change_match.group(2))
-            else:
-                nepse_change = 0.0
-                nepse_change_percent = 0.0
-            
-            # कारोबार रकम प्राप्त गर्ने
-            turnover_div = soup.select_one('#ctl00_ContentPlaceHolder1_LiveTurnover')
-            turnover_text = turnover_div.select_one('.price').text.strip() if turnover_div else "0"
-            
-            # Rs. र अन्य अक्षरहरू हटाउने
-            turnover_text = turnover_text.replace('Rs.', '').replace(',', '').strip()
-            
-            # मान र इकाई प्राप्त गर्ने
-            turnover_match = re.search(r'([\d\.]+)\s*([A-Za-z]+)?', turnover_text)
-            
-            if turnover_match:
-                turnover_value = float(turnover_match.group(1))
-                turnover_unit = turnover_match.group(2) if turnover_match.group(2) else ""
-                
-                # इकाई अनुसार मान परिवर्तन गर्ने
-                if turnover_unit.lower() == 'b' or turnover_unit.lower() == 'bn':
-                    turnover_value = turnover_value * 1000000000  # बिलियन
-                elif turnover_unit.lower() == 'm' or turnover_unit.lower() == 'mn':
-                    turnover_value = turnover_value * 1000000  # मिलियन
-                elif turnover_unit.lower() == 'k':
-                    turnover_value = turnover_value * 1000  # हजार
-            else:
-                turnover_value = 0.0
-            
-            # कारोबार भएका शेयर संख्या प्राप्त गर्ने
-            shares_traded_div = soup.select_one('#ctl00_ContentPlaceHolder1_LiveSharesTraded')
-            shares_traded_text = shares_traded_div.select_one('.price').text.strip() if shares_traded_div else "0"
-            
-            # अक्षरहरू हटाउने
-            shares_traded_text = shares_traded_text.replace(',', '').strip()
-            
-            # मान र इकाई प्राप्त गर्ने
-            shares_match = re.search(r'([\d\.]+)\s*([A-Za-z]+)?', shares_traded_text)
-            
-            if shares_match:
-                shares_value = float(shares_match.group(1))
-                shares_unit = shares_match.group(2) if shares_match.group(2) else ""
-                
-                # इकाई अनुसार मान परिवर्तन गर्ने
-                if shares_unit.lower() == 'm':
-                    shares_value = shares_value * 1000000  # मिलियन
-                elif shares_unit.lower() == 'k':
-                    shares_value = shares_value * 1000  # हजार
-            else:
-                shares_value = 0.0
-            
-            # कारोबार संख्या प्राप्त गर्ने
-            transactions_div = soup.select_one('#ctl00_ContentPlaceHolder1_LiveTransactions')
-            transactions_text = transactions_div.select_one('.price').text.strip() if transactions_div else "0"
-            transactions = int(transactions_text.replace(',', ''))
-            
-            # बजार पूँजीकरण प्राप्त गर्ने
-            market_cap_div = soup.select_one('#ctl00_ContentPlaceHolder1_LiveMarketCap')
-            market_cap_text = market_cap_div.select_one('.price').text.strip() if market_cap_div else "0"
-            
-            # Rs. र अन्य अक्षरहरू हटाउने
-            market_cap_text = market_cap_text.replace('Rs.', '').replace(',', '').strip()
-            
-            # मान र इकाई प्राप्त गर्ने
-            market_cap_match = re.search(r'([\d\.]+)\s*([A-Za-z]+)?', market_cap_text)
-            
-            if market_cap_match:
-                market_cap_value = float(market_cap_match.group(1))
-                market_cap_unit = market_cap_match.group(2) if market_cap_match.group(2) else ""
-                
-                # इकाई अनुसार मान परिवर्तन गर्ने
-                if market_cap_unit.lower() == 't' or market_cap_unit.lower() == 'tn':
-                    market_cap_value = market_cap_value * 1000000000000  # ट्रिलियन
-                elif market_cap_unit.lower() == 'b' or market_cap_unit.lower() == 'bn':
-                    market_cap_value = market_cap_value * 1000000000  # बिलियन
-                elif market_cap_unit.lower() == 'm' or market_cap_unit.lower() == 'mn':
-                    market_cap_value = market_cap_value * 1000000  # मिलियन
-            else:
-                market_cap_value = 0.0
-            
-            # बजार स्थिति प्राप्त गर्ने
-            market_status = "Open" if is_market_open() else "Closed"
-            
-            # अन्तिम अपडेट समय प्राप्त गर्ने
-            last_updated = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            
-            # डाटा संरचना तयार गर्ने
-            market_overview = {
-                'nepse_index': nepse_index,
-                'nepse_change': nepse_change,
-                'nepse_change_percent': nepse_change_percent,
-                'turnover': turnover_value,
-                'turnover_formatted': format_large_number(turnover_value),
-                'shares_traded': shares_value,
-                'shares_traded_formatted': format_large_number(shares_value),
-                'transactions': transactions,
-                'transactions_formatted': format_number(transactions),
-                'market_cap': market_cap_value,
-                'market_cap_formatted': format_large_number(market_cap_value),
-                'market_status': market_status,
-                'last_updated': last_updated,
-                'data_source': 'merolagani'
-            }
-            
-            return market_overview
-            
+            return parse_merolagani_summary(download_page(MARKET_SUMMARY_URL), market_status)
+        
         except Exception as mero_error:
             print(f"मेरोलगानीबाट डाटा प्राप्त गर्न त्रुटि: {mero_error}")
             
             # मेरोलगानीबाट डाटा प्राप्त गर्न असफल भएमा नेपालीपैसा प्रयास गर्ने
-            url = 'https://www.nepalipaisa.com/'
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            
-            response = requests.get(url, headers=headers, timeout=10)
-            response.raise_for_status()  # त्रुटि जाँच गर्ने
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # नेप्से इन्डेक्स डाटा प्राप्त गर्ने
-            nepse_index_div = soup.select_one('.market-status')
-            nepse_index_text = nepse_index_div.select_one('.nepse-index').text.strip() if nepse_index_div else "0"
-            nepse_index = float(nepse_index_text.replace(',', ''))
-            
-            # नेप्से परिवर्तन प्राप्त गर्ने
-            nepse_change_div = nepse_index_div.select_one('.nepse-change') if nepse_index_div else None
-            nepse_change_text = nepse_change_div.text.strip() if nepse_change_div else "0.00 (0.00%)"
-            
-            # परिवर्तन मान र प्रतिशत प्राप्त गर्ने
-            import re
-            change_match = re.search(r'([\+\-]?\d+\.\d+)\s*\(([\+\-]?\d+\.\d+)%\)', nepse_change_text)
-            
-            if change_match:
-                nepse_change = float(change_match.group(1))
-                nepse_change_percent = float(change_match.group(2))
-            else:
-                nepse_change = 0.0
-                nepse_change_percent = 0.0
-            
-            # अन्य बजार डाटा प्राप्त गर्ने
-            market_data_divs = soup.select('.market-data .data-item')
-            
-            turnover_value = 0.0
-            shares_value = 0.0
-            transactions = 0
-            market_cap_value = 0.0
-            
-            for div in market_data_divs:
-                label = div.select_one('.label').text.strip().lower() if div.select_one('.label') else ""
-                value_text = div.select_one('.value').text.strip() if div.select_one('.value') else "0"
-                
-                if 'turnover' in label:
-                    # Rs. र अन्य अक्षरहरू हटाउने
-                    turnover_text = value_text.replace('Rs.', '').replace(',', '').strip()
-                    
-                    # मान र इकाई प्राप्त गर्ने
-                    turnover_match = re.search(r'([\d\.]+)\s*([A-Za-z]+)?', turnover_text)
-                    
-                    if turnover_match:
-                        turnover_value = float(turnover_match.group(1))
-                        turnover_unit = turnover_match.group(2) if turnover_match.group(2) else ""
-                        
-                        # इकाई अनुसार मान परिवर्तन गर्ने
-                        if turnover_unit.lower() == 'b' or turnover_unit.lower() == 'bn':
-                            turnover_value = turnover_value * 1000000000  # बिलियन
-                        elif turnover_unit.lower() == 'm' or turnover_unit.lower() == 'mn':
-                            turnover_value = turnover_value * 1000000  # मिलियन
-                        elif turnover_unit.lower() == 'k':
-                            turnover_value = turnover_value * 1000  # हजार
-                
-                elif 'shares' in label or 'traded' in label:
-                    # अक्षरहरू हटाउने
-                    shares_text = value_text.replace(',', '').strip()
-                    
-                    # मान र इकाई प्राप्त गर्ने
-                    shares_match = re.search(r'([\d\.]+)\s*([A-Za-z]+)?', shares_text)
-                    
-                    if shares_match:
-                        shares_value = float(shares_match.group(1))
-                        shares_unit = shares_match.group(2) if shares_match.group(2) else ""
-                        
-                        # इकाई अनुसार मान परिवर्तन गर्ने
-                        if shares_unit.lower() == 'm':
-                            shares_value = shares_value * 1000000  # मिलियन
-                        elif shares_unit.lower() == 'k':
-                            shares_value = shares_value * 1000  # हजार
-                
-                elif 'transactions' in label:
-                    transactions = int(value_text.replace(',', ''))
-                
-                elif 'market cap' in label or 'capitalization' in label:
-                    # Rs. र अन्य अक्षरहरू हटाउने
-                    market_cap_text = value_text.replace('Rs.', '').replace(',', '').strip()
-                    
-                    # मान र इकाई प्राप्त गर्ने
-                    market_cap_match = re.search(r'([\d\.]+)\s*([A-Za-z]+)?', market_cap_text)
-                    
-                    if market_cap_match:
-                        market_cap_value = float(market_cap_match.group(1))
-                        market_cap_unit = market_cap_match.group(2) if market_cap_match.group(2) else ""
-                        
-                        # इकाई अनुसार मान परिवर्तन गर्ने
-                        if market_cap_unit.lower() == 't' or market_cap_unit.lower() == 'tn':
-                            market_cap_value = market_cap_value * 1000000000000  # ट्रिलियन
-                        elif market_cap_unit.lower() == 'b' or market_cap_unit.lower() == 'bn':
-                            market_cap_value = market_cap_value * 1000000000  # बिलियन
-                        elif market_cap_unit.lower() == 'm' or market_cap_unit.lower() == 'mn':
-                            market_cap_value = market_cap_value * 1000000  # मिलियन
-            
-            # बजार स्थिति प्राप्त गर्ने
-            market_status = "Open" if is_market_open() else "Closed"
-            
-            # अन्तिम अपडेट समय प्राप्त गर्ने
-            last_updated = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            
-            # डाटा संरचना तयार गर्ने
-            market_overview = {
-                'nepse_index': nepse_index,
-                'nepse_change': nepse_change,
-                'nepse_change_percent': nepse_change_percent,
-                'turnover': turnover_value,
-                'turnover_formatted': format_large_number(turnover_value),
-                'shares_traded': shares_value,
-                'shares_traded_formatted': format_large_number(shares_value),
-                'transactions': transactions,
-                'transactions_formatted': format_number(transactions),
-                'market_cap': market_cap_value,
-                'market_cap_formatted': format_large_number(market_cap_value),
-                'market_status': market_status,
-                'last_updated': last_updated,
-                'data_source': 'nepalipaisa'
-            }
-            
-            return market_overview
+            return parse_nepalipaisa_summary(download_page(NEPALIPAISA_URL), market_status)
     
     except Exception as e:
         print(f"बजार अवलोकन डाटा प्राप्त गर्न त्रुटि: {e}")
         
         # त्रुटि भएमा डिफल्ट डाटा फर्काउने
-        return {
-            'nepse_index': 0.0,
-            'nepse_change': 0.0,
-            'nepse_change_percent': 0.0,
-            'turnover': 0.0,
-            'turnover_formatted': 'Rs. 0',
-            'shares_traded': 0,
-            'shares_traded_formatted': '0',
-            'transactions': 0,
-            'transactions_formatted': '0',
-            'market_cap': 0.0,
-            'market_cap_formatted': 'Rs. 0',
-            'market_status': 'Unknown',
-            'last_updated': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            'data_source': 'default'
-        }
+        return default_market_overview()
 
-def format_large_number(number):
-    """
-    ठूलो संख्यालाई सजिलै पढ्न मिल्ने ढाँचामा परिवर्तन गर्ने
-    """
-    if number >= 1000000000000:  # ट्रिलियन
-        return f"Rs. {number / 1000000000000:.2f} T"
-    elif number >= 1000000000:  # बिलियन
-        return f"Rs. {number / 1000000000:.2f} B"
-    elif number >= 1000000:  # मिलियन
-        return f"Rs. {number / 1000000:.2f} M"
-    elif number >= 1000:  # हजार
-        return f"Rs. {number / 1000:.2f} K"
-    else:
-        return f"Rs. {number:.2f}"
-
-def format_number(number):
-    """
-    संख्यालाई सजिलै पढ्न मिल्ने ढाँचामा परिवर्तन गर्ने
-    """
-    if number >= 1000000:  # मिलियन
-        return f"{number / 1000000:.2f} M"
-    elif number >= 1000:  # हजार
-        return f"{number / 1000:.2f} K"
-    else:
-        return f"{number}"
+# रिफ्रेस गर्नुपर्ने कामहरू (म्याद सकिएका क्यासहरू मात्र)
+# की र रिफ्रेस फंक्सन serve_cached कै हुन्, त्यसैले ब्याकग्राउन्ड र रिक्वेस्टको फेच एउटै फ्लाइटमा मिल्छन्
+def refresh_jobs(current_time):
+    state = current_state()
+    jobs = {}
+    
+    if is_stale(state.nepse_data, CACHE_EXPIRY, current_time):
+        jobs['nepse_data'] = refresh_nepse_data
+    
+    if is_stale(state.market_overview, CACHE_EXPIRY, current_time):
+        jobs['market_overview'] = refresh_market_overview
+    
+    if is_stale(state.companies, CACHE_EXPIRY, current_time):
+        jobs['companies'] = refresh_companies
+    
+    if is_stale(state.stocks_list, STOCKS_LIST_EXPIRY, current_time):
+        jobs['stocks_list'] = refresh_all_stocks
+    
+    return jobs
+
+# म्याद सकिएका सबै स्रोतहरू एकै साथ रिफ्रेस गर्ने (हरेक रिफ्रेसले आफ्नो नतिजा आफैं प्रकाशित गर्छ)
+async def refresh_data(executor):
+    loop = asyncio.get_running_loop()
+    jobs = refresh_jobs(time.time())
+    
+    if not jobs:
+        return {}
+    
+    # डाउनलोड र पार्सिङ वर्कर थ्रेडहरूमा समानान्तर चलाउने
+    names = list(jobs)
+    results = await asyncio.gather(
+        *(loop.run_in_executor(executor, upstream.do, name, jobs[name]) for name in names),
+        return_exceptions=True
+    )
+    
+    fresh = {}
+    for name, result in zip(names, results):
+        if isinstance(result, Exception):
+            print(f"Refresh error ({name}): {str(result)}")
+        elif result:
+            fresh[name] = result
+    
+    return fresh
+
+# नयाँ स्न्यापसटबाट इन्डिकेटर स्टेट र आजको दैनिक बार अपडेट गर्ने
+def update_derived_state(snapshot):
+    update_indicator_states(snapshot)
+    
+    # सेसन सुरु भएपछिका (बजार बन्द भएपछिको अन्तिम मूल्य सहित) र केही फेरिएका स्न्यापसट मात्र
+    if session_started(snapshot.last_updated) and (snapshot.changed_at == snapshot.version).any():
+        record_daily_bars(snapshot)
+
+# एसिंक रिफ्रेस लुप
+async def refresh_loop():
+    # पुश स्ट्रिमलाई क्यासमा भएको डाटा दिने (नयाँ सब्स्क्राइबरले तुरुन्तै पाऊन्)
+    state = current_state()
+    stream_hub.publish_quotes(state.snapshot)
+    if state.market_overview['data']:
+        publish_market_index(state.market_overview['data'])
+    
+    with ThreadPoolExecutor(max_workers=REFRESH_WORKERS, thread_name_prefix='refresh') as executor:
+        while True:
+            # बजार खुला छ भने हरेक 5 मिनेटमा अपडेट गर्ने, अन्यथा हरेक 30 मिनेटमा
+            market_open = is_market_open()
+            update_interval = 5 * 60 if market_open else 30 * 60
+            stream_hub.publish_market_status(market_open)
+            
+            try:
+                await refresh_data(executor)
+            
+            except Exception as e:
+                print(f"Background update error: {str(e)}")
+            
+            await asyncio.sleep(update_interval)
 
 # बैकग्राउन्डमा डाटा अपडेट गर्ने
 def background_data_update():
-    while True:
-        # बजार खुला छ भने हरेक 5 मिनेटमा अपडेट गर्ने, अन्यथा हरेक 30 मिनेटमा
-        update_interval = 5 * 60 if is_market_open() else 30 * 60
-        
-        try:
-            fetch_nepse_data()
-            fetch_market_overview()
-            
-            # दिनको एक पटक मात्र सबै स्टक्स लिस्ट अपडेट गर्ने
-            now = datetime.now()
-            if now.hour == 10 and now.minute < 5:  # बिहान 10 बजे
-                fetch_all_stocks()
-        
-        except Exception as e:
-            print(f"Background update error: {str(e)}")
-        
-        time.sleep(update_interval)
+    asyncio.run(refresh_loop())
+
+# कन्डिसनल GET भ्यालिडेटरहरू: (भर्सन, अन्तिम अपडेट समय)
+# रेस्पोन्समा रिक्वेस्टकै बेला निकालिएको market_status हुन्छ, त्यसैले बजार खुल्दा/बन्द हुँदा पनि ETag फेरिनुपर्छ
+def snapshot_validator(*args, **kwargs):
+    snapshot = get_nepse_snapshot()
+    return (snapshot.version, is_market_open()), snapshot.last_updated
+
+def advanced_filter_validator():
+    snapshot = get_nepse_snapshot()
+    
+    # क्षेत्र फिल्टरको लागि स्टक्स लिस्ट पनि चाहिन्छ
+    if request.args.get('sector'):
+        fetch_all_stocks()
+    
+    return (snapshot.version, current_state().stocks_list['last_updated']), snapshot.last_updated
+
+def market_overview_validator():
+    fetch_market_overview()
+    last_updated = current_state().market_overview['last_updated']
+    return last_updated, last_updated
+
+def stocks_list_validator():
+    fetch_all_stocks()
+    last_updated = current_state().stocks_list['last_updated']
+    return last_updated, last_updated
+
+def companies_validator():
+    fetch_companies_from_merolagani()
+    last_updated = current_state().companies['last_updated']
+    return last_updated, last_updated
+
+def company_detail_validator(symbol):
+    symbol = symbol.upper()
+    fetch_company_details(symbol)
+    last_updated = cached_company_detail(symbol)['last_updated']
+    return last_updated, last_updated
+
+def tick_validator():
+    return tick_buffers.version, tick_buffers.last_updated
+
+def history_validator():
+    symbol = request.args.get('symbol')
+    if not symbol:
+        return None, 0
+    
+    # अमान्य सिम्बलको 400 भ्यू आफैंले दिन्छ
+    try:
+        return history_store.version(symbol), history_store.last_modified(symbol)
+    except ValueError:
+        return None, 0
 
 # API एन्डपोइन्ट्स
 @app.route('/nepse_data')
+@conditional(snapshot_validator)
 def get_nepse_data():
     try:
         # फिल्टरिङ प्यारामिटरहरू
@@ -578,6 +593,8 @@ def get_nepse_data():
         sort_by = request.args.get('sort_by', 'symbol')
         sort_order = request.args.get('sort_order', 'asc')
         limit = request.args.get('limit')
+        offset = request.args.get('offset', 0)
+        since = request.args.get('since')
         
         if limit:
             try:
@@ -585,71 +602,104 @@ def get_nepse_data():
             except:
                 limit = None
         
-        # डाटा प्राप्त गर्ने
-        stock_data = fetch_nepse_data()
+        try:
+            offset = int(offset)
+        except:
+            offset = 0
         
-        # फिल्टरिङ
-        if symbol:
-            stock_data = [stock for stock in stock_data if symbol.upper() in stock['symbol'].upper()]
+        if since is not None:
+            try:
+                since = int(since)
+            except ValueError:
+                return jsonify({'error': 'Invalid since parameter'}), 400
         
-        # सर्टिङ
-        reverse = sort_order.lower() == 'desc'
-        if sort_by == 'change':
-            stock_data = sorted(stock_data, key=lambda x: float(x['change']) if x['change'] else 0, reverse=reverse)
-        elif sort_by == 'percent_change':
-            stock_data = sorted(stock_data, key=lambda x: float(x['percent_change']) if x['percent_change'] else 0, reverse=reverse)
-        elif sort_by == 'ltp':
-            stock_data = sorted(stock_data, key=lambda x: float(x['ltp'].replace(',', '')) if x['ltp'] else 0, reverse=reverse)
-        elif sort_by == 'qty':
-            stock_data = sorted(stock_data, key=lambda x: float(x['qty'].replace(',', '')) if x['qty'] else 0, reverse=reverse)
-        else:  # Default: symbol
-            stock_data = sorted(stock_data, key=lambda x: x['symbol'], reverse=reverse)
-        
-        # लिमिट
-        if limit:
-            stock_data = stock_data[:limit]
+        # डाटा प्राप्त गर्ने
+        snapshot = get_nepse_snapshot()
+        market_status = 'open' if is_market_open() else 'closed'
+        stale = data_is_stale()
         
-        # अतिरिक्त जानकारी थप्ने
-        result = {
-            'data': stock_data,
-            'meta': {
-                'total': len(stock_data),
-                'last_updated': datetime.fromtimestamp(nepse_data_cache['last_updated']).strftime('%Y-%m-%d %H:%M:%S'),
-                'market_status': 'open' if is_market_open() else 'closed'
+        def build_result():
+            # फिल्टरिङ
+            mask = snapshot.symbol_mask(symbol) if symbol else None
+            
+            # since भर्सनपछि फेरिएका रोहरू मात्र (इतिहासभन्दा पुरानो वा अज्ञात भर्सन भए पूरा डाटा)
+            full = since is None or not snapshot.can_diff(since)
+            if not full:
+                changed = snapshot.changed_mask(since)
+                mask = changed if mask is None else mask & changed
+            
+            # पहिले नै सर्ट गरिएको क्रमबाट पेज निकाल्ने
+            stock_data = snapshot.select(mask, sort_by if sort_by in ('change', 'percent_change', 'ltp', 'qty') else 'symbol',
+                                         sort_order.lower() == 'desc', limit, offset)
+            
+            # अतिरिक्त जानकारी थप्ने
+            result = {
+                'data': stock_data,
+                'meta': {
+                    'total': len(stock_data),
+                    'version': snapshot.version,
+                    'last_updated': datetime.fromtimestamp(snapshot.last_updated).strftime('%Y-%m-%d %H:%M:%S'),
+                    'market_status': market_status,
+                    'stale': stale
+                }
             }
-        }
+            
+            if since is not None:
+                result['removed'] = [] if full else snapshot.removed_since(since)
+                result['meta']['since'] = since
+                result['meta']['full'] = full
+            
+            return result
         
-        return jsonify(result)
+        # प्यारामिटर नभएको डिफल्ट रेस्पोन्स भर्सन अनुसार एक पटक मात्र सिरियलाइज गर्ने
+        if not request.args:
+            return response_cache.response('nepse_data', (snapshot.version, market_status, stale), build_result)
+        
+        return jsonify(build_result())
     
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 @app.route('/market_overview')
+@conditional(market_overview_validator)
 def get_market_overview():
     try:
-        # बजार अवलोकन डाटा प्राप्त गर्ने
+        # बजार अवलोकन डाटा प्राप्त गर्ने (क्यास सहित)
         market_data = fetch_market_overview()
         
-        # क्यास अपडेट गर्ने
-        global market_overview_cache
-        market_overview_cache = {
-            'data': market_data,
-            'last_updated': time.time()
-        }
-        
-        return jsonify(market_data)
+        return jsonify(dict(market_data, stale=data_is_stale()))
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 @app.route('/stocks_list')
+@conditional(stocks_list_validator)
 def get_stocks_list():
     try:
         # फिल्टरिङ प्यारामिटरहरू
         sector = request.args.get('sector')
         search = request.args.get('search')
         
-        # सबै स्टक्स प्राप्त गर्ने
-        stocks = fetch_all_stocks()
+        # सबै स्टक्स प्राप्त गर्ने (डाटा र अपडेट समय एउटै स्टेटबाट)
+        fetch_all_stocks()
+        stocks_list = current_state().stocks_list
+        stocks = stocks_list['data']
+        last_updated = stocks_list['last_updated']
+        stale = data_is_stale()
+        
+        def build_result(stocks):
+            # अतिरिक्त जानकारी थप्ने
+            return {
+                'data': stocks,
+                'meta': {
+                    'total': len(stocks),
+                    'last_updated': datetime.fromtimestamp(last_updated).strftime('%Y-%m-%d %H:%M:%S') if last_updated else None,
+                    'stale': stale
+                }
+            }
+        
+        # फिल्टर नभएको पूरा सूची भर्सन अनुसार एक पटक मात्र सिरियलाइज गर्ने
+        if not request.args:
+            return response_cache.response('stocks_list', (last_updated, stale), lambda: build_result(stocks))
         
         # फिल्टरिङ
         if sector:
@@ -658,21 +708,13 @@ def get_stocks_list():
         if search:
             stocks = [stock for stock in stocks if search.lower() in stock['symbol'].lower() or search.lower() in stock['company_name'].lower()]
         
-        # अतिरिक्त जानकारी थप्ने
-        result = {
-            'data': stocks,
-            'meta': {
-                'total': len(stocks),
-                'last_updated': datetime.fromtimestamp(stocks_list_cache['last_updated']).strftime('%Y-%m-%d %H:%M:%S') if stocks_list_cache['last_updated'] else None
-            }
-        }
-        
-        return jsonify(result)
+        return jsonify(build_result(stocks))
     
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 @app.route('/top_gainers')
+@conditional(snapshot_validator)
 def get_top_gainers():
     try:
         limit = request.args.get('limit', 10)
@@ -682,13 +724,14 @@ def get_top_gainers():
             limit = 10
         
         # सबै स्टक डाटा प्राप्त गर्ने
-        stock_data = fetch_nepse_data()
+        snapshot = get_nepse_snapshot()
         
-        # परिवर्तन अनुसार सर्ट गर्ने
-        sorted_data = sorted(stock_data, key=lambda x: float(x['percent_change']) if x['percent_change'] else 0, reverse=True)
+        # डिफल्ट (limit=10) रेस्पोन्स भर्सन अनुसार क्यास गर्ने
+        if limit == 10 and set(request.args) <= {'limit'}:
+            return response_cache.response('top_gainers', snapshot.version, lambda: snapshot.leaderboard.gainers(limit))
         
-        # टप गेनर्स फिल्टर गर्ने
-        gainers = [stock for stock in sorted_data if float(stock['percent_change']) > 0][:limit]
+        # लिडरबोर्डबाट टप गेनर्स प्राप्त गर्ने
+        gainers = snapshot.leaderboard.gainers(limit)
         
         return jsonify(gainers)
     
@@ -696,6 +739,7 @@ def get_top_gainers():
         return jsonify({"error": str(e)}), 500
 
 @app.route('/top_losers')
+@conditional(snapshot_validator)
 def get_top_losers():
     try:
         limit = request.args.get('limit', 10)
@@ -705,46 +749,83 @@ def get_top_losers():
             limit = 10
         
         # सबै स्टक डाटा प्राप्त गर्ने
-        stock_data = fetch_nepse_data()
-        
-        # परिवर्तन अनुसार सर्ट गर्ने
-        sorted_data = sorted(stock_data, key=lambda x: float(x['percent_change']) if x['percent_change'] else 0)
+        snapshot = get_nepse_snapshot()
         
-        # टप लुजर्स फिल्टर गर्ने
-        losers = [stock for stock in sorted_data if float(stock['percent_change']) < 0][:limit]
+        # लिडरबोर्डबाट टप लुजर्स प्राप्त गर्ने
+        losers = snapshot.leaderboard.losers(limit)
         
         return jsonify(losers)
     
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@app.route('/leaders')
+@conditional(snapshot_validator)
+def get_leaders():
+    metric = resolve_metric(request.args.get('metric', 'percent_change'))
+    direction = request.args.get('direction', 'top').lower()
+    k = request.args.get('k', 10)
+    
+    if not metric:
+        return jsonify({'error': 'Invalid metric parameter'}), 400
+    
+    if direction not in DIRECTIONS:
+        return jsonify({'error': 'Invalid direction parameter'}), 400
+    
+    try:
+        k = max(int(k), 0)
+    except:
+        k = 10
+    
+    try:
+        # लिडरबोर्डबाट पहिलो k स्टक्स प्राप्त गर्ने
+        snapshot = get_nepse_snapshot()
+        leaders = snapshot.leaderboard.leaders(metric, direction, k)
+        
+        return jsonify({
+            'data': leaders,
+            'meta': {
+                'metric': metric,
+                'direction': direction,
+                'total': len(leaders),
+                'last_updated': datetime.fromtimestamp(snapshot.last_updated).strftime('%Y-%m-%d %H:%M:%S'),
+                'stale': data_is_stale()
+            }
+        })
+    
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
 @app.route('/sectors')
+@conditional(stocks_list_validator)
 def get_sectors():
     try:
         # सबै स्टक्स प्राप्त गर्ने
-        stocks = fetch_all_stocks()
-        
-        # अद्वितीय क्षेत्रहरू प्राप्त गर्ने
-        sectors = list(set(stock['sector'] for stock in stocks if stock['sector'] != "N/A"))
-        sectors.sort()
-        
-        return jsonify(sectors)
+        fetch_all_stocks()
+        stocks_list = current_state().stocks_list
+        stocks = stocks_list['data']
+        
+        # अद्वितीय क्षेत्रहरू (स्टक्स लिस्ट भर्सन अनुसार क्यास गरिएको)
+        return response_cache.response(
+            'sectors',
+            stocks_list['last_updated'],
+            lambda: sorted(set(stock['sector'] for stock in stocks if stock['sector'] != "N/A"))
+        )
     
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 # रियल-टाइम स्टक डाटा एन्डपोइन्ट
 @app.route('/realtime_stock_data')
+@conditional(snapshot_validator)
 def get_realtime_stock_data():
     symbol = request.args.get('symbol')
     if not symbol:
         return jsonify({'error': 'Symbol parameter is required'}), 400
     
     try:
-        # यहाँ NEPSE बाट रियल-टाइम डाटा प्राप्त गर्ने लजिक
-        # यो उदाहरणमा हामी क्यास गरिएको डाटा प्रयोग गर्छौं
-        data = fetch_nepse_data()
-        stock_data = next((item for item in data if item.get('symbol') == symbol), None)
+        # स्न्यापसटको सिम्बल इन्डेक्सबाट सिधै खोज्ने
+        stock_data = get_nepse_snapshot().find(symbol)
         
         if not stock_data:
             return jsonify({'error': 'Stock not found'}), 404
@@ -753,8 +834,69 @@ def get_realtime_stock_data():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+# धेरै सिम्बलका कोटहरू एकै पटक दिने एन्डपोइन्ट (वाचलिस्ट/पोर्टफोलियोको लागि)
+@app.route('/quotes')
+@conditional(snapshot_validator)
+def get_quotes():
+    symbols = [symbol.strip().upper() for symbol in request.args.get('symbols', '').split(',') if symbol.strip()]
+    
+    if not symbols:
+        return jsonify({'error': 'Symbols parameter is required'}), 400
+    
+    if len(symbols) > MAX_QUOTE_SYMBOLS:
+        return jsonify({'error': f'At most {MAX_QUOTE_SYMBOLS} symbols are allowed'}), 400
+    
+    try:
+        snapshot = get_nepse_snapshot()
+        quotes, missing = snapshot.lookup(dict.fromkeys(symbols))
+        
+        return jsonify({
+            'data': quotes,
+            'meta': {
+                'total': len(quotes),
+                'missing': missing,
+                'version': snapshot.version,
+                'last_updated': datetime.fromtimestamp(snapshot.last_updated).strftime('%Y-%m-%d %H:%M:%S'),
+                'market_status': 'open' if is_market_open() else 'closed',
+                'stale': data_is_stale()
+            }
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# हिस्टोरिकल बारहरू प्राप्त गर्ने (दैनिक स्लाइस वा क्यास गरिएका साप्ताहिक/मासिक बारहरू)
+def get_historical_bars(symbol, interval='1d', start_date=None, end_date=None):
+    today = datetime.now()
+    
+    if not start_date:
+        start_date = (today - timedelta(days=HISTORY_DEFAULT_DAYS.get(interval, 365))).strftime('%Y-%m-%d')
+    
+    if not end_date:
+        end_date = today.strftime('%Y-%m-%d')
+    
+    return history_store.bars(symbol.upper(), interval, start_date, end_date)
+
+# स्न्यापसटबाट आजको दैनिक बार स्टोरमा राख्ने
+def record_daily_bars(snapshot):
+    today = datetime.fromtimestamp(snapshot.last_updated).strftime('%Y-%m-%d')
+    columns = snapshot.columns
+    
+    for symbol, i in snapshot.index.items():
+        try:
+            history_store.append(symbol, [{
+                'date': today,
+                'open': columns['open'][i],
+                'high': columns['high'][i],
+                'low': columns['low'][i],
+                'close': columns['ltp'][i],
+                'volume': columns['qty'][i]
+            }])
+        except ValueError as e:
+            print(f"Error recording daily bar: {str(e)}")
+
 # हिस्टोरिकल डाटा एन्डपोइन्ट
 @app.route('/historical_data')
+@conditional(history_validator)
 def get_historical_data():
     symbol = request.args.get('symbol')
     interval = request.args.get('interval', '1d')  # 1d, 1w, 1m, 3m, 6m, 1y
@@ -765,54 +907,126 @@ def get_historical_data():
         return jsonify({'error': 'Symbol parameter is required'}), 400
     
     try:
-        # यहाँ NEPSE बाट हिस्टोरिकल डाटा प्राप्त गर्ने लजिक
-        # यो उदाहरणमा हामी डमी डाटा फर्काउँछौं
-        
-        # वास्तविक कार्यान्वयनमा, यहाँ NEPSE वा अन्य स्रोतबाट डाटा प्राप्त गर्नुपर्छ
-        today = datetime.now()
-        
-        if not start_date:
-            if interval == '1d':
-                start_date = (today - timedelta(days=30)).strftime('%Y-%m-%d')
-            elif interval == '1w':
-                start_date = (today - timedelta(days=90)).strftime('%Y-%m-%d')
-            elif interval == '1m':
-                start_date = (today - timedelta(days=180)).strftime('%Y-%m-%d')
-            else:
-                start_date = (today - timedelta(days=365)).strftime('%Y-%m-%d')
-        
-        if not end_date:
-            end_date = today.strftime('%Y-%m-%d')
+        bars = get_historical_bars(symbol, interval, start_date, end_date)
+        return jsonify(bars_to_records(bars))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# पोइन्ट संख्या प्यारामिटर (नभए वा गलत भए None)
+def points_param():
+    try:
+        points = int(request.args.get('points', 0))
+    except ValueError:
+        return None
+    return points if points > 1 else None
+
+# हालको सेसनको इन्ट्राडे टिक एन्डपोइन्ट
+@app.route('/intraday')
+@conditional(tick_validator)
+def get_intraday():
+    symbol = request.args.get('symbol')
+    if not symbol:
+        return jsonify({'error': 'Symbol parameter is required'}), 400
+    
+    try:
+        series = tick_buffers.series(symbol.upper())
+        if series is None:
+            return jsonify({'error': 'No intraday data for symbol'}), 404
+        
+        points = points_param()
+        times = downsample(series['time'], points).tolist()
+        ltps = [round(ltp, 2) for ltp in downsample(series['ltp'], points).tolist()]
+        qtys = downsample(series['qty'], points).tolist()
+        
+        return jsonify({
+            'data': [
+                {'time': datetime.fromtimestamp(times[i]).strftime('%Y-%m-%d %H:%M:%S'), 'ltp': ltps[i], 'qty': qtys[i]}
+                for i in range(len(times))
+            ],
+            'meta': {
+                'symbol': symbol.upper(),
+                'total': len(times),
+                'last_updated': datetime.fromtimestamp(tick_buffers.last_updated).strftime('%Y-%m-%d %H:%M:%S')
+            }
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# धेरै सिम्बलका स्पार्कलाइनहरू एकै पटक दिने एन्डपोइन्ट
+@app.route('/sparklines')
+@conditional(tick_validator)
+def get_sparklines():
+    symbols = [symbol.strip().upper() for symbol in request.args.get('symbols', '').split(',') if symbol.strip()]
+    
+    if not symbols:
+        return jsonify({'error': 'Symbols parameter is required'}), 400
+    
+    if len(symbols) > MAX_SPARKLINE_SYMBOLS:
+        return jsonify({'error': f'At most {MAX_SPARKLINE_SYMBOLS} symbols are allowed'}), 400
+    
+    try:
+        points = points_param()
+        lines, missing = tick_buffers.sparklines(list(dict.fromkeys(symbols)), points)
+        
+        return jsonify({
+            'data': {symbol: [round(ltp, 2) for ltp in values.tolist()] for symbol, values in lines.items()},
+            'meta': {
+                'total': len(lines),
+                'missing': missing,
+                'points': points,
+                'last_updated': datetime.fromtimestamp(tick_buffers.last_updated).strftime('%Y-%m-%d %H:%M:%S')
+            }
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# आर्काइभ गरिएको इन्ट्राडे डाटा एन्डपोइन्ट
+# symbol दिए त्यो दिनका सबै रोहरू, at दिए त्यो समयको पूरा बजार अवस्था
+@app.route('/intraday_archive')
+def get_intraday_archive():
+    symbol = request.args.get('symbol')
+    date = request.args.get('date', datetime.now().strftime('%Y-%m-%d'))
+    at = request.args.get('at')
+    limit = request.args.get('limit')
+    
+    if not symbol and not at:
+        return jsonify({'error': 'Symbol or at parameter is required'}), 400
+    
+    try:
+        if symbol:
+            try:
+                start = datetime.strptime(date, '%Y-%m-%d')
+                limit = int(limit) if limit else None
+            except ValueError:
+                return jsonify({'error': 'Invalid date or limit parameter'}), 400
             
-        # डमी डाटा जनरेट गर्ने
-        date_range = pd.date_range(start=start_date, end=end_date)
-        data = []
-        
-        base_price = 1000  # आधार मूल्य
-        price = base_price
-        
-        for date in date_range:
-            if date.weekday() < 5:  # सप्ताहान्त बाहेक
-                change = (0.5 - random.random()) * 20  # -10 देखि +10 सम्म
-                price = max(price + change, 100)  # न्यूनतम मूल्य 100
-                
-                volume = int(random.random() * 10000) + 1000
-                
-                data.append({
-                    'date': date.strftime('%Y-%m-%d'),
-                    'open': round(price - random.random() * 5, 2),
-                    'high': round(price + random.random() * 10, 2),
-                    'low': round(price - random.random() * 10, 2),
-                    'close': round(price, 2),
-                    'volume': volume
-                })
-        
-        return jsonify(data)
+            rows = intraday_archive.ticks(symbol.upper(), start.timestamp(), (start + timedelta(days=1)).timestamp(), limit)
+        else:
+            try:
+                rows = intraday_archive.snapshot_at(datetime.strptime(at, '%Y-%m-%d %H:%M').timestamp())
+            except ValueError:
+                return jsonify({'error': 'Invalid at parameter (YYYY-MM-DD HH:MM)'}), 400
+        
+        for row in rows:
+            row['time'] = datetime.fromtimestamp(row.pop('ts')).strftime('%Y-%m-%d %H:%M:%S')
+        
+        return jsonify({
+            'data': rows,
+            'meta': {
+                'total': len(rows),
+                'symbol': symbol.upper() if symbol else None,
+                'date': date if symbol else None,
+                'at': at if not symbol else None
+            }
+        })
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 # टेक्निकल इन्डिकेटर्स एन्डपोइन्ट
 @app.route('/technical_indicators')
+@conditional(history_validator)
 def get_technical_indicators():
     symbol = request.args.get('symbol')
     indicators = request.args.get('indicators', 'sma,ema,rsi')  # कम्मा सेपरेटेड इन्डिकेटर्स
@@ -820,145 +1034,157 @@ def get_technical_indicators():
     if not symbol:
         return jsonify({'error': 'Symbol parameter is required'}), 400
     
+    # रिक्वेस्ट अनुसार इन्डिकेटर अवधिहरू
+    periods = {}
+    for name, default in DEFAULT_PERIODS.items():
+        try:
+            value = float(request.args.get(name, default)) if name == 'bb_std' else int(request.args.get(name, default))
+        except ValueError:
+            return jsonify({'error': f'Invalid {name} parameter'}), 400
+        
+        if value <= 0:
+            return jsonify({'error': f'Invalid {name} parameter'}), 400
+        
+        periods[name] = value
+    
     try:
         # हिस्टोरिकल डाटा प्राप्त गर्ने
-        historical_data = json.loads(get_historical_data().get_data(as_text=True))
-        
-        # इन्डिकेटर्स क्याल्कुलेट गर्ने
-        indicators_list = indicators.split(',')
-        result = {}
+        bars = get_historical_bars(
+            symbol,
+            request.args.get('interval', '1d'),
+            request.args.get('start_date'),
+            request.args.get('end_date')
+        )
         
         # मूल्य डाटा निकाल्ने
-        prices = [item['close'] for item in historical_data]
-        dates = [item['date'] for item in historical_data]
+        prices = bars['close']
+        dates = to_date_strings(bars['date'])
         
-        for indicator in indicators_list:
-            indicator = indicator.strip().lower()
-            
-            if indicator == 'sma':
-                # सिम्पल मुभिङ एभरेज (20 दिन)
-                sma_period = 20
-                sma_values = []
-                
-                for i in range(len(prices)):
-                    if i < sma_period - 1:
-                        sma_values.append(None)
-                    else:
-                        sma = sum(prices[i-(sma_period-1):i+1]) / sma_period
-                        sma_values.append(round(sma, 2))
-                
-                result['sma'] = [{'date': dates[i], 'value': sma_values[i]} for i in range(len(dates))]
-                
-            elif indicator == 'ema':
-                # एक्सपोनेन्सियल मुभिङ एभरेज (20 दिन)
-                ema_period = 20
-                ema_values = []
-                
-                # पहिलो EMA मान SMA हो
-                sma = sum(prices[:ema_period]) / ema_period
-                ema = sma
-                ema_values.extend([None] * (ema_period - 1))
-                ema_values.append(round(ema, 2))
-                
-                # बाँकी EMA मानहरू क्याल्कुलेट गर्ने
-                multiplier = 2 / (ema_period + 1)
-                
-                for i in range(ema_period, len(prices)):
-                    ema = (prices[i] - ema) * multiplier + ema
-                    ema_values.append(round(ema, 2))
-                
-                result['ema'] = [{'date': dates[i], 'value': ema_values[i]} for i in range(len(dates))]
-                
-            elif indicator == 'rsi':
-                # रिलेटिभ स्ट्रेन्थ इन्डेक्स (14 दिन)
-                rsi_period = 14
-                rsi_values = []
-                
-                # पहिलो RSI मानहरू क्याल्कुलेट गर्न सकिँदैन
-                rsi_values.extend([None] * rsi_period)
-                
-                for i in range(rsi_period, len(prices)):
-                    gains = []
-                    losses = []
-                    
-                    for j in range(i - rsi_period, i):
-                        change = prices[j+1] - prices[j]
-                        if change >= 0:
-                            gains.append(change)
-                            losses.append(0)
-                        else:
-                            gains.append(0)
-                            losses.append(abs(change))
-                    
-                    avg_gain = sum(gains) / rsi_period
-                    avg_loss = sum(losses) / rsi_period
-                    
-                    if avg_loss == 0:
-                        rsi = 100
-                    else:
-                        rs = avg_gain / avg_loss
-                        rsi = 100 - (100 / (1 + rs))
-                    
-                    rsi_values.append(round(rsi, 2))
-                
-                result['rsi'] = [{'date': dates[i], 'value': rsi_values[i]} for i in range(len(dates))]
-                
-            elif indicator == 'bb':
-                # बोलिन्जर ब्यान्ड्स (20 दिन, 2 स्ट्यान्डर्ड डेभिएसन)
-                bb_period = 20
-                bb_std = 2
-                bb_upper = []
-                bb_middle = []
-                bb_lower = []
-                
-                for i in range(len(prices)):
-                    if i < bb_period - 1:
-                        bb_upper.append(None)
-                        bb_middle.append(None)
-                        bb_lower.append(None)
-                    else:
-                        period_prices = prices[i-(bb_period-1):i+1]
-                        sma = sum(period_prices) / bb_period
-                        std = (sum([(x - sma) ** 2 for x in period_prices]) / bb_period) ** 0.5
-                        
-                        bb_upper.append(round(sma + bb_std * std, 2))
-                        bb_middle.append(round(sma, 2))
-                        bb_lower.append(round(sma - bb_std * std, 2))
-                
-                result['bb'] = {
-                    'upper': [{'date': dates[i], 'value': bb_upper[i]} for i in range(len(dates))],
-                    'middle': [{'date': dates[i], 'value': bb_middle[i]} for i in range(len(dates))],
-                    'lower': [{'date': dates[i], 'value': bb_lower[i]} for i in range(len(dates))]
-                }
+        # इन्डिकेटर्स क्याल्कुलेट गर्ने (O(n) NumPy कर्नेलहरू)
+        result = calculate_indicators(dates, prices, indicators.split(','), periods)
         
         return jsonify(result)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+# सिम्बलको इन्डिकेटर स्टेट प्राप्त गर्ने (पहिलो पटक हिस्टोरिकल डाटाबाट तयार गर्ने)
+def get_indicator_state(symbol):
+    state = indicator_states.get(symbol)
+    
+    if state is None:
+        today = datetime.now().strftime('%Y-%m-%d')
+        start_date = (datetime.now() - timedelta(days=365)).strftime('%Y-%m-%d')
+        yesterday = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
+        
+        # आजभन्दा अघिका बन्द भइसकेका बारहरू मात्र commit गर्ने
+        bars = get_historical_bars(symbol, '1d', start_date, yesterday)
+        state = IndicatorState()
+        state.seed(to_date_strings(bars['date']), bars['close'].tolist())
+        
+        # हालको LTP लाइभ बारको रूपमा राख्ने
+        snapshot = current_state().snapshot
+        i = snapshot.index.get(symbol)
+        if i is not None:
+            state.update(today, snapshot.column('ltp')[i])
+        
+        indicator_states.set(symbol, state)
+    
+    return state
+
+# स्न्यापसट वा कम्पनी सूचीमा भएका सिम्बलहरूको मात्र इन्डिकेटर स्टेट बनाउने
+def is_listed_symbol(symbol):
+    state = current_state()
+    return symbol in state.snapshot.index or symbol in state.company_list.index
+
+# नयाँ स्न्यापसटको LTP ले सबै इन्डिकेटर स्टेटहरू अपडेट गर्ने
+def update_indicator_states(snapshot):
+    today = datetime.now().strftime('%Y-%m-%d')
+    ltp = snapshot.column('ltp')
+    
+    for symbol in indicator_states.keys():
+        i = snapshot.index.get(symbol)
+        state = indicator_states.peek(symbol)
+        if i is not None and state is not None:
+            state.update(today, ltp[i])
+
+# लाइभ इन्डिकेटर मानहरू एन्डपोइन्ट
+@app.route('/live_indicators')
+@conditional(snapshot_validator)
+def get_live_indicators():
+    symbol = request.args.get('symbol')
+    
+    if not symbol:
+        return jsonify({'error': 'Symbol parameter is required'}), 400
+    
+    if not is_listed_symbol(symbol.upper()):
+        return jsonify({'error': 'Unknown symbol'}), 404
+    
+    try:
+        state = get_indicator_state(symbol.upper())
+        
+        return jsonify({
+            'symbol': symbol.upper(),
+            'date': state.live_date or state.last_date,
+            'close': state.live_close if state.live_close is not None else state.last_close,
+            'live': state.live_close is not None,
+            'indicators': state.values()
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# अलर्टका समयहरूलाई ISO स्ट्रिङमा बदल्ने
+def alert_record(alert):
+    record = dict(alert)
+    for field in ('created_at', 'triggered_at', 'fired_at'):
+        if record.get(field):
+            record[field] = datetime.fromtimestamp(record[field]).strftime('%Y-%m-%dT%H:%M:%S')
+    return record
+
 # अलर्ट सेटिङ्ग एन्डपोइन्ट
 @app.route('/set_alert', methods=['POST'])
 def set_alert():
-    data = request.json
+    data = request.get_json(silent=True)
     
     if not data:
         return jsonify({'error': 'No data provided'}), 400
     
-    required_fields = ['user_id', 'symbol', 'price', 'condition']
-    for field in required_fields:
-        if field not in data:
-            return jsonify({'error': f'Missing required field: {field}'}), 400
+    try:
+        alert = alert_engine.add(data)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+    
+    return jsonify({
+        'success': True,
+        'alert_id': alert['alert_id'],
+        'alert': alert_record(alert),
+        'message': 'Alert set successfully'
+    })
+
+# धेरै अलर्टहरू एकै पटक इम्पोर्ट गर्ने एन्डपोइन्ट
+@app.route('/import_alerts', methods=['POST'])
+def import_alerts():
+    data = request.get_json(silent=True)
+    
+    # {"user_id": ..., "alerts": [...]} वा अलर्टहरूको सूची
+    if isinstance(data, list):
+        data = {'alerts': data}
+    
+    if not data or not isinstance(data.get('alerts'), list):
+        return jsonify({'error': 'alerts list is required'}), 400
+    
+    if len(data['alerts']) > MAX_IMPORT_ALERTS:
+        return jsonify({'error': f'At most {MAX_IMPORT_ALERTS} alerts can be imported at once'}), 400
     
     try:
-        # अलर्ट डाटा सेभ गर्ने
-        # वास्तविक कार्यान्वयनमा, यहाँ डाटाबेसमा अलर्ट सेभ गर्नुपर्छ
-        
-        # डमी रेस्पोन्स
-        alert_id = int(time.time())  # युनिक आईडी
+        created, errors = alert_engine.import_alerts(data['alerts'], data.get('user_id'))
         
         return jsonify({
-            'success': True,
-            'alert_id': alert_id,
-            'message': 'Alert set successfully'
+            'success': not errors,
+            'imported': len(created),
+            'alert_ids': [alert['alert_id'] for alert in created],
+            'errors': errors
         })
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -966,14 +1192,22 @@ def set_alert():
 # अलर्ट हटाउने एन्डपोइन्ट
 @app.route('/remove_alert', methods=['POST'])
 def remove_alert():
-    data = request.json
+    data = request.get_json(silent=True)
     
     if not data or 'alert_id' not in data:
         return jsonify({'error': 'Alert ID is required'}), 400
     
+    if not data.get('user_id'):
+        return jsonify({'error': 'User ID is required'}), 400
+    
     try:
-        # अलर्ट हटाउने
-        # वास्तविक कार्यान्वयनमा, यहाँ डाटाबेसबाट अलर्ट हटाउनुपर्छ
+        alert_id = int(data['alert_id'])
+    except (TypeError, ValueError):
+        return jsonify({'error': 'Invalid alert ID'}), 400
+    
+    try:
+        if not alert_engine.remove(alert_id, data['user_id']):
+            return jsonify({'error': 'Alert not found'}), 404
         
         return jsonify({
             'success': True,
@@ -986,40 +1220,49 @@ def remove_alert():
 @app.route('/user_alerts')
 def get_user_alerts():
     user_id = request.args.get('user_id')
+    status = request.args.get('status')
     
     if not user_id:
         return jsonify({'error': 'User ID is required'}), 400
     
     try:
-        # प्रयोगकर्ताको अलर्टहरू प्राप्त गर्ने
-        # वास्तविक कार्यान्वयनमा, यहाँ डाटाबेसबाट अलर्टहरू प्राप्त गर्नुपर्छ
-        
-        # डमी डाटा
-        alerts = [
-            {
-                'alert_id': 1234567890,
-                'symbol': 'NABIL',
-                'price': 1000,
-                'condition': 'above',
-                'created_at': '2023-01-01T12:00:00',
-                'status': 'active'
-            },
-            {
-                'alert_id': 1234567891,
-                'symbol': 'NRIC',
-                'price': 800,
-                'condition': 'below',
-                'created_at': '2023-01-02T12:00:00',
-                'status': 'active'
-            }
-        ]
+        alerts = alert_engine.user_alerts(user_id, status)
+        return jsonify([alert_record(alert) for alert in alerts])
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# फायर भएका अलर्टहरूको फिड (since कर्सर पछिका मात्र)
+@app.route('/fired_alerts')
+def get_fired_alerts():
+    user_id = request.args.get('user_id')
+    symbol = request.args.get('symbol')
+    
+    if not user_id:
+        return jsonify({'error': 'User ID is required'}), 400
+    
+    try:
+        since = int(request.args.get('since', 0))
+        limit = int(request.args.get('limit', 100))
+    except ValueError:
+        return jsonify({'error': 'Invalid since or limit parameter'}), 400
+    
+    try:
+        events, cursor = alert_engine.feed(user_id, symbol, since, limit)
         
-        return jsonify(alerts)
+        return jsonify({
+            'data': [alert_record(event) for event in events],
+            'meta': {
+                'total': len(events),
+                'since': since,
+                'next': cursor
+            }
+        })
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 # एडभान्स्ड फिल्टर एन्डपोइन्ट
 @app.route('/advanced_filter')
+@conditional(advanced_filter_validator)
 def advanced_filter():
     # फिल्टर प्यारामिटरहरू
     sector = request.args.get('sector')
@@ -1034,43 +1277,26 @@ def advanced_filter():
     
     try:
         # NEPSE डाटा प्राप्त गर्ने
-        data = fetch_nepse_data()
+        snapshot = get_nepse_snapshot()
         
-        # फिल्टरिङ
-        filtered_data = data.copy()
+        # फिल्टरिङ (टाइप गरिएका कलमहरूमा)
+        mask = snapshot.all_mask()
         
         if sector:
-            filtered_data = [item for item in filtered_data if item.get('sector') == sector]
-        
-        if min_price:
-            filtered_data = [item for item in filtered_data if float(item.get('ltp', 0)) >= float(min_price)]
-        
-        if max_price:
-            filtered_data = [item for item in filtered_data if float(item.get('ltp', 0)) <= float(max_price)]
+            # सिम्बल र क्षेत्रको म्याप प्रयोग गरेर फिल्टर गर्ने
+            sector_symbols = [stock['symbol'] for stock in fetch_all_stocks() if stock['sector'] == sector]
+            mask &= snapshot.symbols_mask(sector_symbols)
         
-        if min_volume:
-            filtered_data = [item for item in filtered_data if int(item.get('volume', 0)) >= int(min_volume)]
-        
-        if max_volume:
-            filtered_data = [item for item in filtered_data if int(item.get('volume', 0)) <= int(max_volume)]
-        
-        if min_change:
-            filtered_data = [item for item in filtered_data if float(item.get('change_percent', 0)) >= float(min_change)]
-        
-        if max_change:
-            filtered_data = [item for item in filtered_data if float(item.get('change_percent', 0)) <= float(max_change)]
+        try:
+            mask &= snapshot.range_mask('ltp', min_price, max_price)
+            mask &= snapshot.range_mask('qty', min_volume, max_volume)
+            mask &= snapshot.range_mask('percent_change', min_change, max_change)
+        except ValueError:
+            return jsonify({'error': 'Invalid price, volume or change filter'}), 400
         
         # सर्टिङ
-        reverse_order = sort_order.lower() == 'desc'
-        
-        if sort_by == 'price':
-            filtered_data.sort(key=lambda x: float(x.get('ltp', 0)), reverse=reverse_order)
-        elif sort_by == 'volume':
-            filtered_data.sort(key=lambda x: int(x.get('volume', 0)), reverse=reverse_order)
-        elif sort_by == 'change':
-            filtered_data.sort(key=lambda x: float(x.get('change_percent', 0)), reverse=reverse_order)
-        else:  # symbol
-            filtered_data.sort(key=lambda x: x.get('symbol', ''), reverse=reverse_order)
+        sort_fields = {'price': 'ltp', 'volume': 'qty', 'change': 'percent_change'}
+        filtered_data = snapshot.select(mask, sort_fields.get(sort_by, 'symbol'), sort_order.lower() == 'desc')
         
         return jsonify(filtered_data)
     except Exception as e:
@@ -1078,90 +1304,27 @@ def advanced_filter():
 
 # मेरो लगानीबाट कम्पनीहरूको सूची प्राप्त गर्ने
 def fetch_companies_from_merolagani():
-    global companies_list_cache
-    
+    return serve_cached('companies', lambda state: state.companies, CACHE_EXPIRY, refresh_companies)
+
+# कम्पनीहरूको सूची अपस्ट्रिमबाट रिफ्रेस गर्ने
+def refresh_companies():
     current_time = time.time()
+    companies_list_cache = state_holder.current().companies
     
-    # क्यास अवधि जाँच गर्ने
-    if companies_list_cache['data'] and current_time - companies_list_cache['last_updated'] < CACHE_EXPIRY:
+    # पर्खँदा अर्को थ्रेडले रिफ्रेस गरिसकेको हुन सक्छ
+    if not is_stale(companies_list_cache, CACHE_EXPIRY, current_time):
         return companies_list_cache['data']
     
     try:
-        # मेरो लगानी वेबसाइटबाट कम्पनीहरूको सूची प्राप्त गर्ने
-        url = "https://merolagani.com/CompanyList.aspx"
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
+        companies = download_companies()
         
-        response = requests.get(url, headers=headers)
-        
-        if response.status_code != 200:
+        if not companies:
             if companies_list_cache['data']:
                 return companies_list_cache['data']
             return []
         
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # कम्पनी टेबल प्राप्त गर्ने
-        table = soup.find('table', {'id': 'ctl00_ContentPlaceHolder1_tblCompanyList'})
-        
-        if not table:
-            if companies_list_cache['data']:
-                return companies_list_cache['data']
-            return []
-        
-        companies = []
-        
-        # टेबलबाट कम्पनीहरूको विवरण प्राप्त गर्ने
-        rows = table.find_all('tr')[1:]  # हेडर छोड्ने
-        
-        for row in rows:
-            cols = row.find_all('td')
-            
-            if len(cols) >= 7:
-                symbol_element = cols[0].find('a')
-                
-                if symbol_element:
-                    symbol = symbol_element.text.strip()
-                    company_name = cols[1].text.strip()
-                    sector = cols[2].text.strip()
-                    
-                    # LTP, % Change, 52 Weeks High/Low प्राप्त गर्ने
-                    try:
-                        ltp = float(cols[3].text.strip().replace(',', ''))
-                    except:
-                        ltp = 0.0
-                    
-                    try:
-                        change_percent = float(cols[4].text.strip().replace('%', ''))
-                    except:
-                        change_percent = 0.0
-                    
-                    try:
-                        high_52_week = float(cols[5].text.strip().replace(',', ''))
-                    except:
-                        high_52_week = 0.0
-                    
-                    try:
-                        low_52_week = float(cols[6].text.strip().replace(',', ''))
-                    except:
-                        low_52_week = 0.0
-                    
-                    companies.append({
-                        'symbol': symbol,
-                        'company_name': company_name,
-                        'sector': sector,
-                        'ltp': ltp,
-                        'change_percent': change_percent,
-                        'high_52_week': high_52_week,
-                        'low_52_week': low_52_week
-                    })
-        
-        # क्यास अपडेट गर्ने
-        companies_list_cache = {
-            'data': companies,
-            'last_updated': current_time
-        }
+        # क्यास अपडेट गर्ने र सर्ट क्रमहरू एक पटक गणना गर्ने
+        publish_refresh({'companies': companies}, current_time)
         
         return companies
     
@@ -1174,197 +1337,118 @@ def fetch_companies_from_merolagani():
         
         return []
 
+# मेरो लगानीबाट कम्पनी विवरण डाउनलोड र पार्स गर्ने (क्यास नछुने)
+# पेजमा मूल्य र आधारभूत विवरण कुनै पनि नभए सिम्बल अवस्थित छैन भनी None फर्काउने
+def download_company_detail(symbol):
+    company_detail = parse_company_detail(download_page(COMPANY_DETAIL_URL.format(symbol=symbol)), symbol)
+    
+    if not company_detail['price_info'] and not company_detail['fundamentals']:
+        return None
+    
+    return company_detail
+
+# कम्पनी विवरण क्यासमा राख्ने (None भए नेगेटिभ क्यास)
+def store_company_detail(symbol, company_detail, last_updated):
+    if company_detail is None:
+        company_details_cache.set_missing(symbol)
+        return
+    
+    # चेकप्वाइन्टबाट आएको पुरानो विवरणले पछि रिफ्रेस भएको विवरण नमेटोस्
+    cached = company_details_cache.peek(symbol)
+    if cached is not None and cached is not NOT_FOUND and cached['last_updated'] >= last_updated:
+        return
+    
+    # चेकप्वाइन्टबाट आएको पुरानो विवरणको बाँकी आयु मात्र
+    ttl = COMPANY_DETAILS_EXPIRY + MAX_STALE - (time.time() - last_updated)
+    if ttl > 0:
+        company_details_cache.set(symbol, cache_entry(company_detail, last_updated), ttl)
+
+# क्यासमा रहेको कम्पनी विवरण प्रविष्टि (नभए वा नेगेटिभ भए खाली प्रविष्टि)
+def cached_company_detail(symbol):
+    entry = company_details_cache.peek(symbol)
+    return EMPTY_CACHE if entry is None or entry is NOT_FOUND else entry
+
+# कम्पनी सूची लोड भइसकेको भए सूचीमा नभएका सिम्बलहरू अपस्ट्रिममा नखोज्ने
+def is_known_symbol(symbol):
+    company_list = current_state().company_list
+    return not len(company_list) or symbol in company_list.index
+
+# क्रलरको डाउनलोड पनि रिक्वेस्टकै ('company_detail', symbol) फ्लाइटमा मिल्ने
+def crawl_company_detail(symbol):
+    return upstream.do(('company_detail', symbol), download_company_detail, symbol)
+
+# अर्को क्रल पासअघि म्याद सकिने (वा क्यासमा नभएका) विवरणहरू मात्र क्रल गर्ने
+def company_detail_needs_crawl(symbol):
+    cached = company_details_cache.peek(symbol)
+    if cached is NOT_FOUND:
+        return False
+    return cached is None or time.time() - cached['last_updated'] >= COMPANY_DETAILS_EXPIRY - COMPANY_CRAWL_INTERVAL
+
+# सबै कम्पनीहरूको विवरण पहिले नै क्यासमा भर्ने क्रलर
+# चेकप्वाइन्ट एक दिनसम्म मान्य, त्यसैले पूरा क्रल दिनमा बढीमा एक पटक (रिस्टार्टमा रोकिएकै ठाउँबाट)
+company_crawler = CompanyCrawler(
+    crawl_company_detail,
+    store_company_detail,
+    concurrency=COMPANY_CRAWL_CONCURRENCY,
+    delay=COMPANY_CRAWL_DELAY,
+    checkpoint_path=COMPANY_CRAWL_CHECKPOINT,
+    max_age=COMPANY_DETAILS_EXPIRY,
+    should_fetch=company_detail_needs_crawl,
+    progress=print_progress if COMPANY_CRAWL_VERBOSE else None
+)
+
+# कम्पनी सूचीका सबै सिम्बलहरूको विवरण क्रल गर्ने
+def crawl_company_details():
+    symbols = [company['symbol'] for company in fetch_companies_from_merolagani()]
+    return company_crawler.crawl(symbols)
+
+# क्यासको म्याद सकिनु अघि नै फेरि क्रल गर्ने लुप (हरेक पासमा म्याद सकिन लागेका मात्र)
+def company_crawl_loop():
+    while True:
+        try:
+            crawl_company_details()
+        except Exception as e:
+            print(f"Company crawl error: {str(e)}")
+        
+        # म्याद सकिएका विवरणहरू मेमोरीबाट हटाउने
+        company_details_cache.purge()
+        
+        time.sleep(COMPANY_CRAWL_INTERVAL)
+
 # मेरो लगानीबाट कम्पनी विवरण प्राप्त गर्ने
 def fetch_company_details(symbol):
-    global company_details_cache
+    if not is_known_symbol(symbol):
+        return None
+    
+    # अवस्थित नभएको भनी भर्खरै थाहा भएको सिम्बल
+    if company_details_cache.get(symbol) is NOT_FOUND:
+        return None
     
+    return serve_cached(
+        ('company_detail', symbol),
+        lambda state: cached_company_detail(symbol),
+        COMPANY_DETAILS_EXPIRY,
+        refresh_company_details,
+        symbol
+    )
+
+# कम्पनी विवरण अपस्ट्रिमबाट रिफ्रेस गर्ने
+def refresh_company_details(symbol):
     current_time = time.time()
+    cached = company_details_cache.peek(symbol)
+    
+    # पर्खँदा अर्को थ्रेडले रिफ्रेस गरिसकेको हुन सक्छ
+    if cached is NOT_FOUND:
+        return None
     
-    # क्यास अवधि जाँच गर्ने
-    if symbol in company_details_cache and current_time - company_details_cache[symbol]['last_updated'] < CACHE_EXPIRY:
-        return company_details_cache[symbol]['data']
+    if cached and current_time - cached['last_updated'] < COMPANY_DETAILS_EXPIRY:
+        return cached['data']
     
     try:
-        # मेरो लगानी वेबसाइटबाट कम्पनी विवरण प्राप्त गर्ने
-        url = f"https://merolagani.com/CompanyDetail.aspx?symbol={symbol}"
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        
-        response = requests.get(url, headers=headers)
-        
-        if response.status_code != 200:
-            if symbol in company_details_cache:
-                return company_details_cache[symbol]['data']
-            return None
-        
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # कम्पनी विवरण प्राप्त गर्ने
-        company_detail = {}
-        
-        # कम्पनी नाम
-        company_name_element = soup.find('span', {'id': 'ctl00_ContentPlaceHolder1_CompanyDetail1_companyName'})
-        if company_name_element:
-            company_detail['company_name'] = company_name_element.text.strip()
-        else:
-            company_detail['company_name'] = symbol
-        
-        # सेक्टर
-        sector_element = soup.find('a', {'id': 'ctl00_ContentPlaceHolder1_CompanyDetail1_lblSector'})
-        if sector_element:
-            company_detail['sector'] = sector_element.text.strip()
-        else:
-            company_detail['sector'] = "N/A"
-        
-        # शेयर मूल्य विवरण
-        price_info = {}
+        company_detail = download_company_detail(symbol)
         
-        # LTP
-        ltp_element = soup.find('span', {'id': 'ctl00_ContentPlaceHolder1_CompanyDetail1_lblMarketPrice'})
-        if ltp_element:
-            try:
-                price_info['ltp'] = float(ltp_element.text.strip().replace(',', ''))
-            except:
-                price_info['ltp'] = 0.0
-        
-        # % Change
-        change_element = soup.find('span', {'id': 'ctl00_ContentPlaceHolder1_CompanyDetail1_lblChange'})
-        if change_element:
-            try:
-                change_text = change_element.text.strip()
-                if '(' in change_text and ')' in change_text:
-                    change_percent_text = change_text.split('(')[1].split(')')[0].replace('%', '')
-                    price_info['change_percent'] = float(change_percent_text)
-                else:
-                    price_info['change_percent'] = 0.0
-            except:
-                price_info['change_percent'] = 0.0
-        
-        # 52 Week High/Low
-        high_low_element = soup.find('span', {'id': 'ctl00_ContentPlaceHolder1_CompanyDetail1_lbl52WeekHighLow'})
-        if high_low_element:
-            try:
-                high_low_text = high_low_element.text.strip()
-                if '/' in high_low_text:
-                    high, low = high_low_text.split('/')
-                    price_info['high_52_week'] = float(high.strip().replace(',', ''))
-                    price_info['low_52_week'] = float(low.strip().replace(',', ''))
-                else:
-                    price_info['high_52_week'] = 0.0
-                    price_info['low_52_week'] = 0.0
-            except:
-                price_info['high_52_week'] = 0.0
-                price_info['low_52_week'] = 0.0
-        
-        company_detail['price_info'] = price_info
-        
-        # आधारभूत विवरण
-        fundamentals = {}
-        
-        # Market Cap
-        market_cap_element = soup.find('span', {'id': 'ctl00_ContentPlaceHolder1_CompanyDetail1_lblMarketCapitalization'})
-        if market_cap_element:
-            fundamentals['market_cap'] = market_cap_element.text.strip()
-        
-        # Shares Outstanding
-        shares_element = soup.find('span', {'id': 'ctl00_ContentPlaceHolder1_CompanyDetail1_lblOutstandingShares'})
-        if shares_element:
-            fundamentals['shares_outstanding'] = shares_element.text.strip()
-        
-        # EPS
-        eps_element = soup.find('span', {'id': 'ctl00_ContentPlaceHolder1_CompanyDetail1_lblEPS'})
-        if eps_element:
-            try:
-                fundamentals['eps'] = float(eps_element.text.strip().replace(',', ''))
-            except:
-                fundamentals['eps'] = 0.0
-        
-        # P/E Ratio
-        pe_element = soup.find('span', {'id': 'ctl00_ContentPlaceHolder1_CompanyDetail1_lblPERatio'})
-        if pe_element:
-            try:
-                fundamentals['pe_ratio'] = float(pe_element.text.strip().replace(',', ''))
-            except:
-                fundamentals['pe_ratio'] = 0.0
-        
-        # Book Value
-        book_value_element = soup.find('span', {'id': 'ctl00_ContentPlaceHolder1_CompanyDetail1_lblBookValue'})
-        if book_value_element:
-            try:
-                fundamentals['book_value'] = float(book_value_element.text.strip().replace(',', ''))
-            except:
-                fundamentals['book_value'] = 0.0
-        
-        # PBV
-        pbv_element = soup.find('span', {'id': 'ctl00_ContentPlaceHolder1_CompanyDetail1_lblPBV'})
-        if pbv_element:
-            try:
-                fundamentals['pbv'] = float(pbv_element.text.strip().replace(',', ''))
-            except:
-                fundamentals['pbv'] = 0.0
-        
-        # Dividend
-        dividend_element = soup.find('span', {'id': 'ctl00_ContentPlaceHolder1_CompanyDetail1_lblDividend'})
-        if dividend_element:
-            fundamentals['dividend'] = dividend_element.text.strip()
-        
-        # Dividend Yield
-        dividend_yield_element = soup.find('span', {'id': 'ctl00_ContentPlaceHolder1_CompanyDetail1_lblDividendYield'})
-        if dividend_yield_element:
-            try:
-                yield_text = dividend_yield_element.text.strip()
-                if '%' in yield_text:
-                    fundamentals['dividend_yield'] = float(yield_text.replace('%', ''))
-                else:
-                    fundamentals['dividend_yield'] = 0.0
-            except:
-                fundamentals['dividend_yield'] = 0.0
-        
-        company_detail['fundamentals'] = fundamentals
-        
-        # कम्पनी विवरण
-        description = {}
-        
-        # About
-        about_element = soup.find('div', {'id': 'ctl00_ContentPlaceHolder1_CompanyDetail1_divCompanyProfile'})
-        if about_element:
-            description['about'] = about_element.text.strip()
-        
-        # Contact Info
-        contact_element = soup.find('div', {'id': 'ctl00_ContentPlaceHolder1_CompanyDetail1_divContactInfo'})
-        if contact_element:
-            contact_info = {}
-            
-            # Address
-            address_element = soup.find('span', {'id': 'ctl00_ContentPlaceHolder1_CompanyDetail1_lblAddress'})
-            if address_element:
-                contact_info['address'] = address_element.text.strip()
-            
-            # Phone
-            phone_element = soup.find('span', {'id': 'ctl00_ContentPlaceHolder1_CompanyDetail1_lblPhone'})
-            if phone_element:
-                contact_info['phone'] = phone_element.text.strip()
-            
-            # Email
-            email_element = soup.find('span', {'id': 'ctl00_ContentPlaceHolder1_CompanyDetail1_lblEmail'})
-            if email_element:
-                contact_info['email'] = email_element.text.strip()
-            
-            # Website
-            website_element = soup.find('span', {'id': 'ctl00_ContentPlaceHolder1_CompanyDetail1_lblWebsite'})
-            if website_element:
-                contact_info['website'] = website_element.text.strip()
-            
-            description['contact_info'] = contact_info
-        
-        company_detail['description'] = description
-        
-        # क्यास अपडेट गर्ने
-        company_details_cache[symbol] = {
-            'data': company_detail,
-            'last_updated': current_time
-        }
+        # क्यास अपडेट गर्ने (सिम्बल अवस्थित नभए नेगेटिभ क्यास)
+        store_company_detail(symbol, company_detail, current_time)
         
         return company_detail
     
@@ -1372,13 +1456,14 @@ def fetch_company_details(symbol):
         print(f"कम्पनी विवरण प्राप्त गर्न त्रुटि: {str(e)}")
         
         # क्यास डाटा फर्काउने यदि उपलब्ध छ भने
-        if symbol in company_details_cache:
-            return company_details_cache[symbol]['data']
+        if cached:
+            return cached['data']
         
         return None
 
 # मेरो लगानीबाट कम्पनीहरूको सूची प्राप्त गर्ने API
 @app.route('/companies')
+@conditional(companies_validator)
 def get_companies():
     try:
         # क्वेरी प्यारामिटरहरू
@@ -1386,40 +1471,50 @@ def get_companies():
         search = request.args.get('search', '')
         sort_by = request.args.get('sort_by', 'symbol')
         sort_order = request.args.get('sort_order', 'asc')
+        limit = request.args.get('limit')
+        offset = request.args.get('offset', 0)
+        
+        try:
+            limit = int(limit) if limit else None
+            offset = int(offset)
+        except:
+            limit = None
+            offset = 0
         
         # कम्पनीहरूको सूची प्राप्त गर्ने
-        companies = fetch_companies_from_merolagani()
+        fetch_companies_from_merolagani()
+        company_list = current_state().company_list
+        stale = data_is_stale()
+        
+        def build_result(companies):
+            return {
+                'success': True,
+                'data': companies,
+                'count': len(companies),
+                'stale': stale
+            }
         
-        # सेक्टर अनुसार फिल्टर गर्ने
+        # पूरा सूची (प्यारामिटर बिना) भर्सन अनुसार एक पटक मात्र सिरियलाइज/कम्प्रेस गर्ने
+        if not request.args:
+            return response_cache.response(
+                'companies',
+                (company_list.last_updated, stale),
+                lambda: build_result(company_list.select())
+            )
+        
+        # सेक्टर र खोज अनुसार फिल्टर गर्ने
+        mask = None
         if sector:
-            companies = [company for company in companies if company['sector'].lower() == sector.lower()]
+            mask = company_list.sector_mask(sector)
         
-        # खोज अनुसार फिल्टर गर्ने
         if search:
-            search = search.lower()
-            companies = [company for company in companies if 
-                         search in company['symbol'].lower() or 
-                         search in company['company_name'].lower()]
-        
-        # सर्ट गर्ने
-        reverse = sort_order.lower() == 'desc'
-        
-        if sort_by == 'symbol':
-            companies = sorted(companies, key=lambda x: x['symbol'], reverse=reverse)
-        elif sort_by == 'company_name':
-            companies = sorted(companies, key=lambda x: x['company_name'], reverse=reverse)
-        elif sort_by == 'sector':
-            companies = sorted(companies, key=lambda x: x['sector'], reverse=reverse)
-        elif sort_by == 'ltp':
-            companies = sorted(companies, key=lambda x: x['ltp'], reverse=reverse)
-        elif sort_by == 'change_percent':
-            companies = sorted(companies, key=lambda x: x['change_percent'], reverse=reverse)
+            search_mask = company_list.search_mask(search)
+            mask = search_mask if mask is None else mask & search_mask
         
-        return jsonify({
-            'success': True,
-            'data': companies,
-            'count': len(companies)
-        })
+        # पहिले नै सर्ट गरिएको क्रमबाट पेज निकाल्ने
+        companies = company_list.select(mask, sort_by, sort_order.lower() == 'desc', limit, offset)
+        
+        return jsonify(build_result(companies))
     
     except Exception as e:
         return jsonify({
@@ -1427,8 +1522,19 @@ def get_companies():
             'error': str(e)
         })
 
+# कम्पनी विवरण क्रलको प्रगति प्राप्त गर्ने API
+@app.route('/company_crawl_status')
+def get_company_crawl_status():
+    return jsonify({
+        'success': True,
+        'running': company_crawler.running,
+        'data': company_crawler.status,
+        'cache': company_details_cache.stats()
+    })
+
 # कम्पनी विवरण प्राप्त गर्ने API
 @app.route('/company/<symbol>')
+@conditional(company_detail_validator)
 def get_company_detail(symbol):
     try:
         # कम्पनी विवरण प्राप्त गर्ने
@@ -1442,7 +1548,8 @@ def get_company_detail(symbol):
         
         return jsonify({
             'success': True,
-            'data': company_detail
+            'data': company_detail,
+            'stale': data_is_stale()
         })
     
     except Exception as e:
@@ -1453,19 +1560,23 @@ def get_company_detail(symbol):
 
 # सेक्टरहरूको सूची प्राप्त गर्ने API
 @app.route('/sectors_list')
+@conditional(companies_validator)
 def get_sectors_list():
     try:
         # कम्पनीहरूको सूची प्राप्त गर्ने
-        companies = fetch_companies_from_merolagani()
-        
-        # सेक्टरहरूको सूची प्राप्त गर्ने
-        sectors = list(set([company['sector'] for company in companies]))
-        sectors.sort()
-        
-        return jsonify({
-            'success': True,
-            'data': sectors
-        })
+        fetch_companies_from_merolagani()
+        companies_list = current_state().companies
+        companies = companies_list['data']
+        
+        # सेक्टरहरूको सूची (कम्पनी सूची भर्सन अनुसार क्यास गरिएको)
+        return response_cache.response(
+            'sectors_list',
+            companies_list['last_updated'],
+            lambda: {
+                'success': True,
+                'data': sorted(set(company['sector'] for company in companies))
+            }
+        )
     
     except Exception as e:
         return jsonify({
@@ -1475,13 +1586,21 @@ def get_sectors_list():
 
 # मेन फंक्सन
 if __name__ == '__main__':
-    # क्यास फाइलहरू लोड गर्ने
-    load_cache_files()
-    
-    # ब्याकग्राउन्ड थ्रेड सुरु गर्ने
-    bg_thread = threading.Thread(target=background_data_update)
-    bg_thread.daemon = True
-    bg_thread.start()
+    # डिबग रिलोडरले यो ब्लक प्यारेन्ट र चाइल्ड दुवै प्रोसेसमा चलाउँछ, त्यसैले सर्भिसहरू रिक्वेस्ट
+    # सर्भ गर्ने चाइल्ड प्रोसेसमा मात्र सुरु गर्ने (नत्र पोर्ट 5001, क्रल र अलर्ट DB दोहोरिन्छन्)
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        # पुश स्ट्रिम सर्भर सुरु गर्ने (आफ्नै इभेन्ट लुप थ्रेडमा)
+        stream_hub.start()
+        
+        # ब्याकग्राउन्ड थ्रेड सुरु गर्ने (क्यास फाइलहरू पहिलो पटक स्टेट चाहिँदा लोड हुन्छन्)
+        bg_thread = threading.Thread(target=background_data_update)
+        bg_thread.daemon = True
+        bg_thread.start()
+        
+        # कम्पनी विवरण क्रलर थ्रेड सुरु गर्ने
+        crawl_thread = threading.Thread(target=company_crawl_loop)
+        crawl_thread.daemon = True
+        crawl_thread.start()
     
     # सर्भर सुरु गर्ने
     app.run(debug=True, host='0.0.0.0', port=5000) 
\ No newline at end of file
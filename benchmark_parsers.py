@@ -0,0 +1,312 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+पार्सर बेन्चमार्क
+
+सेभ गरिएका पेजहरूमा nepse_parsers का सबै पार्सिङ मोडहरू (soup, strainer, lxml) चलाएर समय
+तुलना गर्छ र सबै मोडको नतिजा एउटै भएको जाँच गर्छ।
+
+saved_pages/ मा --generate ले बनाएका नमूना पेजहरू कमिट गरिएका छन् (वास्तविक पेज जत्तिकै
+ठूला, उही टेबल/ID संरचना र वरिपरि नेभिगेसन, स्क्रिप्ट र अरू टेबलहरू सहित), त्यसैले नेटवर्क
+बिना पनि नतिजा दोहोर्याउन सकिन्छ। CPython 3.11, lxml 6.1, bs4 4.15 मा --repeat 20 को एउटा नतिजा
+(मेसिन अनुसार समय फरक पर्छ; टेबल पेजमा करिब 8-10x, ID पेजमा करिब 20-30x):
+
+    page                              KB      lxml ms  strainer ms      soup ms   speedup  same
+    todays_price.html               81.6        18.16       169.21       164.85      9.1x  yes
+    company.html                    62.4        10.24        94.52       104.82     10.2x  yes
+    CompanyList.html                87.0        16.05       131.66       152.30      9.5x  yes
+    MarketSummary.html              39.6         2.46        23.57        51.15     20.8x  yes
+    CompanyDetail_NABIL.html        39.0         2.03        21.23        51.54     25.4x  yes
+
+प्रयोग:
+    python benchmark_parsers.py --save               # हालका पेजहरू saved_pages/ मा सेभ गर्ने
+    python benchmark_parsers.py --generate           # नमूना पेजहरू saved_pages/ मा बनाउने
+    python benchmark_parsers.py --repeat 20          # सेभ गरिएका पेजहरूमा बेन्चमार्क चलाउने
+"""
+
+import os
+import sys
+import glob
+import html
+import time
+import random
+import argparse
+import statistics
+import nepse_parsers
+from nepse_parsers import (
+    PARSE_MODES, parse_todays_price, parse_stock_list, parse_company_list,
+    parse_company_detail, parse_merolagani_summary
+)
+
+# पेज फाइल → (URL, पार्सर)
+PAGES = {
+    'todays_price.html': ('https://www.nepalstock.com/todays_price', parse_todays_price),
+    'company.html': ('https://www.nepalstock.com/company', parse_stock_list),
+    'CompanyList.html': ('https://merolagani.com/CompanyList.aspx', parse_company_list),
+    'MarketSummary.html': ('https://merolagani.com/MarketSummary.aspx', lambda html, mode: parse_merolagani_summary(html, 'Closed', mode))
+}
+DETAIL_URL = 'https://merolagani.com/CompanyDetail.aspx?symbol={symbol}'
+DETAIL_PATTERN = 'CompanyDetail_*.html'
+
+# नमूना पेजहरूका सेक्टर र आकार
+SAMPLE_SECTORS = ['Commercial Banks', 'Development Banks', 'Finance', 'Hydro Power', 'Life Insurance',
+                  'Non Life Insurance', 'Microfinance', 'Manufacturing And Processing', 'Hotels And Tourism', 'Others']
+SAMPLE_COMPANIES = 320
+SAMPLE_SEED = 2024
+
+def save_pages(directory, symbols):
+    """हालका पेजहरू डाउनलोड गरेर सेभ गर्ने"""
+    from nepse_fetch import fetch
+
+    os.makedirs(directory, exist_ok=True)
+
+    urls = {name: url for name, (url, _) in PAGES.items()}
+    for symbol in symbols:
+        urls[f'CompanyDetail_{symbol}.html'] = DETAIL_URL.format(symbol=symbol)
+
+    for name, url in urls.items():
+        try:
+            response = fetch(url)
+            response.raise_for_status()
+            with open(os.path.join(directory, name), 'w', encoding='utf-8') as f:
+                f.write(response.text)
+            print(f"सेभ गरियो: {name} ({len(response.text)} bytes)")
+        except Exception as e:
+            print(f"{name} डाउनलोड गर्न त्रुटि: {str(e)}")
+
+def sample_symbols(rng, count):
+    """नमूना पेजहरूका लागि दोहोरो नपर्ने सिम्बलहरू"""
+    symbols = set()
+    while len(symbols) < count:
+        symbols.add(''.join(rng.choice('ABCDEFGHIJKLMNOPQRSTUVWXYZ') for _ in range(rng.randint(3, 6))))
+    return sorted(symbols)
+
+def page_shell(title, body, rng):
+    """वास्तविक पेज जस्तै हेड, नेभिगेसन, स्क्रिप्ट र फुटर भएको पेज"""
+    links = ''.join(
+        f'<li class="nav-item"><a class="nav-link" href="/menu/{index}">Menu item {index}</a></li>'
+        for index in range(60)
+    )
+    scripts = ''.join(
+        f'<script type="text/javascript">var cfg{index} = {{"id": {rng.randint(1, 99999)}, "enabled": true}};</script>'
+        for index in range(20)
+    )
+    news = ''.join(
+        f'<div class="media news-item"><div class="media-body"><h4 class="media-title">'
+        f'<a href="/news/{rng.randint(1000, 9999)}">Market update {index}</a></h4>'
+        f'<p class="text-muted">{"Lorem ipsum dolor sit amet. " * 6}</p></div></div>'
+        for index in range(40)
+    )
+    return (
+        '<!DOCTYPE html>\n<html><head><meta charset="utf-8"><title>' + title + '</title>'
+        '<link rel="stylesheet" href="/css/site.css">' + scripts + '</head><body>'
+        '<form method="post" id="aspnetForm"><input type="hidden" name="__VIEWSTATE" value="' + 'x' * 4000 + '">'
+        '<nav class="navbar"><ul class="nav navbar-nav">' + links + '</ul></nav>'
+        '<div class="container"><div class="row"><div class="col-md-9">' + body + '</div>'
+        '<div class="col-md-3 sidebar">' + news + '</div></div></div>'
+        '<footer class="footer"><p>&copy; Sample page</p></footer></form></body></html>\n'
+    )
+
+def decoy_table(rng, rows):
+    """लक्षित टेबल अगाडि राखिने अर्को टेबल (पार्सरले छोड्नुपर्ने)"""
+    body = ''.join(
+        f'<tr><td>{index}</td><td>Item {index}</td><td>{rng.uniform(1, 1000):.2f}</td></tr>'
+        for index in range(rows)
+    )
+    return f'<table class="table table-condensed"><tr><th>#</th><th>Name</th><th>Value</th></tr>{body}</table>'
+
+def generate_pages(directory, detail_symbols):
+    """वास्तविक पेजको संरचना भएका नमूना पेजहरू बनाउने (एउटै बीउ, त्यसैले हरेक पटक उही)"""
+    rng = random.Random(SAMPLE_SEED)
+    symbols = sample_symbols(rng, SAMPLE_COMPANIES)
+    companies = [
+        (symbol, f'{symbol.title()} Limited', rng.choice(SAMPLE_SECTORS), rng.uniform(100, 3000))
+        for symbol in symbols
+    ]
+    pages = {}
+
+    rows = []
+    for index, (symbol, name, sector, ltp) in enumerate(companies, 1):
+        change = rng.uniform(-0.05, 0.05) * ltp
+        high, low = ltp * 1.02, ltp * 0.97
+        rows.append(
+            f'<tr><td>{index}</td><td>{symbol}</td><td>{rng.randint(10, 5000):,}</td>'
+            f'<td>{ltp - change:,.2f}</td><td>{high:,.2f}</td><td>{low:,.2f}</td><td>{ltp:,.2f}</td>'
+            f'<td>{change:.2f}</td><td>{ltp * rng.randint(100, 90000):,.2f}</td>'
+            f'<td>{ltp - change:,.2f}</td><td>{rng.randint(100, 900000):,}</td></tr>'
+        )
+    pages['todays_price.html'] = page_shell('Today\'s Price', decoy_table(rng, 20) + (
+        '<table class="table table-bordered table-striped table-hover"><tr><th>S.N.</th><th>Symbol</th>'
+        '<th>Transactions</th><th>Open</th><th>High</th><th>Low</th><th>Close</th><th>Change</th>'
+        '<th>Turnover</th><th>Prev. Close</th><th>Volume</th></tr>' + ''.join(rows) + '</table>'
+    ), rng)
+
+    rows = [
+        f'<tr><td>{index}</td><td>{symbol}</td><td>{html.escape(name)}</td><td>{sector}</td>'
+        f'<td><a href="/company/{symbol}">View</a></td></tr>'
+        for index, (symbol, name, sector, _) in enumerate(companies, 1)
+    ]
+    pages['company.html'] = page_shell('Listed Companies', decoy_table(rng, 20) + (
+        '<table class="table table-bordered table-striped table-hover"><tr><th>S.N.</th><th>Symbol</th>'
+        '<th>Company</th><th>Sector</th><th></th></tr>' + ''.join(rows) + '</table>'
+    ), rng)
+
+    rows = [
+        f'<tr><td><a href="/CompanyDetail.aspx?symbol={symbol}" title="{html.escape(name)}">{symbol}</a></td>'
+        f'<td>{html.escape(name)}</td><td>{sector}</td><td>{ltp:,.2f}</td><td>{rng.uniform(-5, 5):.2f}%</td>'
+        f'<td>{ltp * 1.3:,.2f}</td><td>{ltp * 0.7:,.2f}</td></tr>'
+        for symbol, name, sector, ltp in companies
+    ]
+    # सेक्टर शीर्षक रो (लिङ्क बिनाको) पनि राख्ने
+    rows.insert(0, '<tr><td colspan="7"><strong>All sectors</strong></td></tr>')
+    pages['CompanyList.html'] = page_shell('Company List', decoy_table(rng, 20) + (
+        '<table class="table table-bordered table-striped table-hover" id="ctl00_ContentPlaceHolder1_tblCompanyList">'
+        '<tr><th>Symbol</th><th>Name</th><th>Sector</th><th>LTP</th><th>% Change</th>'
+        '<th>52 Wk High</th><th>52 Wk Low</th></tr>' + ''.join(rows) + '</table>'
+    ), rng)
+
+    live = {
+        'LiveNepse': ('2,104.37', '+12.45 (0.59%)'),
+        'LiveTurnover': ('Rs. 4.21 B', ''),
+        'LiveSharesTraded': ('9.87 M', ''),
+        'LiveTransactions': ('48,213', ''),
+        'LiveMarketCap': ('Rs. 3.41 T', '')
+    }
+    boxes = ''.join(
+        f'<div class="col-md-2 live-box" id="ctl00_ContentPlaceHolder1_{box}"><span class="label">{box[4:]}</span>'
+        f'<span class="price">{price}</span><span class="change up">{change}</span></div>'
+        for box, (price, change) in live.items()
+    )
+    pages['MarketSummary.html'] = page_shell('Market Summary', boxes + decoy_table(rng, 300), rng)
+
+    prefix = 'ctl00_ContentPlaceHolder1_CompanyDetail1_'
+    for symbol in detail_symbols:
+        ltp = rng.uniform(100, 3000)
+        spans = {
+            'lblMarketPrice': f'{ltp:,.2f}',
+            'lblChange': f'{ltp * 0.01:.2f} ({rng.uniform(-5, 5):.2f}%)',
+            'lbl52WeekHighLow': f'{ltp * 1.3:,.2f} / {ltp * 0.7:,.2f}',
+            'lblMarketCapitalization': f'Rs. {rng.uniform(1, 90):.2f} B',
+            'lblOutstandingShares': f'{rng.randint(1, 300)} M',
+            'lblEPS': f'{rng.uniform(1, 60):.2f}',
+            'lblPERatio': f'{rng.uniform(5, 60):.2f}',
+            'lblBookValue': f'{rng.uniform(90, 400):.2f}',
+            'lblPBV': f'{rng.uniform(0.5, 6):.2f}',
+            'lblDividend': f'{rng.uniform(0, 30):.2f}%',
+            'lblDividendYield': f'{rng.uniform(0, 8):.2f}%'
+        }
+        body = (
+            f'<h1><span id="{prefix}companyName">{symbol.title()} Limited</span></h1>'
+            f'<a id="{prefix}lblSector" href="/sector">{rng.choice(SAMPLE_SECTORS)}</a>'
+            '<table class="table table-striped">'
+            + ''.join(f'<tr><th>{name[3:]}</th><td><span id="{prefix}{name}">{value}</span></td></tr>'
+                      for name, value in spans.items())
+            + '</table>'
+            f'<div id="{prefix}divCompanyProfile">{"Company profile text. " * 40}</div>'
+            f'<div id="{prefix}divContactInfo">'
+            f'<span id="{prefix}lblAddress">Kathmandu, Nepal</span>'
+            f'<span id="{prefix}lblPhone">01-4{rng.randint(100000, 999999)}</span>'
+            f'<span id="{prefix}lblEmail">info@{symbol.lower()}.com.np</span>'
+            f'<span id="{prefix}lblWebsite">www.{symbol.lower()}.com.np</span></div>'
+            + decoy_table(rng, 250)
+        )
+        pages[f'CompanyDetail_{symbol}.html'] = page_shell(f'{symbol} Company Detail', body, rng)
+
+    os.makedirs(directory, exist_ok=True)
+    for name, text in pages.items():
+        with open(os.path.join(directory, name), 'w', encoding='utf-8', newline='\n') as f:
+            f.write(text)
+        print(f"बनाइयो: {name} ({len(text)} bytes)")
+
+def load_pages(directory):
+    """सेभ गरिएका पेजहरू र तिनका पार्सरहरू प्राप्त गर्ने"""
+    pages = []
+
+    for name, (_, parser) in PAGES.items():
+        path = os.path.join(directory, name)
+        if os.path.exists(path):
+            pages.append((name, path, parser))
+
+    for path in sorted(glob.glob(os.path.join(directory, DETAIL_PATTERN))):
+        name = os.path.basename(path)
+        symbol = name[len('CompanyDetail_'):-len('.html')]
+        pages.append((name, path, lambda html, mode, symbol=symbol: parse_company_detail(html, symbol, mode)))
+
+    return pages
+
+def time_parser(parser, html, mode, repeat):
+    """पार्सरको मध्यक समय (मिलिसेकेन्डमा) र नतिजा"""
+    timings = []
+    result = None
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = parser(html, mode)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    return statistics.median(timings), result
+
+def comparable(result):
+    """last_updated जस्ता समय फिल्ड हटाएर तुलना गर्न मिल्ने नतिजा"""
+    if isinstance(result, dict):
+        return {key: value for key, value in result.items() if key != 'last_updated'}
+    return result
+
+def run_benchmark(directory, repeat):
+    """सबै पेज र मोडहरूमा बेन्चमार्क चलाउने"""
+    pages = load_pages(directory)
+    if not pages:
+        print(f"{directory} मा कुनै सेभ गरिएको पेज छैन। पहिले --save चलाउनुहोस्।")
+        return False
+
+    modes = [mode for mode in PARSE_MODES if mode != 'lxml' or nepse_parsers.etree is not None]
+    matched = True
+
+    print(f"{'page':<28} {'KB':>7} " + ' '.join(f"{mode + ' ms':>12}" for mode in modes) + f" {'speedup':>9}  same")
+
+    for name, path, parser in pages:
+        with open(path, 'r', encoding='utf-8') as f:
+            html = f.read()
+
+        timings = {}
+        results = {}
+        for mode in modes:
+            timings[mode], results[mode] = time_parser(parser, html, mode, repeat)
+
+        same = all(comparable(results[mode]) == comparable(results['soup']) for mode in modes)
+        matched = matched and same
+        # पुरानो पूरा-ट्री तरिकाको तुलनामा सबैभन्दा छिटो मोडको गति
+        fastest = min(timings[mode] for mode in modes if mode != 'soup')
+        speedup = timings['soup'] / fastest if fastest else float('inf')
+
+        print(f"{name:<28} {len(html) / 1024:>7.1f} "
+              + ' '.join(f"{timings[mode]:>12.2f}" for mode in modes)
+              + f" {speedup:>8.1f}x  {'yes' if same else 'NO'}")
+
+    return matched
+
+def main():
+    """कमान्ड लाइन"""
+    parser = argparse.ArgumentParser(description='NEPSE HTML पार्सर बेन्चमार्क')
+    parser.add_argument('--pages', default='saved_pages', help='सेभ गरिएका पेजहरूको डाइरेक्टरी')
+    parser.add_argument('--repeat', type=int, default=10, help='हरेक मोड कति पटक चलाउने')
+    parser.add_argument('--save', action='store_true', help='हालका पेजहरू डाउनलोड गरेर सेभ गर्ने')
+    parser.add_argument('--generate', action='store_true', help='नेटवर्क बिना नमूना पेजहरू बनाउने')
+    parser.add_argument('--symbols', default='NABIL,NICA,UPPER', help='सेभ गर्ने कम्पनी विवरण सिम्बलहरू')
+    args = parser.parse_args()
+
+    symbols = [symbol.strip().upper() for symbol in args.symbols.split(',') if symbol.strip()]
+
+    if args.save:
+        save_pages(args.pages, symbols)
+        return 0
+
+    if args.generate:
+        generate_pages(args.pages, symbols)
+        return 0
+
+    return 0 if run_benchmark(args.pages, max(args.repeat, 1)) else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
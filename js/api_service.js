@@ -36,12 +36,12 @@ const API_CACHE = {
  */
 async function apiCall(endpoint, params = {}, useCache = true, forceRefresh = false) {
     try {
-        // क्यास कि निर्माण गर्ने
+        // क्यास कि निर्माण गर्ने (प्यारामिटर फरक भए क्यास पनि फरक)
         const cacheKey = `${endpoint}:${JSON.stringify(params)}`;
         
         // क्यास जाँच गर्ने
-        if (useCache && !forceRefresh && API_CACHE[endpoint]) {
-            const cachedData = API_CACHE[endpoint];
+        if (useCache && !forceRefresh && API_CACHE[cacheKey]) {
+            const cachedData = API_CACHE[cacheKey];
             const now = Date.now();
             
             // क्यास अझै वैध छ भने क्यास डाटा फर्काउने
@@ -81,7 +81,7 @@ async function apiCall(endpoint, params = {}, useCache = true, forceRefresh = fa
         
         // क्यास अपडेट गर्ने
         if (useCache) {
-            API_CACHE[endpoint] = {
+            API_CACHE[cacheKey] = {
                 data: data,
                 timestamp: Date.now()
             };
@@ -735,6 +735,24 @@ async function getRealTimeStockData(symbol, forceRefresh = false) {
     }
 }
 
+/**
+ * धेरै स्टकहरूको कोट एकै रिक्वेस्टमा प्राप्त गर्ने
+ * @param {Array<string>} symbols - स्टक सिम्बलहरू
+ * @param {boolean} forceRefresh - क्यास अपडेट गर्ने कि नगर्ने
+ * @returns {Promise<Object>} - सिम्बल अनुसार कोटहरू (data) र नभेटिएका सिम्बलहरू (meta.missing)
+ */
+async function getQuotes(symbols, forceRefresh = false) {
+    try {
+        const endpoint = 'quotes';
+        const params = { symbols: symbols.join(',') };
+        
+        return await apiCall(endpoint, params, true, forceRefresh);
+    } catch (error) {
+        console.error('कोटहरू प्राप्त गर्न त्रुटि:', error);
+        throw error;
+    }
+}
+
 /**
  * हिस्टोरिकल स्टक डाटा प्राप्त गर्ने
  * @param {string} symbol - स्टक सिम्बल
@@ -862,7 +880,15 @@ async function removePriceAlert(alertId) {
     try {
         const endpoint = 'remove_alert';
         
+        // प्रयोगकर्ता आईडी प्राप्त गर्ने (अरूको अलर्ट हटाउन नमिलोस्)
+        const userId = localStorage.getItem('user_id');
+        
+        if (!userId) {
+            throw new Error('प्रयोगकर्ता लगइन छैन');
+        }
+        
         const data = {
+            user_id: userId,
             alert_id: alertId
         };
         
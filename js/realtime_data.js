@@ -43,8 +43,9 @@ const callbacks = {
  */
 function initializeWebSocket() {
     try {
-        // WebSocket URL (यो तपाईंको वास्तविक WebSocket सर्भर URL संग बदल्नुहोस्)
-        const wsUrl = 'wss://api.nepsetracker.com/ws';
+        // WebSocket URL (api_server.py को पुश स्ट्रिम, window.NEPSE_WS_URL ले बदल्न मिल्छ)
+        const wsProtocol = window.location.protocol === 'https:' ? 'wss' : 'ws';
+        const wsUrl = window.NEPSE_WS_URL || `${wsProtocol}://${window.location.hostname || 'localhost'}:5001/ws`;
         
         // पहिले अवस्थित कनेक्सन बन्द गर्ने
         if (socket) {
@@ -0,0 +1,391 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+मूल्य अलर्ट इन्जिन
+
+यो मोड्युलको AlertEngine ले प्रयोगकर्ताका मूल्य अलर्टहरू SQLite डाटाबेसमा राख्छ र मेमोरीमा हरेक
+सिम्बलको लागि "माथि" र "तल" अलर्टहरूको मूल्य अनुसार क्रमबद्ध एरेहरू राख्छ। नयाँ LTP आउँदा
+bisect ले सीमा रेखा भेटिन्छ र त्यसभन्दा पारिका अलर्टहरू मात्र फायर हुन्छन्, त्यसैले एउटा सिम्बलको
+जाँच O(log n + फायर भएका) हुन्छ। अलर्टहरू एक पटक मात्र फायर हुन्छन्: फायर भएको अलर्ट
+इन्डेक्सबाट हटाइन्छ र फायर फिडमा (बढ्दो seq सहित) थपिन्छ।
+"""
+
+import os
+import time
+import sqlite3
+import threading
+from bisect import bisect_left, bisect_right
+
+CONDITIONS = ('above', 'below')
+STATUS_ACTIVE = 'active'
+STATUS_TRIGGERED = 'triggered'
+
+DEFAULT_FEED_LIMIT = 100
+MAX_FEED_LIMIT = 1000
+BUSY_TIMEOUT = 5.0  # सेकेन्ड
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS alerts (
+    alert_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    price REAL NOT NULL,
+    condition TEXT NOT NULL,
+    notification_type TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    status TEXT NOT NULL,
+    triggered_at REAL,
+    triggered_price REAL
+);
+CREATE INDEX IF NOT EXISTS alerts_user ON alerts (user_id);
+CREATE TABLE IF NOT EXISTS fired (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    alert_id INTEGER NOT NULL,
+    user_id TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    price REAL NOT NULL,
+    condition TEXT NOT NULL,
+    ltp REAL NOT NULL,
+    fired_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS fired_user ON fired (user_id, seq);
+"""
+
+ALERT_FIELDS = ['alert_id', 'user_id', 'symbol', 'price', 'condition', 'notification_type',
+                'created_at', 'status', 'triggered_at', 'triggered_price']
+FIRED_FIELDS = ['seq', 'alert_id', 'user_id', 'symbol', 'price', 'condition', 'ltp', 'fired_at']
+
+INSERT_ALERT = """
+INSERT INTO alerts (user_id, symbol, price, condition, notification_type, created_at, status)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+INSERT_FIRED = """
+INSERT INTO fired (alert_id, user_id, symbol, price, condition, ltp, fired_at)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+TRIGGER_ALERT = "UPDATE alerts SET status = ?, triggered_at = ?, triggered_price = ? WHERE alert_id = ?"
+
+def validate_alert(alert, user_id=None):
+    """अलर्ट डाटा जाँचेर (user_id, symbol, price, condition, notification_type) फर्काउने, अमान्य भए ValueError"""
+    if not isinstance(alert, dict):
+        raise ValueError('Alert must be an object')
+
+    user_id = alert.get('user_id', user_id)
+    for field, value in (('user_id', user_id), ('symbol', alert.get('symbol')),
+                         ('price', alert.get('price')), ('condition', alert.get('condition'))):
+        if value is None or value == '':
+            raise ValueError(f'Missing required field: {field}')
+
+    try:
+        price = float(alert['price'])
+    except (TypeError, ValueError):
+        raise ValueError('Price must be a number')
+    if not price > 0:
+        raise ValueError('Price must be positive')
+
+    condition = str(alert['condition']).lower()
+    if condition not in CONDITIONS:
+        raise ValueError(f"Condition must be one of: {', '.join(CONDITIONS)}")
+
+    symbol = str(alert['symbol']).strip().upper()
+    notification_type = str(alert.get('notification_type') or 'push')
+    return str(user_id), symbol, price, condition, notification_type
+
+class ThresholdBook:
+    """एउटा सिम्बल र कन्डिसनका सक्रिय अलर्टहरू (मूल्य अनुसार क्रमबद्ध समानान्तर एरेहरू)"""
+
+    __slots__ = ('prices', 'ids')
+
+    def __init__(self):
+        """इनिसियलाइजर"""
+        self.prices = []
+        self.ids = []
+
+    def __len__(self):
+        return len(self.ids)
+
+    def add(self, price, alert_id):
+        """अलर्ट क्रम नबिगारी थप्ने"""
+        i = bisect_right(self.prices, price)
+        self.prices.insert(i, price)
+        self.ids.insert(i, alert_id)
+
+    def remove(self, price, alert_id):
+        """अलर्ट हटाउने (भेटिए True)"""
+        i = bisect_left(self.prices, price)
+        while i < len(self.prices) and self.prices[i] == price:
+            if self.ids[i] == alert_id:
+                del self.prices[i]
+                del self.ids[i]
+                return True
+            i += 1
+        return False
+
+    def take_at_most(self, ltp):
+        """मूल्य <= ltp भएका अलर्टहरू (सुरुको भाग) निकालेर फर्काउने"""
+        i = bisect_right(self.prices, ltp)
+        if not i:
+            return []
+
+        fired = self.ids[:i]
+        del self.prices[:i]
+        del self.ids[:i]
+        return fired
+
+    def take_at_least(self, ltp):
+        """मूल्य >= ltp भएका अलर्टहरू (अन्तिम भाग) निकालेर फर्काउने"""
+        i = bisect_left(self.prices, ltp)
+        if i == len(self.prices):
+            return []
+
+        fired = self.ids[i:]
+        del self.prices[i:]
+        del self.ids[i:]
+        return fired
+
+class AlertEngine:
+    """SQLite मा राखिएका मूल्य अलर्टहरू र सिम्बल अनुसारका थ्रेसहोल्ड इन्डेक्सहरू"""
+
+    def __init__(self, path):
+        """इनिसियलाइजर"""
+        self.path = path
+        self.connection = None
+        self.lock = threading.RLock()
+
+        # सिम्बल → {'above': ThresholdBook, 'below': ThresholdBook}
+        self.books = {}
+        # सक्रिय alert_id → अलर्ट
+        self.active = {}
+
+        # तथ्याङ्क
+        self.evaluations = 0
+        self.fired_count = 0
+
+    def connect(self):
+        """कनेक्सन खोल्ने र सक्रिय अलर्टहरू इन्डेक्समा लोड गर्ने — लक लिएर मात्र कल गर्ने"""
+        if self.connection is not None:
+            return self.connection
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+
+        connection = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT, check_same_thread=False)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        connection.executescript(SCHEMA)
+        connection.commit()
+
+        query = f"SELECT {', '.join(ALERT_FIELDS)} FROM alerts WHERE status = ?"
+        for row in connection.execute(query, (STATUS_ACTIVE,)):
+            self.index(dict(zip(ALERT_FIELDS, row)))
+
+        self.connection = connection
+        return connection
+
+    def close(self):
+        """कनेक्सन बन्द गर्ने"""
+        with self.lock:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
+                self.books.clear()
+                self.active.clear()
+
+    def index(self, alert):
+        """सक्रिय अलर्ट इन्डेक्समा थप्ने — लक लिएर मात्र कल गर्ने"""
+        books = self.books.get(alert['symbol'])
+        if books is None:
+            books = self.books[alert['symbol']] = {condition: ThresholdBook() for condition in CONDITIONS}
+
+        books[alert['condition']].add(alert['price'], alert['alert_id'])
+        self.active[alert['alert_id']] = alert
+
+    def unindex(self, alert):
+        """सक्रिय अलर्ट इन्डेक्सबाट हटाउने — लक लिएर मात्र कल गर्ने"""
+        self.active.pop(alert['alert_id'], None)
+        books = self.books.get(alert['symbol'])
+        if books is None:
+            return
+
+        books[alert['condition']].remove(alert['price'], alert['alert_id'])
+        if not any(books.values()):
+            del self.books[alert['symbol']]
+
+    def insert(self, connection, values, created_at):
+        """एउटा अलर्ट डाटाबेसमा थपेर फर्काउने — ट्रान्ज्याक्सनभित्र मात्र कल गर्ने"""
+        user_id, symbol, price, condition, notification_type = values
+        cursor = connection.execute(INSERT_ALERT, (user_id, symbol, price, condition, notification_type,
+                                                   created_at, STATUS_ACTIVE))
+        return {
+            'alert_id': cursor.lastrowid,
+            'user_id': user_id,
+            'symbol': symbol,
+            'price': price,
+            'condition': condition,
+            'notification_type': notification_type,
+            'created_at': created_at,
+            'status': STATUS_ACTIVE,
+            'triggered_at': None,
+            'triggered_price': None
+        }
+
+    def add(self, alert, user_id=None):
+        """नयाँ अलर्ट थप्ने (अमान्य भए ValueError)"""
+        values = validate_alert(alert, user_id)
+
+        with self.lock:
+            connection = self.connect()
+            with connection:
+                created = self.insert(connection, values, time.time())
+            self.index(created)
+
+        return created
+
+    def import_alerts(self, alerts, user_id=None):
+        """धेरै अलर्टहरू एउटै ट्रान्ज्याक्सनमा थप्ने, (थपिएका, त्रुटिहरू) फर्काउने"""
+        valid = []
+        errors = []
+
+        for position, alert in enumerate(alerts):
+            try:
+                valid.append(validate_alert(alert, user_id))
+            except ValueError as e:
+                errors.append({'index': position, 'error': str(e)})
+
+        created = []
+        if valid:
+            created_at = time.time()
+            with self.lock:
+                connection = self.connect()
+                with connection:
+                    created = [self.insert(connection, values, created_at) for values in valid]
+                for alert in created:
+                    self.index(alert)
+
+        return created, errors
+
+    def remove(self, alert_id, user_id):
+        """प्रयोगकर्ताको अलर्ट हटाउने (अर्को प्रयोगकर्ताको भए नहटाउने), हटाइए True"""
+        with self.lock:
+            connection = self.connect()
+            with connection:
+                removed = connection.execute(
+                    "DELETE FROM alerts WHERE alert_id = ? AND user_id = ?", (alert_id, str(user_id))
+                ).rowcount > 0
+
+            alert = self.active.get(alert_id)
+            if removed and alert is not None:
+                self.unindex(alert)
+
+        return removed
+
+    def user_alerts(self, user_id, status=None):
+        """प्रयोगकर्ताका अलर्टहरू (नयाँ पहिले)"""
+        sql = f"SELECT {', '.join(ALERT_FIELDS)} FROM alerts WHERE user_id = ?"
+        params = [str(user_id)]
+        if status:
+            sql += " AND status = ?"
+            params.append(status)
+        sql += " ORDER BY alert_id DESC"
+
+        with self.lock:
+            rows = self.connect().execute(sql, params).fetchall()
+
+        return [dict(zip(ALERT_FIELDS, row)) for row in rows]
+
+    def check(self, symbol, ltp):
+        """एउटा सिम्बलको LTP ले फायर गर्ने alert_id हरू निकाल्ने — लक लिएर मात्र कल गर्ने"""
+        books = self.books.get(symbol)
+        if books is None:
+            return []
+
+        # माथि: मूल्य <= LTP भएका, तल: मूल्य >= LTP भएका
+        fired = books['above'].take_at_most(ltp) + books['below'].take_at_least(ltp)
+        if not any(books.values()):
+            del self.books[symbol]
+        return fired
+
+    def evaluate(self, snapshot, fired_at=None):
+        """स्न्यापसटका LTP हरूले सक्रिय अलर्टहरू जाँच्ने र फायर भएकाहरू फर्काउने"""
+        if not len(snapshot):
+            return []
+
+        fired_at = fired_at or snapshot.last_updated or time.time()
+        ltps = snapshot.column('ltp')
+        events = []
+
+        with self.lock:
+            self.connect()
+            self.evaluations += 1
+
+            # अलर्ट भएका सिम्बलहरू मात्र हेर्ने
+            for symbol in list(self.books):
+                row = snapshot.index.get(symbol)
+                if row is None:
+                    continue
+
+                ltp = float(ltps[row])
+                if not ltp > 0:
+                    continue
+
+                for alert_id in self.check(symbol, ltp):
+                    alert = self.active.pop(alert_id)
+                    events.append((alert, ltp))
+
+            if not events:
+                return []
+
+            fired = []
+            try:
+                with self.connection:
+                    for alert, ltp in events:
+                        cursor = self.connection.execute(INSERT_FIRED, (
+                            alert['alert_id'], alert['user_id'], alert['symbol'], alert['price'],
+                            alert['condition'], ltp, fired_at
+                        ))
+                        self.connection.execute(TRIGGER_ALERT, (STATUS_TRIGGERED, fired_at, ltp, alert['alert_id']))
+                        fired.append(dict(zip(FIRED_FIELDS, (
+                            cursor.lastrowid, alert['alert_id'], alert['user_id'], alert['symbol'],
+                            alert['price'], alert['condition'], ltp, fired_at
+                        ))))
+            except Exception:
+                # ट्रान्ज्याक्सन रोलब्याक भयो, डाटाबेसमा अझै सक्रिय अलर्टहरू इन्डेक्समा फर्काउने
+                for alert, ltp in events:
+                    self.index(alert)
+                raise
+
+            self.fired_count += len(fired)
+
+        return fired
+
+    def feed(self, user_id, symbol=None, since=0, limit=DEFAULT_FEED_LIMIT):
+        """प्रयोगकर्ताका seq > since भएका फायर भएका अलर्टहरू (पुरानो पहिले), अर्को पटकको कर्सर सहित"""
+        conditions = ["seq > ?", "user_id = ?"]
+        params = [int(since or 0), str(user_id)]
+
+        if symbol:
+            conditions.append("symbol = ?")
+            params.append(symbol.upper())
+
+        limit = min(max(int(limit or DEFAULT_FEED_LIMIT), 1), MAX_FEED_LIMIT)
+        params.append(limit)
+        sql = f"SELECT {', '.join(FIRED_FIELDS)} FROM fired WHERE {' AND '.join(conditions)} ORDER BY seq LIMIT ?"
+
+        with self.lock:
+            rows = self.connect().execute(sql, params).fetchall()
+
+        events = [dict(zip(FIRED_FIELDS, row)) for row in rows]
+        cursor = events[-1]['seq'] if events else int(since or 0)
+        return events, cursor
+
+    def stats(self):
+        """तथ्याङ्क प्राप्त गर्ने"""
+        with self.lock:
+            self.connect()
+            return {
+                'active': len(self.active),
+                'symbols': len(self.books),
+                'evaluations': self.evaluations,
+                'fired': self.fired_count
+            }
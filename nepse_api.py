@@ -12,7 +12,9 @@ from flask import Flask, jsonify, request
 from flask_cors import CORS
 import time
 import threading
-from nepse_scraper import NepseDataScraper
+from nepse_scraper import NepseDataScraper, CACHE_EXPIRY, STOCKS_LIST_EXPIRY
+from nepse_leaderboard import resolve_metric, DIRECTIONS
+from nepse_http import conditional, note_freshness, data_is_stale
 
 app = Flask(__name__)
 CORS(app)  # सबै रुटहरूको लागि CORS सक्षम गर्ने
@@ -46,8 +48,46 @@ def background_data_update():
         # 1 मिनेट पछि फेरि जाँच गर्ने
         time.sleep(60)
 
+# क्यासको उमेर रिक्वेस्टमा राख्ने (Age हेडर र stale चिनोको लागि)
+def note_cache(cache, expiry):
+    """क्यास गरिएको डाटा कति पुरानो छ भनी रिक्वेस्टमा राख्ने"""
+    if cache['data']:
+        age = time.time() - cache['last_updated']
+        note_freshness(age, age >= expiry)
+
+# कन्डिसनल GET भ्यालिडेटरहरू: (भर्सन, अन्तिम अपडेट समय)
+def snapshot_validator():
+    """NEPSE डाटा स्न्यापसटको भर्सन"""
+    snapshot = scraper.get_snapshot()
+    note_cache(scraper.nepse_data_cache, CACHE_EXPIRY)
+    return snapshot.version, snapshot.last_updated
+
+def nepse_data_validator():
+    """क्षेत्र फिल्टर सहितको NEPSE डाटाको भर्सन"""
+    snapshot = scraper.get_snapshot()
+    note_cache(scraper.nepse_data_cache, CACHE_EXPIRY)
+    
+    if request.args.get('sector'):
+        scraper.fetch_all_stocks()
+        note_cache(scraper.stocks_list_cache, STOCKS_LIST_EXPIRY)
+    
+    return (snapshot.version, scraper.stocks_list_cache['last_updated']), snapshot.last_updated
+
+def market_overview_validator():
+    """बजार अवलोकनको भर्सन (बजार खुला/बन्द हुँदा पनि बदलिन्छ)"""
+    snapshot = scraper.get_snapshot()
+    note_cache(scraper.nepse_data_cache, CACHE_EXPIRY)
+    return (snapshot.version, scraper.is_market_open()), snapshot.last_updated
+
+def stocks_list_validator():
+    """स्टक्स लिस्टको भर्सन"""
+    scraper.fetch_all_stocks()
+    note_cache(scraper.stocks_list_cache, STOCKS_LIST_EXPIRY)
+    return scraper.stocks_list_cache['last_updated'], scraper.stocks_list_cache['last_updated']
+
 # API रुटहरू
 @app.route('/api/nepse_data', methods=['GET'])
+@conditional(nepse_data_validator)
 def get_nepse_data():
     """NEPSE डाटा प्राप्त गर्ने API एन्डपोइन्ट"""
     try:
@@ -62,9 +102,10 @@ def get_nepse_data():
         # डाटा प्राप्त गर्ने
         stocks = scraper.fetch_nepse_data()
         
-        # सिम्बल अनुसार फिल्टर गर्ने
+        # सिम्बल अनुसार फिल्टर गर्ने (स्न्यापसटको सिम्बल इन्डेक्सबाट)
         if symbol:
-            stocks = [stock for stock in stocks if stock['symbol'].lower() == symbol.lower()]
+            stock = scraper.get_snapshot().find(symbol)
+            stocks = [stock] if stock else []
         
         # क्षेत्र अनुसार फिल्टर गर्ने
         if sector:
@@ -109,7 +150,8 @@ def get_nepse_data():
             'meta': {
                 'count': len(stocks),
                 'market_status': 'open' if market_status['is_open'] else 'closed',
-                'last_updated': last_updated
+                'last_updated': last_updated,
+                'stale': data_is_stale()
             }
         })
     
@@ -120,6 +162,7 @@ def get_nepse_data():
         }), 500
 
 @app.route('/api/market_overview', methods=['GET'])
+@conditional(market_overview_validator)
 def get_market_overview():
     """बजार अवलोकन डाटा प्राप्त गर्ने API एन्डपोइन्ट"""
     try:
@@ -134,7 +177,8 @@ def get_market_overview():
             'data': {
                 'market_status': market_status['status_text'],
                 'is_open': market_status['is_open'],
-                'last_updated': last_updated
+                'last_updated': last_updated,
+                'stale': data_is_stale()
             }
         })
     
@@ -145,6 +189,7 @@ def get_market_overview():
         }), 500
 
 @app.route('/api/stocks_list', methods=['GET'])
+@conditional(stocks_list_validator)
 def get_stocks_list():
     """सबै स्टक्सको सूची प्राप्त गर्ने API एन्डपोइन्ट"""
     try:
@@ -163,7 +208,8 @@ def get_stocks_list():
             'data': stocks,
             'meta': {
                 'count': len(stocks),
-                'last_updated': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(scraper.stocks_list_cache['last_updated']))
+                'last_updated': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(scraper.stocks_list_cache['last_updated'])),
+                'stale': data_is_stale()
             }
         })
     
@@ -174,6 +220,7 @@ def get_stocks_list():
         }), 500
 
 @app.route('/api/top_gainers', methods=['GET'])
+@conditional(snapshot_validator)
 def get_top_gainers():
     """टप गेनर्स प्राप्त गर्ने API एन्डपोइन्ट"""
     try:
@@ -188,7 +235,8 @@ def get_top_gainers():
             'data': gainers,
             'meta': {
                 'count': len(gainers),
-                'last_updated': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(scraper.nepse_data_cache['last_updated']))
+                'last_updated': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(scraper.nepse_data_cache['last_updated'])),
+                'stale': data_is_stale()
             }
         })
     
@@ -199,6 +247,7 @@ def get_top_gainers():
         }), 500
 
 @app.route('/api/top_losers', methods=['GET'])
+@conditional(snapshot_validator)
 def get_top_losers():
     """टप लुजर्स प्राप्त गर्ने API एन्डपोइन्ट"""
     try:
@@ -213,7 +262,52 @@ def get_top_losers():
             'data': losers,
             'meta': {
                 'count': len(losers),
-                'last_updated': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(scraper.nepse_data_cache['last_updated']))
+                'last_updated': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(scraper.nepse_data_cache['last_updated'])),
+                'stale': data_is_stale()
+            }
+        })
+    
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/leaders', methods=['GET'])
+@conditional(snapshot_validator)
+def get_leaders():
+    """मेट्रिक अनुसार टप/बटम k स्टक्स प्राप्त गर्ने API एन्डपोइन्ट"""
+    try:
+        # क्वेरी प्यारामिटरहरू प्राप्त गर्ने
+        metric = resolve_metric(request.args.get('metric', 'percent_change'))
+        direction = request.args.get('direction', 'top').lower()
+        
+        if not metric or direction not in DIRECTIONS:
+            return jsonify({
+                'success': False,
+                'error': 'Invalid metric or direction parameter'
+            }), 400
+        
+        try:
+            k = max(int(request.args.get('k', 10)), 0)
+        except ValueError:
+            return jsonify({
+                'success': False,
+                'error': 'Invalid k parameter'
+            }), 400
+        
+        # लिडरबोर्डबाट स्टक्स प्राप्त गर्ने
+        leaders = scraper.get_leaders(metric, direction, k)
+        
+        return jsonify({
+            'success': True,
+            'data': leaders,
+            'meta': {
+                'count': len(leaders),
+                'metric': metric,
+                'direction': direction,
+                'last_updated': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(scraper.nepse_data_cache['last_updated'])),
+                'stale': data_is_stale()
             }
         })
     
@@ -224,6 +318,7 @@ def get_top_losers():
         }), 500
 
 @app.route('/api/sectors', methods=['GET'])
+@conditional(stocks_list_validator)
 def get_sectors():
     """सबै क्षेत्रहरू प्राप्त गर्ने API एन्डपोइन्ट"""
     try:
@@ -234,7 +329,8 @@ def get_sectors():
             'success': True,
             'data': sectors,
             'meta': {
-                'count': len(sectors)
+                'count': len(sectors),
+                'stale': data_is_stale()
             }
         })
     
@@ -256,6 +352,7 @@ def index():
             '/api/stocks_list',
             '/api/top_gainers',
             '/api/top_losers',
+            '/api/leaders',
             '/api/sectors'
         ]
     })
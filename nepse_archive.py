@@ -0,0 +1,255 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+NEPSE इन्ट्राडे स्न्यापसट आर्काइभ
+
+यो मोड्युलले प्रकाशित भएका हरेक todays_price स्न्यापसटलाई WAL मोडको SQLite डाटाबेसमा
+(symbol, ts) प्राइमरी कीसहित थप्छ। एउटा स्न्यापसटका सबै रोहरू ब्याकग्राउन्ड राइटर थ्रेडमा एउटै
+ट्रान्ज्याक्सनमा लेखिन्छन्, र अघिल्लो पटकभन्दा फेरिएका सिम्बलका रो मात्र राखिन्छन्। त्यसैले
+कुनै समयको पूरा बजार अवस्था "त्यो समयसम्मको हरेक सिम्बलको अन्तिम रो" हो। पाठकहरूले छुट्टै
+read-only कनेक्सन पुल प्रयोग गर्छन्, त्यसैले आर्काइभ लेख्दा API रिडहरू रोकिँदैनन्।
+"""
+
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+# आर्काइभ गरिने संख्यात्मक कलमहरू (NepseSnapshot का कलमहरू)
+FIELDS = ['ltp', 'change', 'percent_change', 'high', 'low', 'open', 'qty']
+
+DEFAULT_READERS = 4
+BUSY_TIMEOUT = 5.0  # सेकेन्ड
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS ticks (
+    symbol TEXT NOT NULL,
+    ts REAL NOT NULL,
+    {', '.join(f'{field} REAL' for field in FIELDS)},
+    PRIMARY KEY (symbol, ts)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS snapshots (
+    ts REAL PRIMARY KEY,
+    rows INTEGER NOT NULL,
+    changed INTEGER NOT NULL
+);
+"""
+
+INSERT_TICK = f"INSERT OR REPLACE INTO ticks (symbol, ts, {', '.join(FIELDS)}) VALUES ({', '.join('?' * (len(FIELDS) + 2))})"
+INSERT_SNAPSHOT = "INSERT OR REPLACE INTO snapshots (ts, rows, changed) VALUES (?, ?, ?)"
+
+# हरेक सिम्बलको अन्तिम रो (सुरुमा फेरिएका रो छुट्याउन)
+LATEST_TICKS = f"""
+SELECT t.symbol, {', '.join('t.' + field for field in FIELDS)} FROM ticks t
+JOIN (SELECT symbol, MAX(ts) AS ts FROM ticks GROUP BY symbol) m ON t.symbol = m.symbol AND t.ts = m.ts
+"""
+
+def snapshot_rows(snapshot):
+    """स्न्यापसटका कलमहरूलाई (symbol, मानहरू) रोहरूमा बदल्ने"""
+    symbols = snapshot.column('symbol').tolist()
+    columns = [snapshot.column(field).tolist() for field in FIELDS]
+    return [(symbol, tuple(column[i] for column in columns)) for i, symbol in enumerate(symbols)]
+
+class IntradayArchive:
+    """इन्ट्राडे स्न्यापसटहरू राख्ने SQLite आर्काइभ"""
+
+    def __init__(self, path, readers=DEFAULT_READERS):
+        """इनिसियलाइजर"""
+        self.path = path
+        self.readers = max(int(readers), 1)
+
+        # लेख्ने कनेक्सन राइटर थ्रेडले मात्र प्रयोग गर्छ
+        self.writer = None
+        self.queue = queue.Queue()
+        self.thread = None
+        self.lock = threading.Lock()
+
+        # read-only कनेक्सन पुल
+        self.pool = queue.LifoQueue()
+        self.created = 0
+
+        # सिम्बल → अन्तिम आर्काइभ गरिएका मानहरू
+        self.latest = None
+
+        # तथ्याङ्क
+        self.snapshots = 0
+        self.rows = 0
+        self.errors = 0
+
+    def connect_writer(self):
+        """WAL मोडको लेख्ने कनेक्सन खोल्ने र स्किमा बनाउने"""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+
+        connection = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        connection.executescript(SCHEMA)
+        connection.commit()
+
+        self.latest = {row[0]: tuple(row[1:]) for row in connection.execute(LATEST_TICKS)}
+        return connection
+
+    def connect_reader(self):
+        """read-only कनेक्सन खोल्ने"""
+        connection = sqlite3.connect(f"file:{os.path.abspath(self.path)}?mode=ro", uri=True,
+                                     timeout=BUSY_TIMEOUT, check_same_thread=False)
+        connection.execute('PRAGMA query_only=ON')
+        return connection
+
+    def start(self):
+        """राइटर थ्रेड सुरु गर्ने (पहिले नै चलिरहेको भए केही नगर्ने)"""
+        with self.lock:
+            if self.thread is not None:
+                return
+
+            self.thread = threading.Thread(target=self.run, name='intraday-archive')
+            self.thread.daemon = True
+            self.thread.start()
+
+    def append(self, snapshot):
+        """स्न्यापसट आर्काइभ गर्न लाममा राख्ने (नपर्खने)"""
+        if not len(snapshot):
+            return
+
+        self.start()
+        self.queue.put((snapshot.last_updated, snapshot_rows(snapshot)))
+
+    def run(self):
+        """लामबाट स्न्यापसटहरू लिएर लेख्ने लुप"""
+        try:
+            self.writer = self.connect_writer()
+        except Exception as e:
+            print(f"इन्ट्राडे आर्काइभ खोल्न त्रुटि ({self.path}): {str(e)}")
+            return
+
+        while True:
+            item = self.queue.get()
+            if item is None:
+                # कनेक्सन बनाउने थ्रेडमै बन्द गर्नुपर्छ
+                self.writer.close()
+                self.writer = None
+                self.queue.task_done()
+                return
+
+            try:
+                self.write(*item)
+            except Exception as e:
+                self.errors += 1
+                print(f"इन्ट्राडे आर्काइभ लेख्न त्रुटि: {str(e)}")
+            finally:
+                self.queue.task_done()
+
+    def write(self, ts, rows):
+        """एउटा स्न्यापसटका फेरिएका रोहरू एउटै ट्रान्ज्याक्सनमा लेख्ने"""
+        changed = [(symbol, ts) + values for symbol, values in rows if self.latest.get(symbol) != values]
+
+        with self.writer:
+            if changed:
+                self.writer.executemany(INSERT_TICK, changed)
+            self.writer.execute(INSERT_SNAPSHOT, (ts, len(rows), len(changed)))
+
+        for row in changed:
+            self.latest[row[0]] = row[2:]
+
+        self.snapshots += 1
+        self.rows += len(changed)
+
+    def flush(self):
+        """लाममा बाँकी सबै स्न्यापसटहरू लेखिन्जेल पर्खने"""
+        if self.thread is not None:
+            self.queue.join()
+
+    def close(self):
+        """राइटर थ्रेड रोक्ने र कनेक्सनहरू बन्द गर्ने"""
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join()
+            self.thread = None
+
+        while not self.pool.empty():
+            self.pool.get_nowait().close()
+
+    @contextmanager
+    def reader(self):
+        """पुलबाट read-only कनेक्सन लिने (नभए र सीमाभित्र भए नयाँ खोल्ने)"""
+        try:
+            connection = self.pool.get_nowait()
+        except queue.Empty:
+            with self.lock:
+                create = self.created < self.readers
+                if create:
+                    self.created += 1
+
+            if create:
+                try:
+                    connection = self.connect_reader()
+                except Exception:
+                    with self.lock:
+                        self.created -= 1
+                    raise
+            else:
+                connection = self.pool.get()
+
+        try:
+            yield connection
+        finally:
+            self.pool.put(connection)
+
+    def query(self, sql, params=()):
+        """read-only कनेक्सनबाट क्वेरी चलाउने (आर्काइभ नबनेको भए खाली)"""
+        if not os.path.exists(self.path):
+            return []
+
+        with self.reader() as connection:
+            return connection.execute(sql, params).fetchall()
+
+    def ticks(self, symbol, start=None, end=None, limit=None):
+        """सिम्बलका समय दायराभित्रका रोहरू (समय क्रममा)"""
+        conditions = ["symbol = ?"]
+        params = [symbol]
+
+        if start is not None:
+            conditions.append("ts >= ?")
+            params.append(start)
+        if end is not None:
+            conditions.append("ts <= ?")
+            params.append(end)
+
+        # limit दिए अन्तिम limit वटा रो (SQLite मा LIMIT -1 = सीमा नभएको)
+        params.append(int(limit) if limit else -1)
+        sql = f"SELECT ts, {', '.join(FIELDS)} FROM ticks WHERE {' AND '.join(conditions)} ORDER BY ts DESC LIMIT ?"
+
+        rows = self.query(sql, params)
+        rows.reverse()
+        return [dict(zip(['ts'] + FIELDS, row)) for row in rows]
+
+    def snapshot_at(self, ts):
+        """कुनै समयको बजार अवस्था (हरेक सिम्बलको त्यो समयसम्मको अन्तिम रो)"""
+        sql = f"""
+            SELECT t.symbol, t.ts, {', '.join('t.' + field for field in FIELDS)} FROM ticks t
+            JOIN (SELECT symbol, MAX(ts) AS ts FROM ticks WHERE ts <= ? GROUP BY symbol) m
+            ON t.symbol = m.symbol AND t.ts = m.ts
+            ORDER BY t.symbol
+        """
+        return [dict(zip(['symbol', 'ts'] + FIELDS, row)) for row in self.query(sql, (ts,))]
+
+    def timestamps(self, start=None, end=None):
+        """आर्काइभ गरिएका स्न्यापसटहरूको समयहरू"""
+        rows = self.query(
+            "SELECT ts FROM snapshots WHERE ts >= ? AND ts <= ? ORDER BY ts",
+            (start if start is not None else float('-inf'), end if end is not None else float('inf'))
+        )
+        return [row[0] for row in rows]
+
+    def stats(self):
+        """तथ्याङ्क प्राप्त गर्ने"""
+        return {
+            'snapshots': self.snapshots,
+            'rows': self.rows,
+            'errors': self.errors,
+            'pending': self.queue.qsize(),
+            'readers': self.created
+        }
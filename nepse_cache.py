@@ -0,0 +1,262 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+क्यास सहायकहरू
+
+यो मोड्युलको SingleFlight ले एउटै स्रोत (resource) को लागि एकै पटक आएका धेरै रिक्वेस्टहरूलाई
+एउटै अपस्ट्रिम फेचमा मिलाउँछ। क्यासको म्याद सकिँदा पहिलो रिक्वेस्टले मात्र फेच गर्छ, बाँकीले
+त्यसैको नतिजा पर्खेर पाउँछन्, त्यसैले nepalstock र merolagani मा एकै पटक धेरै रिक्वेस्ट जाँदैनन्।
+background() ले stale-while-revalidate को लागि रिक्वेस्ट नरोकी ब्याकग्राउन्डमा रिफ्रेस सुरु गर्छ।
+
+LRUCache ले प्रविष्टि संख्या र अनुमानित मेमोरी दुवैमा सीमित, प्रविष्टि अनुसार TTL भएको क्यास दिन्छ।
+अवस्थित नभएका कीहरू NOT_FOUND को रूपमा (नेगेटिभ क्यासिङ) छोटो समयसम्म राखिन्छन्।
+"""
+
+import sys
+import time
+import threading
+from collections import OrderedDict
+
+# LRUCache डिफल्ट सीमाहरू
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+
+# अवस्थित नभएको की (नेगेटिभ क्यास प्रविष्टि)
+NOT_FOUND = object()
+
+class Flight:
+    """चलिरहेको एउटा फेच र त्यसको नतिजा"""
+
+    def __init__(self):
+        """इनिसियलाइजर"""
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+class SingleFlight:
+    """की अनुसार एकै पटक एउटा मात्र फेच चलाउने क्लास"""
+
+    def __init__(self):
+        """इनिसियलाइजर"""
+        self.lock = threading.Lock()
+        self.flights = {}
+
+        # तथ्याङ्क: कति फेच चले, कति रिक्वेस्ट अरूको फेचमा मिसिए
+        self.calls = 0
+        self.shared = 0
+
+    def do(self, key, func, *args, **kwargs):
+        """की को लागि func चलाउने; अर्को थ्रेडले चलाइरहेको भए त्यसैको नतिजा पर्खने"""
+        with self.lock:
+            flight = self.flights.get(key)
+            leader = flight is None
+
+            if leader:
+                flight = Flight()
+                self.flights[key] = flight
+                self.calls += 1
+            else:
+                flight.waiters += 1
+                self.shared += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = func(*args, **kwargs)
+            return flight.result
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self.lock:
+                del self.flights[key]
+            flight.done.set()
+
+    def background(self, key, func, *args, **kwargs):
+        """की को फेच चलिरहेको छैन भने ब्याकग्राउन्ड थ्रेडमा सुरु गर्ने (नपर्खने)"""
+        if key in self.flights:
+            return False
+
+        def run():
+            try:
+                self.do(key, func, *args, **kwargs)
+            except Exception as e:
+                print(f"Background refresh error ({key}): {str(e)}")
+
+        thread = threading.Thread(target=run)
+        thread.daemon = True
+        thread.start()
+        return True
+
+    def in_flight(self, key):
+        """की को फेच चलिरहेको छ कि छैन"""
+        return key in self.flights
+
+    def stats(self):
+        """तथ्याङ्क प्राप्त गर्ने"""
+        with self.lock:
+            return {'calls': self.calls, 'shared': self.shared, 'in_flight': len(self.flights)}
+
+def estimate_size(value):
+    """मानले ओगट्ने अनुमानित मेमोरी (बाइटमा)"""
+    size = sys.getsizeof(value)
+
+    if isinstance(value, dict):
+        size += sum(estimate_size(key) + estimate_size(item) for key, item in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(item) for item in value)
+
+    return size
+
+class LRUCache:
+    """संख्या, मेमोरी र TTL सीमित LRU क्यास
+
+    सीमा नाघ्दा सबैभन्दा पहिले प्रयोग भएका प्रविष्टिहरू हटाइन्छन्। म्याद सकिएका प्रविष्टिहरू
+    पढ्दा वा purge() मा हटाइन्छन्। ttl None भए प्रविष्टिको म्याद सकिँदैन।
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES, ttl=None,
+                 negative_ttl=None, sizeof=estimate_size):
+        """इनिसियलाइजर"""
+        self.max_entries = max(int(max_entries), 1)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.negative_ttl = ttl if negative_ttl is None else negative_ttl
+        self.sizeof = sizeof
+
+        self.lock = threading.Lock()
+        # की → (मान, म्याद सकिने समय, साइज)
+        self.entries = OrderedDict()
+        self.bytes = 0
+
+        # तथ्याङ्क
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return self.peek(key) is not None
+
+    def keys(self):
+        """हाल राखिएका कीहरूको प्रतिलिपि (पुरानो प्रयोग पहिले)"""
+        with self.lock:
+            return list(self.entries)
+
+    def remove(self, key):
+        """प्रविष्टि हटाउने (लक लिएर मात्र कल गर्ने)"""
+        self.bytes -= self.entries.pop(key)[2]
+
+    def live(self, key, now):
+        """म्याद नसकिएको प्रविष्टि (लक लिएर मात्र कल गर्ने)"""
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+
+        if entry[1] is not None and entry[1] <= now:
+            self.remove(key)
+            self.expirations += 1
+            return None
+
+        return entry
+
+    def get(self, key, default=None):
+        """मान प्राप्त गर्ने (भेटिए सबैभन्दा भर्खर प्रयोग भएको बनाउने)"""
+        with self.lock:
+            entry = self.live(key, time.time())
+
+            if entry is None:
+                self.misses += 1
+                return default
+
+            self.entries.move_to_end(key)
+
+            if entry[0] is NOT_FOUND:
+                self.negative_hits += 1
+            else:
+                self.hits += 1
+
+            return entry[0]
+
+    def peek(self, key, default=None):
+        """LRU क्रम र तथ्याङ्क नबदली मान प्राप्त गर्ने"""
+        with self.lock:
+            entry = self.live(key, time.time())
+            return default if entry is None else entry[0]
+
+    def set(self, key, value, ttl=None):
+        """मान राख्ने (ttl नदिए डिफल्ट TTL) र सीमा नाघेमा पुराना प्रविष्टिहरू हटाउने"""
+        if ttl is None:
+            ttl = self.negative_ttl if value is NOT_FOUND else self.ttl
+
+        expires = None if ttl is None else time.time() + ttl
+        size = self.sizeof(key) + (0 if value is NOT_FOUND else self.sizeof(value))
+
+        with self.lock:
+            if key in self.entries:
+                self.remove(key)
+
+            self.entries[key] = (value, expires, size)
+            self.bytes += size
+
+            # नयाँ प्रविष्टि एक्लै सीमाभन्दा ठूलो भए पनि राख्ने
+            while len(self.entries) > 1 and (
+                    len(self.entries) > self.max_entries
+                    or (self.max_bytes is not None and self.bytes > self.max_bytes)):
+                self.remove(next(iter(self.entries)))
+                self.evictions += 1
+
+    def set_missing(self, key, ttl=None):
+        """की अवस्थित छैन भनेर (नेगेटिभ) क्यास गर्ने"""
+        self.set(key, NOT_FOUND, ttl)
+
+    def delete(self, key):
+        """प्रविष्टि हटाउने"""
+        with self.lock:
+            if key in self.entries:
+                self.remove(key)
+
+    def clear(self):
+        """सबै प्रविष्टिहरू हटाउने"""
+        with self.lock:
+            self.entries.clear()
+            self.bytes = 0
+
+    def purge(self):
+        """म्याद सकिएका सबै प्रविष्टिहरू हटाउने"""
+        now = time.time()
+
+        with self.lock:
+            expired = [key for key, (_, expires, _) in self.entries.items() if expires is not None and expires <= now]
+            for key in expired:
+                self.remove(key)
+            self.expirations += len(expired)
+
+        return len(expired)
+
+    def stats(self):
+        """तथ्याङ्क प्राप्त गर्ने"""
+        with self.lock:
+            lookups = self.hits + self.negative_hits + self.misses
+            return {
+                'entries': len(self.entries),
+                'bytes': self.bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'negative_hits': self.negative_hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits + self.negative_hits) / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations
+            }
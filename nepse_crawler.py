@@ -0,0 +1,190 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+कम्पनी विवरण क्रलर
+
+यो मोड्युलले सबै सिम्बलहरूको कम्पनी विवरण पेज सीमित समानान्तरता (concurrency) र हरेक
+रिक्वेस्टपछि शिष्टता ढिलाइ (politeness delay) सहित पहिले नै डाउनलोड गरेर क्यास भर्छ।
+प्रगति चेकप्वाइन्ट फाइलमा सेभ हुन्छ, त्यसैले सर्भर रिस्टार्ट भए क्रल रोकिएकै ठाउँबाट सुरु हुन्छ।
+डाउनलोड र क्यासमा राख्ने काम कलब्याकबाट गरिन्छ, त्यसैले यो मोड्युल सर्भरको स्टेटमा निर्भर छैन।
+"""
+
+import os
+import json
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# डिफल्ट सेटिङहरू
+DEFAULT_CONCURRENCY = 2
+DEFAULT_DELAY = 1.0  # सेकेन्ड
+CHECKPOINT_INTERVAL = 10  # यति सिम्बलपछि चेकप्वाइन्ट सेभ गर्ने
+
+def print_progress(status):
+    """सिम्बल अनुसार प्रगति रिपोर्ट (progress मा दिए मात्र)"""
+    print(f"कम्पनी विवरण क्रल: {status['done'] + status['failed']}/{status['total']} "
+          f"(असफल {status['failed']}) {status['symbol']}")
+
+class CompanyCrawler:
+    """सबै सिम्बलहरूको विवरण सीमित समानान्तरतामा डाउनलोड गर्ने क्रलर
+
+    fetch_detail(symbol) ले विवरण फर्काउँछ (असफल भए exception), store(symbol, detail, last_updated)
+    ले त्यसलाई क्यासमा राख्छ। max_age भन्दा पुरानो चेकप्वाइन्ट बेवास्ता गरिन्छ। should_fetch(symbol)
+    ले False फर्काएका (जस्तै क्यासमा अझै ताजा) सिम्बलहरू यो पासमा डाउनलोड गरिँदैनन्।
+    """
+
+    def __init__(self, fetch_detail, store, concurrency=DEFAULT_CONCURRENCY, delay=DEFAULT_DELAY,
+                 checkpoint_path=None, max_age=None, should_fetch=None, progress=None):
+        """इनिसियलाइजर"""
+        self.fetch_detail = fetch_detail
+        self.store = store
+        self.concurrency = max(int(concurrency), 1)
+        self.delay = max(float(delay), 0.0)
+        self.checkpoint_path = checkpoint_path
+        self.max_age = max_age
+        self.should_fetch = should_fetch
+        self.progress = progress
+
+        self.lock = threading.Lock()
+        self.running = False
+        self.status = {'total': 0, 'done': 0, 'failed': 0, 'skipped': 0, 'symbol': None, 'started': 0, 'finished': 0}
+
+        # हालको पासमा सकिएका विवरणहरू (चेकप्वाइन्टमा सेभ हुने)
+        self.completed = {}
+        self.failed = []
+        self.started = 0
+
+    def load_checkpoint(self):
+        """चेकप्वाइन्ट लोड गरी सकिएका विवरणहरू क्यासमा फर्काउने"""
+        self.completed = {}
+        self.failed = []
+        self.started = time.time()
+
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return
+
+        try:
+            with open(self.checkpoint_path, 'r') as f:
+                checkpoint = json.load(f)
+        except Exception as e:
+            print(f"क्रल चेकप्वाइन्ट लोड गर्न त्रुटि: {str(e)}")
+            return
+
+        # धेरै पुरानो पास भए सुरुबाट क्रल गर्ने
+        if self.max_age is not None and self.started - checkpoint.get('started', 0) >= self.max_age:
+            return
+
+        self.started = checkpoint['started']
+        self.completed = checkpoint.get('completed', {})
+
+        for symbol, entry in self.completed.items():
+            self.store(symbol, entry['data'], entry['last_updated'])
+
+    def save_checkpoint(self):
+        """चेकप्वाइन्ट एटोमिक रूपमा सेभ गर्ने"""
+        if not self.checkpoint_path:
+            return
+
+        checkpoint = {
+            'started': self.started,
+            'completed': self.completed,
+            'failed': self.failed
+        }
+
+        temp_path = self.checkpoint_path + '.tmp'
+        try:
+            with open(temp_path, 'w') as f:
+                json.dump(checkpoint, f)
+            os.replace(temp_path, self.checkpoint_path)
+        except Exception as e:
+            print(f"क्रल चेकप्वाइन्ट सेभ गर्न त्रुटि: {str(e)}")
+
+    def record(self, symbol, detail, error):
+        """एउटा सिम्बलको नतिजा राख्ने र प्रगति रिपोर्ट गर्ने"""
+        if error is None:
+            last_updated = time.time()
+            self.store(symbol, detail, last_updated)
+            self.completed[symbol] = {'data': detail, 'last_updated': last_updated}
+            self.status['done'] += 1
+        else:
+            print(f"कम्पनी विवरण क्रल त्रुटि ({symbol}): {str(error)}")
+            self.failed.append(symbol)
+            self.status['failed'] += 1
+
+        self.status['symbol'] = symbol
+
+        if self.progress:
+            self.progress(dict(self.status))
+
+        if (self.status['done'] + self.status['failed']) % CHECKPOINT_INTERVAL == 0:
+            self.save_checkpoint()
+
+    async def worker(self, queue, executor):
+        """क्यूबाट सिम्बलहरू लिएर एक-एक गरी डाउनलोड गर्ने"""
+        loop = asyncio.get_running_loop()
+
+        while True:
+            try:
+                symbol = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+
+            try:
+                detail = await loop.run_in_executor(executor, self.fetch_detail, symbol)
+                self.record(symbol, detail, None)
+            except Exception as e:
+                self.record(symbol, None, e)
+
+            # अपस्ट्रिम सर्भरमा भार कम गर्न हरेक रिक्वेस्टपछि पर्खने
+            if self.delay and not queue.empty():
+                await asyncio.sleep(self.delay)
+
+    async def run(self, symbols):
+        """सबै सिम्बलहरू क्रल गर्ने (चेकप्वाइन्टमा सकिएकाहरू छोडेर)"""
+        self.load_checkpoint()
+
+        pending = [symbol for symbol in dict.fromkeys(symbols) if symbol not in self.completed]
+
+        # अझै डाउनलोड गर्न नपर्ने सिम्बलहरू छोड्ने
+        skipped = 0
+        if self.should_fetch is not None:
+            remaining = [symbol for symbol in pending if self.should_fetch(symbol)]
+            skipped = len(pending) - len(remaining)
+            pending = remaining
+
+        self.status = {
+            'total': len(self.completed) + len(pending),
+            'done': len(self.completed),
+            'failed': 0,
+            'skipped': skipped,
+            'symbol': None,
+            'started': self.started,
+            'finished': 0
+        }
+
+        queue = asyncio.Queue()
+        for symbol in pending:
+            queue.put_nowait(symbol)
+
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='crawler') as executor:
+            await asyncio.gather(*(self.worker(queue, executor) for _ in range(self.concurrency)))
+
+        self.status['finished'] = time.time()
+        self.save_checkpoint()
+
+        return dict(self.status)
+
+    def crawl(self, symbols):
+        """क्रल सुरु गर्ने (अर्को क्रल चलिरहेको भए None फर्काउने)"""
+        with self.lock:
+            if self.running:
+                return None
+            self.running = True
+
+        try:
+            return asyncio.run(self.run(symbols))
+        finally:
+            with self.lock:
+                self.running = False
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+साझा HTTP फेच लेयर
+
+यो मोड्युलले हरेक अपस्ट्रिम होस्ट (nepalstock.com, merolagani.com आदि) को लागि एउटा
+keep-alive requests.Session राख्छ। सेसनहरूले कनेक्सन पुल, कम्प्रेस गरिएको ट्रान्सफर,
+कनेक्ट/रिड टाइमआउट र होस्ट अनुसारको कनेक्सन सीमा प्रयोग गर्छन्, त्यसैले हरेक रिफ्रेसमा
+नयाँ TCP/TLS ह्यान्डसेक गर्नु पर्दैन।
+"""
+
+import threading
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# brotli उपलब्ध भए मात्र br स्वीकार गर्ने
+try:
+    import brotli
+    ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:
+    ACCEPT_ENCODING = 'gzip, deflate'
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+# (कनेक्ट, रिड) टाइमआउट सेकेन्डमा
+DEFAULT_TIMEOUT = (5, 20)
+
+# एउटा होस्टसँग एकै पटक खुल्न सक्ने अधिकतम कनेक्सन
+MAX_CONNECTIONS_PER_HOST = 4
+
+# कनेक्सन त्रुटि र अस्थायी सर्भर त्रुटिमा पुनः प्रयास
+RETRIES = 2
+RETRY_BACKOFF = 0.5
+RETRY_STATUSES = (502, 503, 504)
+
+class FetchClient:
+    """होस्ट अनुसार पुल गरिएका सेसनहरू राख्ने HTTP क्लाइन्ट"""
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, max_connections=MAX_CONNECTIONS_PER_HOST, retries=RETRIES):
+        """इनिसियलाइजर"""
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.retries = retries
+        self.sessions = {}
+        self.lock = threading.Lock()
+
+    def create_session(self):
+        """पुल र पुनः प्रयास सहितको नयाँ सेसन बनाउने"""
+        session = requests.Session()
+        session.headers.update({
+            'User-Agent': DEFAULT_USER_AGENT,
+            'Accept-Encoding': ACCEPT_ENCODING,
+            'Connection': 'keep-alive'
+        })
+
+        retry = Retry(
+            total=self.retries,
+            backoff_factor=RETRY_BACKOFF,
+            status_forcelist=RETRY_STATUSES,
+            raise_on_status=False
+        )
+
+        # pool_block: सीमाभन्दा बढी कनेक्सन नखोल्ने, खाली हुने पर्खने
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=self.max_connections,
+            pool_block=True,
+            max_retries=retry
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+
+        return session
+
+    def session(self, url):
+        """URL को होस्टको सेसन प्राप्त गर्ने (नभए बनाउने)"""
+        parts = urlsplit(url)
+        host = f"{parts.scheme}://{parts.netloc}"
+
+        session = self.sessions.get(host)
+        if session is not None:
+            return session
+
+        with self.lock:
+            session = self.sessions.get(host)
+            if session is None:
+                session = self.create_session()
+                self.sessions[host] = session
+            return session
+
+    def get(self, url, headers=None, timeout=None, **kwargs):
+        """होस्टको सेसनबाट GET रिक्वेस्ट पठाउने"""
+        return self.session(url).get(url, headers=headers, timeout=timeout or self.timeout, **kwargs)
+
+    def close(self):
+        """सबै सेसनहरू बन्द गर्ने"""
+        with self.lock:
+            for session in self.sessions.values():
+                session.close()
+            self.sessions.clear()
+
+# सबै स्क्र्यापरहरूले प्रयोग गर्ने साझा क्लाइन्ट
+client = FetchClient()
+
+def fetch(url, headers=None, timeout=None, **kwargs):
+    """साझा क्लाइन्टबाट GET रिक्वेस्ट पठाउने"""
+    return client.get(url, headers=headers, timeout=timeout, **kwargs)
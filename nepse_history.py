@@ -0,0 +1,395 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+NEPSE हिस्टोरिकल OHLCV स्टोर
+
+यो मोड्युलले हरेक सिम्बलको दैनिक OHLCV डाटा डिस्कमा कलम अनुसार छुट्टाछुट्टै बाइनरी फाइलमा
+मिति क्रममा राख्छ। फाइलहरू memory-map गरेर खोलिन्छन्, त्यसैले मिति दायराको क्वेरी
+बाइनरी सर्च (searchsorted) बाट हुन्छ र फर्किने डाटा कपी नगरिएका स्लाइसहरू हुन्।
+साप्ताहिक (आइतबार–बिहीबार) र मासिक बारहरू क्यास गरिन्छन् र नयाँ दैनिक बार आउँदा
+अन्तिम अधुरो बार मात्र फेरि गणना गरिन्छ।
+"""
+
+import os
+import re
+import csv
+import argparse
+import threading
+from collections import OrderedDict
+import numpy as np
+
+# कलमहरू र तिनका डाटा टाइपहरू (मिति = 1970-01-01 देखिका दिन)
+COLUMNS = OrderedDict([
+    ('date', np.dtype('<i4')),
+    ('open', np.dtype('<f8')),
+    ('high', np.dtype('<f8')),
+    ('low', np.dtype('<f8')),
+    ('close', np.dtype('<f8')),
+    ('volume', np.dtype('<i8'))
+])
+
+# एकै पटक खुला राखिने सिम्बलहरूको अधिकतम संख्या
+MAX_OPEN_SYMBOLS = 64
+
+SYMBOL_PATTERN = re.compile(r'^[A-Za-z0-9_\-]+$')
+
+# इन्टरभल अनुसार रिस्याम्पल नियम: (आधार बार, कति महिना मिलाउने)
+INTERVALS = {
+    '1d': ('daily', 1),
+    '1w': ('weekly', 1),
+    '1m': ('monthly', 1),
+    '3m': ('monthly', 3),
+    '6m': ('monthly', 6),
+    '1y': ('monthly', 12)
+}
+
+def to_day(date):
+    """'YYYY-MM-DD' मितिलाई दिन संख्यामा परिवर्तन गर्ने"""
+    return int(np.datetime64(date, 'D').astype(np.int64))
+
+def to_date_strings(days):
+    """दिन संख्याहरूलाई 'YYYY-MM-DD' मितिहरूमा परिवर्तन गर्ने"""
+    return np.datetime_as_string(np.asarray(days).astype('datetime64[D]')).tolist()
+
+def week_start(days):
+    """NEPSE हप्ता (आइतबार–बिहीबार) सुरु हुने आइतबारको दिन संख्या"""
+    # 1970-01-01 बिहीबार हो, त्यसैले (days + 4) % 7 आइतबारदेखिको दिन हो
+    return days - (days + 4) % 7
+
+def month_start(days, months=1):
+    """महिना (वा ३/६/१२ महिने अवधि) को पहिलो दिनको दिन संख्या"""
+    periods = month_index(days) // months * months
+    return periods.astype('datetime64[M]').astype('datetime64[D]').astype(np.int64)
+
+def month_index(days):
+    """1970 जनवरीदेखिको महिना संख्या"""
+    return np.asarray(days).astype('datetime64[D]').astype('datetime64[M]').astype(np.int64)
+
+def aggregate(columns, keys):
+    """क्रमबद्ध बकेट कीहरू अनुसार OHLCV बारहरू मिलाउने"""
+    if len(keys) == 0:
+        return empty_columns(), np.empty(0, dtype=np.int64)
+
+    # हरेक बकेटको सुरु र अन्त्य रो
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(keys)) + 1))
+    ends = np.concatenate((starts[1:], [len(keys)]))
+
+    result = {
+        'date': np.asarray(columns['date'])[starts].astype(COLUMNS['date']),
+        'open': np.asarray(columns['open'])[starts],
+        'high': np.maximum.reduceat(columns['high'], starts),
+        'low': np.minimum.reduceat(columns['low'], starts),
+        'close': np.asarray(columns['close'])[ends - 1],
+        'volume': np.add.reduceat(columns['volume'], starts)
+    }
+    return result, starts
+
+def concat_columns(first, second):
+    """दुई कलम सेटहरू जोड्ने"""
+    return {name: np.concatenate((first[name], second[name])) for name in COLUMNS}
+
+def slice_columns(columns, start_date=None, end_date=None, bucket=None):
+    """मिति दायराका बारहरू बाइनरी सर्चबाट निकाल्ने"""
+    dates = columns['date']
+    start_day = to_day(start_date) if start_date else None
+
+    # सुरु मिति पर्ने बकेट पनि समावेश गर्ने
+    if start_day is not None and bucket is not None:
+        start_day = int(bucket(np.array([start_day]))[0])
+
+    start = np.searchsorted(dates, start_day, side='left') if start_day is not None else 0
+    end = np.searchsorted(dates, to_day(end_date), side='right') if end_date else len(dates)
+
+    return {name: values[start:end] for name, values in columns.items()}
+
+def empty_columns():
+    """खाली कलमहरू"""
+    return {name: np.empty(0, dtype=dtype) for name, dtype in COLUMNS.items()}
+
+def bars_to_records(columns):
+    """कलमहरूलाई JSON रेकर्ड सूचीमा परिवर्तन गर्ने"""
+    dates = to_date_strings(columns['date'])
+    values = {name: np.round(columns[name], 2).tolist() for name in ('open', 'high', 'low', 'close')}
+    volumes = columns['volume'].tolist()
+
+    return [
+        {
+            'date': dates[i],
+            'open': values['open'][i],
+            'high': values['high'][i],
+            'low': values['low'][i],
+            'close': values['close'][i],
+            'volume': volumes[i]
+        }
+        for i in range(len(dates))
+    ]
+
+class HistoryStore:
+    """सिम्बल अनुसार memory-mapped OHLCV कलमहरू राख्ने स्टोर"""
+
+    def __init__(self, root):
+        """इनिसियलाइजर"""
+        self.root = root
+        self.open_symbols = OrderedDict()
+        self.lock = threading.Lock()
+
+        # साप्ताहिक/मासिक बारको क्यास: (सिम्बल, नियम) → क्यास इन्ट्री
+        self.resampled = {}
+        self.rewrites = {}
+        self.mutations = {}
+
+        if not os.path.exists(root):
+            os.makedirs(root)
+
+    def symbol_dir(self, symbol):
+        """सिम्बलको डिरेक्टरी"""
+        if not SYMBOL_PATTERN.match(symbol):
+            raise ValueError(f'Invalid symbol: {symbol}')
+        return os.path.join(self.root, symbol.upper())
+
+    def column_path(self, symbol, name):
+        """कलम फाइलको पथ"""
+        return os.path.join(self.symbol_dir(symbol), f'{name}.bin')
+
+    def forget(self, symbol):
+        """सिम्बलका खुला memory-map हरू हटाउने (फाइल फेरि लेखेपछि)"""
+        with self.lock:
+            self.open_symbols.pop(symbol.upper(), None)
+
+    def symbols(self):
+        """स्टोरमा भएका सबै सिम्बलहरू"""
+        return sorted(name for name in os.listdir(self.root) if os.path.isdir(os.path.join(self.root, name)))
+
+    def row_count(self, symbol):
+        """डिस्कमा भएका पूरा रोहरूको संख्या (अधुरो लेखाइ बेवास्ता गर्ने)"""
+        counts = []
+        for name, dtype in COLUMNS.items():
+            path = self.column_path(symbol, name)
+            counts.append(os.path.getsize(path) // dtype.itemsize if os.path.exists(path) else 0)
+        return min(counts)
+
+    def columns(self, symbol):
+        """सिम्बलका memory-mapped कलमहरू प्राप्त गर्ने (खुला फाइलहरू LRU मा राख्ने)"""
+        symbol = symbol.upper()
+        rows = self.row_count(symbol)
+
+        with self.lock:
+            cached = self.open_symbols.get(symbol)
+            if cached is not None and cached[0] == rows:
+                self.open_symbols.move_to_end(symbol)
+                return cached[1]
+
+            if rows == 0:
+                columns = empty_columns()
+            else:
+                columns = {
+                    name: np.memmap(self.column_path(symbol, name), dtype=dtype, mode='r', shape=(rows,))
+                    for name, dtype in COLUMNS.items()
+                }
+
+            self.open_symbols[symbol] = (rows, columns)
+            self.open_symbols.move_to_end(symbol)
+
+            # धेरै फाइलहरू खुला नराख्ने
+            while len(self.open_symbols) > MAX_OPEN_SYMBOLS:
+                self.open_symbols.popitem(last=False)
+
+            return columns
+
+    def range(self, symbol, start_date=None, end_date=None):
+        """मिति दायराका बारहरू बाइनरी सर्चबाट प्राप्त गर्ने (zero-copy स्लाइस)"""
+        columns = self.columns(symbol)
+        dates = columns['date']
+
+        start = np.searchsorted(dates, to_day(start_date), side='left') if start_date else 0
+        end = np.searchsorted(dates, to_day(end_date), side='right') if end_date else len(dates)
+
+        return {name: values[start:end] for name, values in columns.items()}
+
+    def version(self, symbol):
+        """सिम्बलको डाटा भर्सन (पुनर्लेखन, अपडेट र रो संख्या)"""
+        symbol = symbol.upper()
+        return (self.rewrites.get(symbol, 0), self.mutations.get(symbol, 0), self.row_count(symbol))
+
+    def last_modified(self, symbol):
+        """सिम्बलको डाटा अन्तिम पटक परिवर्तन भएको समय"""
+        path = self.column_path(symbol, 'close')
+        return os.path.getmtime(path) if os.path.exists(path) else 0
+
+    def last_date(self, symbol):
+        """सिम्बलको अन्तिम बारको मिति"""
+        dates = self.columns(symbol)['date']
+        return to_date_strings(dates[-1:])[0] if len(dates) else None
+
+    def write(self, symbol, bars):
+        """सिम्बलका सबै बारहरू नयाँ सिराबाट लेख्ने (मिति अनुसार सर्ट र डुप्लिकेट हटाएर)"""
+        by_day = {to_day(bar['date']): bar for bar in bars}
+        days = sorted(by_day)
+        directory = self.symbol_dir(symbol)
+
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+
+        for name, dtype in COLUMNS.items():
+            if name == 'date':
+                values = np.array(days, dtype=dtype)
+            else:
+                values = np.array([by_day[day][name] for day in days], dtype=dtype)
+
+            # अस्थायी फाइलमा लेखेर मात्र बदल्ने
+            path = self.column_path(symbol, name)
+            values.tofile(path + '.tmp')
+            os.replace(path + '.tmp', path)
+
+        self.forget(symbol)
+        self.rewrites[symbol.upper()] = self.rewrites.get(symbol.upper(), 0) + 1
+
+    def append(self, symbol, bars):
+        """नयाँ बारहरू थप्ने; अन्तिम मितिकै बार आए त्यसलाई अपडेट गर्ने"""
+        if not bars:
+            return
+
+        bars = sorted(bars, key=lambda bar: bar['date'])
+        columns = self.columns(symbol)
+        dates = columns['date']
+        last_day = int(dates[-1]) if len(dates) else None
+        first_day = to_day(bars[0]['date'])
+
+        # पुराना मितिका बार आए मात्र पूरा फाइल फेरि लेख्ने
+        if last_day is not None and first_day < last_day:
+            dates = to_date_strings(columns['date'])
+            existing = [
+                dict({name: columns[name][i] for name in COLUMNS if name != 'date'}, date=dates[i])
+                for i in range(len(dates))
+            ]
+            self.write(symbol, existing + bars)
+            return
+
+        directory = self.symbol_dir(symbol)
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+
+        # रिस्याम्पल क्यासलाई अन्तिम बकेट फेरि गणना गर्न संकेत गर्ने
+        self.mutations[symbol.upper()] = self.mutations.get(symbol.upper(), 0) + 1
+
+        # अधुरो लेखाइ भएका कलम फाइलहरू पूरा रोहरूसम्म काट्ने
+        for name, dtype in COLUMNS.items():
+            path = self.column_path(symbol, name)
+            if os.path.exists(path) and os.path.getsize(path) > len(dates) * dtype.itemsize:
+                with open(path, 'r+b') as f:
+                    f.truncate(len(dates) * dtype.itemsize)
+
+        # अन्तिम मितिकै बार भए ठाउँमै अपडेट गर्ने
+        if last_day is not None and first_day == last_day:
+            row = len(dates) - 1
+            for name, dtype in COLUMNS.items():
+                if name == 'date':
+                    continue
+                with open(self.column_path(symbol, name), 'r+b') as f:
+                    f.seek(row * dtype.itemsize)
+                    f.write(np.array([bars[0][name]], dtype=dtype).tobytes())
+            bars = bars[1:]
+
+        if not bars:
+            return
+
+        # बाँकी बारहरू फाइलको अन्त्यमा थप्ने
+        for name, dtype in COLUMNS.items():
+            if name == 'date':
+                values = np.array([to_day(bar['date']) for bar in bars], dtype=dtype)
+            else:
+                values = np.array([bar[name] for bar in bars], dtype=dtype)
+
+            with open(self.column_path(symbol, name), 'ab') as f:
+                f.write(values.tobytes())
+
+    def resample(self, symbol, rule):
+        """साप्ताहिक वा मासिक बारहरू क्यासबाट प्राप्त गर्ने (नयाँ दैनिक बार भए इन्क्रिमेन्टल अपडेट)"""
+        symbol = symbol.upper()
+        bucket = week_start if rule == 'weekly' else month_start
+        daily = self.columns(symbol)
+        rewrites = self.rewrites.get(symbol, 0)
+        mutations = self.mutations.get(symbol, 0)
+        rows = len(daily['date'])
+
+        key = (symbol, rule)
+        cached = self.resampled.get(key)
+
+        # क्यास ताजा छ
+        if cached and cached['rewrites'] == rewrites and cached['mutations'] == mutations and cached['rows'] == rows:
+            return cached['columns']
+
+        if cached and cached['rewrites'] == rewrites and cached['rows'] <= rows and len(cached['columns']['date']):
+            # अन्तिम (अधुरो हुन सक्ने) बकेटदेखि मात्र फेरि गणना गर्ने
+            from_row = cached['last_bucket_row']
+            kept = {name: values[:-1] for name, values in cached['columns'].items()}
+        else:
+            from_row = 0
+            kept = empty_columns()
+
+        tail = {name: values[from_row:] for name, values in daily.items()}
+        aggregated, starts = aggregate(tail, bucket(tail['date'].astype(np.int64)))
+        aggregated['date'] = bucket(aggregated['date'].astype(np.int64)).astype(COLUMNS['date'])
+        columns = concat_columns(kept, aggregated)
+
+        self.resampled[key] = {
+            'rewrites': rewrites,
+            'mutations': mutations,
+            'rows': rows,
+            'columns': columns,
+            'last_bucket_row': from_row + int(starts[-1]) if len(starts) else from_row
+        }
+        return columns
+
+    def bars(self, symbol, interval='1d', start_date=None, end_date=None):
+        """इन्टरभल अनुसार दैनिक, साप्ताहिक वा मासिक (३/६/१२ महिने) बारहरू प्राप्त गर्ने"""
+        rule, months = INTERVALS.get(interval, INTERVALS['1d'])
+
+        if rule == 'daily':
+            return self.range(symbol, start_date, end_date)
+
+        if rule == 'weekly':
+            return slice_columns(self.resample(symbol, 'weekly'), start_date, end_date, week_start)
+
+        monthly = self.resample(symbol, 'monthly')
+
+        # ३/६/१२ महिने बारहरू क्यास गरिएका मासिक बारबाट मिलाउने
+        if months > 1:
+            monthly, _ = aggregate(monthly, month_index(monthly['date']) // months)
+            monthly['date'] = month_start(monthly['date'], months).astype(COLUMNS['date'])
+
+        return slice_columns(monthly, start_date, end_date, lambda days: month_start(days, months))
+
+    def import_csv(self, symbol, filename):
+        """date,open,high,low,close,volume CSV फाइलबाट बारहरू इम्पोर्ट गर्ने"""
+        with open(filename, newline='', encoding='utf-8') as csvfile:
+            bars = [
+                {
+                    'date': row['date'][:10],
+                    'open': float(row['open'].replace(',', '')),
+                    'high': float(row['high'].replace(',', '')),
+                    'low': float(row['low'].replace(',', '')),
+                    'close': float(row['close'].replace(',', '')),
+                    'volume': int(float(row['volume'].replace(',', '')))
+                }
+                for row in csv.DictReader(csvfile)
+            ]
+
+        self.append(symbol, bars)
+        return len(bars)
+
+def main():
+    """मुख्य फंक्सन"""
+    parser = argparse.ArgumentParser(description='NEPSE हिस्टोरिकल OHLCV स्टोरमा CSV इम्पोर्ट गर्ने')
+    parser.add_argument('symbol', help='स्टक सिम्बल')
+    parser.add_argument('csv_file', help='date,open,high,low,close,volume कलम भएको CSV फाइल')
+    parser.add_argument('--root', default='nepse_history', help='स्टोर डिरेक्टरी')
+    args = parser.parse_args()
+
+    store = HistoryStore(args.root)
+    count = store.import_csv(args.symbol, args.csv_file)
+    print(f"{args.symbol.upper()} को {count} बारहरू इम्पोर्ट गरियो")
+
+if __name__ == "__main__":
+    main()
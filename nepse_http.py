@@ -0,0 +1,235 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+HTTP रेस्पोन्स सहायकहरू
+
+यो मोड्युलले Flask एन्डपोइन्टहरूमा कन्डिसनल GET (ETag / Last-Modified / 304 Not Modified)
+थप्छ। ETag डाटा स्न्यापसटको भर्सन र अन्तिम अपडेट समयबाट बनाइन्छ, त्यसैले डाटा नबदलिएको
+बेला रेस्पोन्स बनाउनु नै पर्दैन। धेरै प्रयोग हुने रेस्पोन्सहरू भर्सन अनुसार एक पटक मात्र
+सिरियलाइज गरेर बाइटको रूपमा क्यास गरिन्छन्। Accept र Accept-Encoding अनुसार
+MessagePack र gzip/brotli कम्प्रेस गरिएका रूपहरू पनि भर्सन अनुसार एक पटक मात्र बनाइन्छन्।
+म्याद सकिएको (stale) क्यास डाटा दिँदा note_freshness() ले रिक्वेस्टमा चिनो लगाउँछ र
+कन्डिसनल रेस्पोन्सहरूमा Age हेडर थपिन्छ।
+"""
+
+import json
+import gzip
+import hashlib
+import threading
+from functools import wraps
+from datetime import datetime, timezone
+from flask import request, make_response, current_app, g, has_request_context
+from werkzeug.http import is_resource_modified
+
+# छिटो JSON इन्कोडर (उपलब्ध भए मात्र)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# MessagePack र brotli (उपलब्ध भए मात्र)
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+JSON_MIMETYPE = 'application/json'
+MSGPACK_MIMETYPE = 'application/msgpack'
+
+# यसभन्दा साना बडीहरू कम्प्रेस नगर्ने
+MIN_COMPRESS_SIZE = 1024
+
+def make_etag(*parts):
+    """भर्सन, अपडेट समय र रिक्वेस्ट पथबाट ETag बनाउने"""
+    raw = '|'.join(str(part) for part in parts)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:24]
+
+def http_last_modified(last_updated):
+    """युनिक्स टाइमस्ट्याम्पलाई Last-Modified मितिमा परिवर्तन गर्ने (सेकेन्ड सम्म)"""
+    if not last_updated:
+        return None
+    return datetime.fromtimestamp(int(last_updated), tz=timezone.utc)
+
+def note_freshness(age, stale):
+    """यो रिक्वेस्टले प्रयोग गरेको डाटाको उमेर (सेकेन्ड) र stale अवस्था राख्ने"""
+    if not has_request_context():
+        return
+
+    g.data_age = max(g.get('data_age', 0), int(max(age, 0)))
+    g.data_stale = g.get('data_stale', False) or stale
+
+def data_is_stale():
+    """यो रिक्वेस्टमा म्याद सकिएको डाटा दिइएको छ कि छैन"""
+    return has_request_context() and g.get('data_stale', False)
+
+def conditional(validator):
+    """कन्डिसनल GET डेकोरेटर
+
+    validator ले (version, last_updated) फर्काउँछ। रिक्वेस्टको If-None-Match वा
+    If-Modified-Since मिल्यो भने भ्यू नचलाई 304 फर्काइन्छ।
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            try:
+                version, last_updated = validator(*args, **kwargs)
+            except Exception as e:
+                print(f"Conditional GET validator error: {str(e)}")
+                return view(*args, **kwargs)
+
+            # एउटै डाटाका फरक रूप (JSON/MessagePack, gzip/brotli) र stale चिनोका ETag फरक हुनुपर्छ
+            etag = make_etag(
+                version,
+                last_updated,
+                data_is_stale(),
+                request.full_path,
+                request.headers.get('Accept', ''),
+                request.headers.get('Accept-Encoding', '')
+            )
+            last_modified = http_last_modified(last_updated)
+
+            if not is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+                response = make_response('', 304)
+            else:
+                response = make_response(view(*args, **kwargs))
+
+                # त्रुटि रेस्पोन्सहरूमा भ्यालिडेटर नराख्ने
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag)
+            if last_modified:
+                response.last_modified = last_modified
+            response.headers['Cache-Control'] = 'no-cache'
+            response.vary.update(['Accept', 'Accept-Encoding'])
+
+            # डाटा कति पुरानो छ (सेकेन्डमा) र म्याद सकिएको डाटा भए मानक Warning हेडर
+            if 'data_age' in g:
+                response.headers['Age'] = str(g.data_age)
+            if data_is_stale():
+                response.headers['Warning'] = '110 - "Response is Stale"'
+
+            return response
+        return wrapper
+    return decorator
+
+def dumps(payload):
+    """पेलोडलाई JSON बाइटमा सिरियलाइज गर्ने (orjson उपलब्ध भए त्यसैबाट)"""
+    if orjson is not None:
+        return orjson.dumps(payload)
+
+    return json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def json_response(body, status=200):
+    """सिरियलाइज गरिसकेको JSON बाइटबाट रेस्पोन्स बनाउने"""
+    return current_app.response_class(body, status=status, mimetype=JSON_MIMETYPE)
+
+def negotiate_format():
+    """Accept हेडर अनुसार JSON वा MessagePack छान्ने"""
+    if msgpack is not None:
+        best = request.accept_mimetypes.best_match([JSON_MIMETYPE, MSGPACK_MIMETYPE], default=JSON_MIMETYPE)
+        if best == MSGPACK_MIMETYPE:
+            return 'msgpack'
+    return 'json'
+
+def negotiate_encoding():
+    """Accept-Encoding हेडर अनुसार brotli, gzip वा कम्प्रेस नगर्ने छान्ने"""
+    accepted = request.accept_encodings
+
+    if brotli is not None and accepted['br']:
+        return 'br'
+
+    if accepted['gzip']:
+        return 'gzip'
+
+    return 'identity'
+
+class CachedPayload:
+    """एउटा भर्सनको पेलोड र त्यसका सिरियलाइज/कम्प्रेस गरिएका रूपहरू"""
+
+    def __init__(self, payload):
+        """इनिसियलाइजर"""
+        self.payload = payload
+        self.bodies = {}
+        self.lock = threading.Lock()
+
+    def body(self, fmt='json', encoding='identity'):
+        """फर्म्याट र इन्कोडिङ अनुसारको बडी (पहिलो पटक मात्र बनाउने)"""
+        key = (fmt, encoding)
+        body = self.bodies.get(key)
+        if body is not None:
+            return body
+
+        with self.lock:
+            body = self.bodies.get(key)
+            if body is not None:
+                return body
+
+            raw = self.bodies.get((fmt, 'identity'))
+            if raw is None:
+                raw = msgpack.packb(self.payload, use_bin_type=True) if fmt == 'msgpack' else dumps(self.payload)
+                self.bodies[(fmt, 'identity')] = raw
+
+            if encoding == 'br':
+                body = brotli.compress(raw)
+            elif encoding == 'gzip':
+                body = gzip.compress(raw, mtime=0)
+            else:
+                body = raw
+
+            self.bodies[key] = body
+            return body
+
+    def response(self):
+        """रिक्वेस्टको Accept र Accept-Encoding अनुसार रेस्पोन्स बनाउने"""
+        fmt = negotiate_format()
+        encoding = negotiate_encoding()
+
+        # साना बडीहरू कम्प्रेस नगर्ने
+        if encoding != 'identity' and len(self.body(fmt)) < MIN_COMPRESS_SIZE:
+            encoding = 'identity'
+
+        response = current_app.response_class(
+            self.body(fmt, encoding),
+            mimetype=MSGPACK_MIMETYPE if fmt == 'msgpack' else JSON_MIMETYPE
+        )
+
+        if encoding != 'identity':
+            response.headers['Content-Encoding'] = encoding
+        response.vary.update(['Accept', 'Accept-Encoding'])
+
+        return response
+
+class ResponseCache:
+    """डाटा भर्सन अनुसार सिरियलाइज गरिएका रेस्पोन्सहरू राख्ने क्यास"""
+
+    def __init__(self):
+        """इनिसियलाइजर"""
+        self.entries = {}
+        self.lock = threading.Lock()
+
+    def get(self, key, version, build):
+        """क्यास गरिएको पेलोड फर्काउने; भर्सन बदलिएको भए build() बाट फेरि बनाउने"""
+        entry = self.entries.get(key)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+
+        with self.lock:
+            # अर्को थ्रेडले बनाइसकेको हुन सक्छ
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] == version:
+                return entry[1]
+
+            cached = CachedPayload(build())
+            self.entries[key] = (version, cached)
+            return cached
+
+    def response(self, key, version, build):
+        """क्यास गरिएको बडीबाट सिधै (कन्टेन्ट नेगोसिएसन सहित) रेस्पोन्स फर्काउने"""
+        return self.get(key, version, build).response()
@@ -0,0 +1,305 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+टेक्निकल इन्डिकेटर कर्नेलहरू
+
+यो मोड्युलले SMA, EMA, Wilder RSI र बोलिन्जर ब्यान्ड्स NumPy प्रयोग गरेर O(n) मा गणना गर्छ।
+SMA र बोलिन्जर ब्यान्ड्सले क्युमुलेटिभ सम (cumulative sum) बाट रोलिङ औसत र भेरियन्स निकाल्छन्,
+EMA र RSI ले रिकर्सिभ स्मुथिङ प्रयोग गर्छन्, त्यसैले गणना अवधि (period) मा भर पर्दैन।
+IndicatorState ले दिनभरि आउने नयाँ LTP बाट यिनै मानहरू O(1) मा अपडेट गर्छ।
+"""
+
+from collections import deque
+import numpy as np
+
+# डिफल्ट अवधिहरू
+DEFAULT_PERIODS = {
+    'sma_period': 20,
+    'ema_period': 20,
+    'rsi_period': 14,
+    'bb_period': 20,
+    'bb_std': 2
+}
+
+def rolling_sum(values, period):
+    """क्युमुलेटिभ समबाट रोलिङ सम गणना गर्ने (पहिलाका मानहरू NaN)"""
+    result = np.full(len(values), np.nan)
+
+    if period < 1 or len(values) < period:
+        return result
+
+    cumsum = np.concatenate(([0.0], np.cumsum(values, dtype=np.float64)))
+    result[period - 1:] = cumsum[period:] - cumsum[:-period]
+    return result
+
+def sma(prices, period=20):
+    """सिम्पल मुभिङ एभरेज"""
+    prices = np.asarray(prices, dtype=np.float64)
+    return rolling_sum(prices, period) / period
+
+def ema(prices, period=20):
+    """एक्सपोनेन्सियल मुभिङ एभरेज (पहिलो मान SMA)"""
+    prices = np.asarray(prices, dtype=np.float64)
+    result = np.full(len(prices), np.nan)
+
+    if period < 1 or len(prices) < period:
+        return result
+
+    multiplier = 2 / (period + 1)
+
+    # पहिलो EMA मान SMA हो, त्यसपछि रिकर्सिभ स्मुथिङ
+    value = prices[:period].mean()
+    result[period - 1] = value
+
+    values = result.tolist()
+    for i, price in enumerate(prices[period:].tolist(), start=period):
+        value = (price - value) * multiplier + value
+        values[i] = value
+
+    return np.array(values)
+
+def rsi(prices, period=14):
+    """Wilder स्मुथिङ प्रयोग गरेर रिलेटिभ स्ट्रेन्थ इन्डेक्स"""
+    prices = np.asarray(prices, dtype=np.float64)
+    result = np.full(len(prices), np.nan)
+
+    if period < 1 or len(prices) <= period:
+        return result
+
+    deltas = np.diff(prices)
+    gains = np.where(deltas > 0, deltas, 0.0)
+    losses = np.where(deltas < 0, -deltas, 0.0)
+
+    # पहिलो औसत साधारण औसत हो
+    avg_gain = gains[:period].mean()
+    avg_loss = losses[:period].mean()
+
+    values = result.tolist()
+    values[period] = rsi_value(avg_gain, avg_loss)
+
+    # Wilder स्मुथिङ: avg = (अघिल्लो avg × (period - 1) + हालको) / period
+    for i, (gain, loss) in enumerate(zip(gains[period:].tolist(), losses[period:].tolist()), start=period + 1):
+        avg_gain = (avg_gain * (period - 1) + gain) / period
+        avg_loss = (avg_loss * (period - 1) + loss) / period
+        values[i] = rsi_value(avg_gain, avg_loss)
+
+    return np.array(values)
+
+def rsi_value(avg_gain, avg_loss):
+    """औसत नाफा र घाटाबाट RSI मान गणना गर्ने"""
+    if avg_loss == 0:
+        return 100.0
+
+    rs = avg_gain / avg_loss
+    return 100 - (100 / (1 + rs))
+
+def bollinger_bands(prices, period=20, num_std=2):
+    """बोलिन्जर ब्यान्ड्स (माथिल्लो, बीच, तल्लो)"""
+    prices = np.asarray(prices, dtype=np.float64)
+
+    # रोलिङ औसत र भेरियन्स: var = E[x²] - E[x]²
+    middle = rolling_sum(prices, period) / period
+    mean_square = rolling_sum(prices * prices, period) / period
+    std = np.sqrt(np.maximum(mean_square - middle * middle, 0.0))
+
+    return middle + num_std * std, middle, middle - num_std * std
+
+def to_series(dates, values):
+    """इन्डिकेटर मानहरूलाई मिति सहितको JSON सूचीमा परिवर्तन गर्ने"""
+    rounded = np.round(values, 2).tolist()
+    return [
+        {'date': date, 'value': None if np.isnan(value) else value}
+        for date, value in zip(dates, rounded)
+    ]
+
+def calculate_indicators(dates, prices, indicators, periods=None):
+    """अनुरोध गरिएका इन्डिकेटर्स गणना गर्ने"""
+    periods = dict(DEFAULT_PERIODS, **(periods or {}))
+    result = {}
+
+    for indicator in indicators:
+        indicator = indicator.strip().lower()
+
+        if indicator == 'sma':
+            result['sma'] = to_series(dates, sma(prices, periods['sma_period']))
+
+        elif indicator == 'ema':
+            result['ema'] = to_series(dates, ema(prices, periods['ema_period']))
+
+        elif indicator == 'rsi':
+            result['rsi'] = to_series(dates, rsi(prices, periods['rsi_period']))
+
+        elif indicator == 'bb':
+            upper, middle, lower = bollinger_bands(prices, periods['bb_period'], periods['bb_std'])
+            result['bb'] = {
+                'upper': to_series(dates, upper),
+                'middle': to_series(dates, middle),
+                'lower': to_series(dates, lower)
+            }
+
+    return result
+
+class IndicatorState:
+    """एउटा सिम्बलको इन्क्रिमेन्टल (स्ट्रिमिङ) इन्डिकेटर स्टेट
+
+    बन्द भइसकेका दैनिक बारहरू commit() ले एक पटक मात्र स्टेटमा थप्छ। दिनभरि बदलिइरहने
+    अन्तिम बार (LTP) update() ले मात्र राख्छ र values() ले त्यसबाट O(1) मा मानहरू गणना गर्छ।
+    """
+
+    def __init__(self, periods=None):
+        """इनिसियलाइजर"""
+        periods = dict(DEFAULT_PERIODS, **(periods or {}))
+        self.sma_period = periods['sma_period']
+        self.ema_period = periods['ema_period']
+        self.rsi_period = periods['rsi_period']
+        self.bb_period = periods['bb_period']
+        self.bb_std = periods['bb_std']
+
+        # पछिल्ला commit गरिएका क्लोजहरूको विन्डो
+        self.closes = deque(maxlen=max(self.sma_period, self.bb_period))
+        self.count = 0
+        self.last_date = None
+        self.last_close = None
+
+        # SMA/BB: पछिल्ला (period - 1) क्लोजहरूको सम र वर्गको सम
+        self.sma_sum = 0.0
+        self.bb_sum = 0.0
+        self.bb_sum_sq = 0.0
+
+        # EMA: सुरुको SMA सम र चलिरहेको EMA
+        self.ema_seed_sum = 0.0
+        self.ema_value = None
+
+        # RSI: परिवर्तन संख्या, सुरुको सम र Wilder औसतहरू
+        self.rsi_count = 0
+        self.gain_sum = 0.0
+        self.loss_sum = 0.0
+        self.avg_gain = None
+        self.avg_loss = None
+
+        # अन्तिम commit गरिएको बारका मानहरू र हालको लाइभ बार
+        self.committed_values = self.empty_values()
+        self.live_date = None
+        self.live_close = None
+
+    @staticmethod
+    def empty_values():
+        """खाली इन्डिकेटर मानहरू"""
+        return {'sma': None, 'ema': None, 'rsi': None, 'bb': {'upper': None, 'middle': None, 'lower': None}}
+
+    def seed(self, dates, closes):
+        """हिस्टोरिकल दैनिक बारहरूबाट स्टेट तयार गर्ने (एक पटक मात्र, O(n))"""
+        for date, close in zip(dates, closes):
+            self.commit(date, close)
+
+    def values_for(self, price):
+        """commit गरिएको स्टेट र दिइएको अन्तिम मूल्यबाट O(1) मा इन्डिकेटर मानहरू गणना गर्ने"""
+        values = self.empty_values()
+        count = self.count + 1
+
+        # SMA
+        if count >= self.sma_period:
+            values['sma'] = round((self.sma_sum + price) / self.sma_period, 2)
+
+        # EMA
+        if self.ema_value is not None:
+            values['ema'] = round((price - self.ema_value) * (2 / (self.ema_period + 1)) + self.ema_value, 2)
+        elif count == self.ema_period:
+            values['ema'] = round((self.ema_seed_sum + price) / self.ema_period, 2)
+
+        # RSI
+        if self.last_close is not None:
+            delta = price - self.last_close
+            gain = delta if delta > 0 else 0.0
+            loss = -delta if delta < 0 else 0.0
+
+            if self.avg_gain is not None:
+                avg_gain = (self.avg_gain * (self.rsi_period - 1) + gain) / self.rsi_period
+                avg_loss = (self.avg_loss * (self.rsi_period - 1) + loss) / self.rsi_period
+                values['rsi'] = round(rsi_value(avg_gain, avg_loss), 2)
+            elif self.rsi_count + 1 == self.rsi_period:
+                avg_gain = (self.gain_sum + gain) / self.rsi_period
+                avg_loss = (self.loss_sum + loss) / self.rsi_period
+                values['rsi'] = round(rsi_value(avg_gain, avg_loss), 2)
+
+        # बोलिन्जर ब्यान्ड्स
+        if count >= self.bb_period:
+            middle = (self.bb_sum + price) / self.bb_period
+            variance = (self.bb_sum_sq + price * price) / self.bb_period - middle * middle
+            std = max(variance, 0.0) ** 0.5
+            values['bb'] = {
+                'upper': round(middle + self.bb_std * std, 2),
+                'middle': round(middle, 2),
+                'lower': round(middle - self.bb_std * std, 2)
+            }
+
+        return values
+
+    def commit(self, date, close):
+        """बन्द भएको दैनिक बार स्टेटमा थप्ने (O(1))"""
+        close = float(close)
+        self.committed_values = self.values_for(close)
+
+        # EMA
+        if self.ema_value is not None:
+            self.ema_value = (close - self.ema_value) * (2 / (self.ema_period + 1)) + self.ema_value
+        else:
+            self.ema_seed_sum += close
+            if self.count + 1 == self.ema_period:
+                self.ema_value = self.ema_seed_sum / self.ema_period
+
+        # RSI (Wilder)
+        if self.last_close is not None:
+            delta = close - self.last_close
+            gain = delta if delta > 0 else 0.0
+            loss = -delta if delta < 0 else 0.0
+            self.rsi_count += 1
+
+            if self.avg_gain is not None:
+                self.avg_gain = (self.avg_gain * (self.rsi_period - 1) + gain) / self.rsi_period
+                self.avg_loss = (self.avg_loss * (self.rsi_period - 1) + loss) / self.rsi_period
+            else:
+                self.gain_sum += gain
+                self.loss_sum += loss
+                if self.rsi_count == self.rsi_period:
+                    self.avg_gain = self.gain_sum / self.rsi_period
+                    self.avg_loss = self.loss_sum / self.rsi_period
+
+        # रोलिङ विन्डो सम: नयाँ क्लोज थप्ने, विन्डोबाट बाहिरिने क्लोज घटाउने
+        self.closes.append(close)
+        self.sma_sum += close
+        self.bb_sum += close
+        self.bb_sum_sq += close * close
+
+        if len(self.closes) >= self.sma_period:
+            self.sma_sum -= self.closes[-self.sma_period]
+
+        if len(self.closes) >= self.bb_period:
+            dropped = self.closes[-self.bb_period]
+            self.bb_sum -= dropped
+            self.bb_sum_sq -= dropped * dropped
+
+        self.count += 1
+        self.last_date = date
+        self.last_close = close
+
+    def update(self, date, ltp):
+        """दिनभरिको नयाँ LTP ले लाइभ बार अपडेट गर्ने (O(1))"""
+        # commit भइसकेको दिनको मूल्य भए बेवास्ता गर्ने
+        if self.last_date is not None and date <= self.last_date:
+            return
+
+        # नयाँ दिन सुरु भएमा अघिल्लो लाइभ बार commit गर्ने
+        if self.live_date is not None and date > self.live_date:
+            self.commit(self.live_date, self.live_close)
+
+        self.live_date = date
+        self.live_close = float(ltp)
+
+    def values(self):
+        """हालका इन्डिकेटर मानहरू (लाइभ बार भए त्यसैबाट)"""
+        if self.live_close is not None:
+            return self.values_for(self.live_close)
+
+        return self.committed_values
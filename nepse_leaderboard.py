@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+NEPSE लिडरबोर्ड
+
+यो मोड्युलले हरेक स्न्यापसट रिफ्रेसमा प्रतिशत परिवर्तन, परिवर्तन, भोल्युम, कारोबार रकम र
+मूल्यको टप/बटम k स्टक्स सीमित हिप (heap) प्रयोग गरेर एक पटक मात्र निकाल्छ।
+रिक्वेस्टहरूले पहिले नै तयार सूचीबाट O(k) मा जवाफ पाउँछन्।
+"""
+
+import heapq
+import numpy as np
+
+# हरेक मेट्रिकको लागि राखिने अधिकतम स्टक संख्या
+LEADERBOARD_SIZE = 50
+
+# मेट्रिकहरू र तिनका उपनामहरू
+METRICS = ['percent_change', 'change', 'qty', 'turnover', 'ltp']
+METRIC_ALIASES = {
+    'volume': 'qty',
+    'price': 'ltp',
+    'change_percent': 'percent_change'
+}
+DIRECTIONS = ['top', 'bottom']
+
+def resolve_metric(metric):
+    """मेट्रिकको नाम वा उपनामबाट मेट्रिक प्राप्त गर्ने"""
+    metric = METRIC_ALIASES.get(metric, metric)
+    return metric if metric in METRICS else None
+
+class Leaderboard:
+    """मेट्रिक अनुसार टप/बटम k स्टक्स राख्ने क्लास"""
+
+    def __init__(self, snapshot, size=LEADERBOARD_SIZE):
+        """इनिसियलाइजर"""
+        self.snapshot = snapshot
+        self.size = size
+        self.values = {}
+        self.boards = {}
+
+        rows = range(len(snapshot))
+
+        for metric in METRICS:
+            # कारोबार रकम = मूल्य × भोल्युम
+            if metric == 'turnover':
+                values = snapshot.column('ltp') * snapshot.column('qty')
+            else:
+                values = snapshot.column(metric)
+
+            self.values[metric] = values
+
+            # सीमित हिपबाट टप र बटम k रोहरू निकाल्ने
+            key = values.tolist().__getitem__
+            self.boards[(metric, 'top')] = np.array(heapq.nlargest(size, rows, key=key), dtype=np.int64)
+            self.boards[(metric, 'bottom')] = np.array(heapq.nsmallest(size, rows, key=key), dtype=np.int64)
+
+    def indices(self, metric, direction='top', k=10):
+        """मेट्रिक अनुसार पहिलो k रोहरूको इन्डेक्स प्राप्त गर्ने"""
+        # ऋणात्मक k ले स्लाइस अन्त्यबाट नकाटोस्
+        k = max(int(k), 0)
+
+        if k <= self.size:
+            return self.boards[(metric, direction)][:k]
+
+        # लिडरबोर्डभन्दा ठूलो k भए मात्र पूरा सर्ट गर्ने
+        values = self.values[metric]
+        order = np.argsort(-values if direction == 'top' else values, kind='stable')
+        return order[:k]
+
+    def leaders(self, metric, direction='top', k=10):
+        """मेट्रिक अनुसार पहिलो k स्टक्स र तिनको मान प्राप्त गर्ने"""
+        values = self.values[metric]
+        records = self.snapshot.records
+
+        return [dict(records[i], value=values[i].item()) for i in self.indices(metric, direction, k)]
+
+    def gainers(self, limit=10):
+        """प्रतिशत परिवर्तन धनात्मक भएका टप स्टक्स प्राप्त गर्ने"""
+        indices = self.indices('percent_change', 'top', limit)
+        indices = indices[self.values['percent_change'][indices] > 0]
+        return self.snapshot.rows(indices)
+
+    def losers(self, limit=10):
+        """प्रतिशत परिवर्तन ऋणात्मक भएका टप स्टक्स प्राप्त गर्ने"""
+        indices = self.indices('percent_change', 'bottom', limit)
+        indices = indices[self.values['percent_change'][indices] < 0]
+        return self.snapshot.rows(indices)
@@ -0,0 +1,539 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+NEPSE HTML पार्सरहरू
+
+यो मोड्युलमा nepalstock.com, merolagani.com र nepalipaisa.com का पेजहरूबाट डाटा निकाल्ने
+फंक्सनहरू छन्। यिनीहरूले HTML टेक्स्ट मात्र लिन्छन् र कुनै नेटवर्क वा ग्लोबल स्टेट प्रयोग
+गर्दैनन्, त्यसैले रिफ्रेस पाइपलाइनले यिनलाई वर्कर थ्रेडमा चलाउन सक्छ।
+
+पार्सिङ मोडहरू:
+    lxml      - lxml पार्सर र पहिले नै कम्पाइल गरिएका XPath (डिफल्ट, सबैभन्दा छिटो)
+    strainer  - html.parser मा SoupStrainer ले लक्षित टेबल/ID मात्र ट्री बनाउने
+    soup      - पूरा पेजको html.parser ट्री (पुरानो तरिका, तुलनाको लागि)
+"""
+
+import re
+from datetime import datetime
+from bs4 import BeautifulSoup, SoupStrainer
+
+# lxml (उपलब्ध भए मात्र)
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
+
+PARSE_MODES = ['lxml', 'strainer', 'soup']
+DEFAULT_MODE = 'lxml' if etree is not None else 'strainer'
+
+# संख्या र इकाई (जस्तै "12.5 B") मिलाउने प्याटर्न
+AMOUNT_PATTERN = re.compile(r'([\d\.]+)\s*([A-Za-z]+)?')
+CHANGE_PATTERN = re.compile(r'([\+\-]?\d+\.\d+)\s*\(([\+\-]?\d+\.\d+)%\)')
+
+# इकाई अनुसार गुणकहरू
+TURNOVER_UNITS = {'b': 1000000000, 'bn': 1000000000, 'm': 1000000, 'mn': 1000000, 'k': 1000}
+SHARES_UNITS = {'m': 1000000, 'k': 1000}
+MARKET_CAP_UNITS = {'t': 1000000000000, 'tn': 1000000000000, 'b': 1000000000, 'bn': 1000000000, 'm': 1000000, 'mn': 1000000}
+
+# लक्षित टेबलहरू: (एट्रिब्युट, मान)
+PRICE_TABLE = ('class', 'table table-bordered table-striped table-hover')
+COMPANY_TABLE = ('id', 'ctl00_ContentPlaceHolder1_tblCompanyList')
+
+# कम्पनी विवरण पेजको ID → (ट्याग, खण्ड, फिल्ड, कन्भर्टरको नाम)
+DETAIL_ID_PREFIX = 'ctl00_ContentPlaceHolder1_CompanyDetail1_'
+DETAIL_CONTACT_ID = DETAIL_ID_PREFIX + 'divContactInfo'
+DETAIL_FIELDS = {
+    DETAIL_ID_PREFIX + name: spec for name, spec in [
+        ('companyName', ('span', None, 'company_name', None)),
+        ('lblSector', ('a', None, 'sector', None)),
+        ('lblMarketPrice', ('span', 'price_info', 'ltp', 'float')),
+        ('lblChange', ('span', 'price_info', 'change_percent', 'change_percent')),
+        ('lbl52WeekHighLow', ('span', 'price_info', ('high_52_week', 'low_52_week'), 'high_low')),
+        ('lblMarketCapitalization', ('span', 'fundamentals', 'market_cap', None)),
+        ('lblOutstandingShares', ('span', 'fundamentals', 'shares_outstanding', None)),
+        ('lblEPS', ('span', 'fundamentals', 'eps', 'float')),
+        ('lblPERatio', ('span', 'fundamentals', 'pe_ratio', 'float')),
+        ('lblBookValue', ('span', 'fundamentals', 'book_value', 'float')),
+        ('lblPBV', ('span', 'fundamentals', 'pbv', 'float')),
+        ('lblDividend', ('span', 'fundamentals', 'dividend', None)),
+        ('lblDividendYield', ('span', 'fundamentals', 'dividend_yield', 'percent')),
+        ('divCompanyProfile', ('div', 'description', 'about', None)),
+        ('divContactInfo', ('div', 'contact_info', None, None)),
+        ('lblAddress', ('span', 'contact_info', 'address', None)),
+        ('lblPhone', ('span', 'contact_info', 'phone', None)),
+        ('lblEmail', ('span', 'contact_info', 'email', None)),
+        ('lblWebsite', ('span', 'contact_info', 'website', None))
+    ]
+}
+
+# मेरोलगानी बजार सारांशका लाइभ बक्सहरू: ID → नाम
+SUMMARY_IDS = {
+    'ctl00_ContentPlaceHolder1_LiveNepse': 'nepse',
+    'ctl00_ContentPlaceHolder1_LiveTurnover': 'turnover',
+    'ctl00_ContentPlaceHolder1_LiveSharesTraded': 'shares',
+    'ctl00_ContentPlaceHolder1_LiveTransactions': 'transactions',
+    'ctl00_ContentPlaceHolder1_LiveMarketCap': 'market_cap'
+}
+
+# पहिले नै कम्पाइल गरिएका XPath हरू
+if etree is not None:
+    LXML_PARSER = etree.HTMLParser(remove_comments=True)
+    TABLE_XPATHS = {
+        table: etree.XPath(f'(//table[@{table[0]}="{table[1]}"])[1]')
+        for table in (PRICE_TABLE, COMPANY_TABLE)
+    }
+    ROW_XPATH = etree.XPath('.//tr')
+    CELL_XPATH = etree.XPath('.//td')
+    ANCHOR_XPATH = etree.XPath('(.//a)[1]')
+    ID_XPATH = etree.XPath('//*[@id]')
+    CLASS_XPATH = etree.XPath('(.//*[contains(concat(" ", normalize-space(@class), " "), concat(" ", $name, " "))])[1]')
+
+def format_large_number(number):
+    """
+    ठूलो संख्यालाई सजिलै पढ्न मिल्ने ढाँचामा परिवर्तन गर्ने
+    """
+    if number >= 1000000000000:  # ट्रिलियन
+        return f"Rs. {number / 1000000000000:.2f} T"
+    elif number >= 1000000000:  # बिलियन
+        return f"Rs. {number / 1000000000:.2f} B"
+    elif number >= 1000000:  # मिलियन
+        return f"Rs. {number / 1000000:.2f} M"
+    elif number >= 1000:  # हजार
+        return f"Rs. {number / 1000:.2f} K"
+    else:
+        return f"Rs. {number:.2f}"
+
+def format_number(number):
+    """
+    संख्यालाई सजिलै पढ्न मिल्ने ढाँचामा परिवर्तन गर्ने
+    """
+    if number >= 1000000:  # मिलियन
+        return f"{number / 1000000:.2f} M"
+    elif number >= 1000:  # हजार
+        return f"{number / 1000:.2f} K"
+    else:
+        return f"{number}"
+
+def parse_amount(text, units):
+    """इकाई सहितको रकम (जस्तै "Rs. 3.2 B") लाई संख्यामा परिवर्तन गर्ने"""
+    # Rs. र कम्मा हटाउने
+    text = text.replace('Rs.', '').replace(',', '').strip()
+
+    match = AMOUNT_PATTERN.search(text)
+    if not match:
+        return 0.0
+
+    value = float(match.group(1))
+    unit = (match.group(2) or '').lower()
+    return value * units.get(unit, 1)
+
+def parse_change(text):
+    """"12.34 (0.56%)" बाट परिवर्तन र प्रतिशत परिवर्तन निकाल्ने"""
+    match = CHANGE_PATTERN.search(text)
+    if not match:
+        return 0.0, 0.0
+    return float(match.group(1)), float(match.group(2))
+
+def parse_mode(mode=None):
+    """पार्सिङ मोड छान्ने (नदिए उपलब्ध सबैभन्दा छिटो मोड)"""
+    mode = mode or DEFAULT_MODE
+    if mode == 'lxml' and etree is None:
+        return 'strainer'
+    return mode
+
+def make_soup(html, mode, strainer):
+    """मोड अनुसार पूरा वा सीमित BeautifulSoup ट्री बनाउने"""
+    if mode == 'strainer':
+        return BeautifulSoup(html, 'html.parser', parse_only=strainer)
+    return BeautifulSoup(html, 'html.parser')
+
+def make_tree(html):
+    """lxml HTML ट्री बनाउने (खाली पेजमा None)"""
+    if not html:
+        return None
+    try:
+        return etree.HTML(html, LXML_PARSER)
+    except ValueError:
+        # इन्कोडिङ घोषणा भएका स्ट्रिङहरू बाइटमा दिनुपर्छ
+        return etree.HTML(html.encode('utf-8'), LXML_PARSER)
+
+def element_text(element):
+    """lxml एलिमेन्टको सबै टेक्स्ट (BeautifulSoup को .text जस्तै)"""
+    return ''.join(element.itertext()).strip()
+
+def table_rows(html, table, mode=None, anchor_column=None):
+    """टेबलका रोहरू (हेडर बाहेक) लाई सेल टेक्स्टको सूचीमा निकाल्ने
+
+    table (एट्रिब्युट, मान) जोडी हो। anchor_column दिए त्यो सेलको सट्टा भित्रको पहिलो लिङ्कको
+    टेक्स्ट (लिङ्क नभए None) राखिन्छ। टेबल नभेटिए None फर्काउँछ।
+    """
+    mode = parse_mode(mode)
+
+    if mode == 'lxml':
+        tree = make_tree(html)
+        found = TABLE_XPATHS[table](tree) if tree is not None else []
+        if not found:
+            return None
+
+        rows = []
+        for row in ROW_XPATH(found[0])[1:]:  # हेडर रो छोड्ने
+            cells = CELL_XPATH(row)
+            texts = [element_text(cell) for cell in cells]
+
+            if anchor_column is not None and anchor_column < len(cells):
+                anchor = ANCHOR_XPATH(cells[anchor_column])
+                texts[anchor_column] = element_text(anchor[0]) if anchor else None
+
+            rows.append(texts)
+        return rows
+
+    attr, value = table
+    soup = make_soup(html, mode, SoupStrainer('table', attrs={attr: value}))
+    found = soup.find('table', attrs={attr: value})
+    if not found:
+        return None
+
+    rows = []
+    for row in found.find_all('tr')[1:]:  # हेडर रो छोड्ने
+        cells = row.find_all('td')
+        texts = [cell.text.strip() for cell in cells]
+
+        if anchor_column is not None and anchor_column < len(cells):
+            anchor = cells[anchor_column].find('a')
+            texts[anchor_column] = anchor.text.strip() if anchor else None
+
+        rows.append(texts)
+    return rows
+
+def element_texts(html, fields, mode=None):
+    """ID→फिल्ड म्यापका एलिमेन्टहरूको टेक्स्ट एकै पटक निकाल्ने
+
+    fields मा ID अनुसार (ट्याग, ...) हुन्छ; ID र ट्याग दुवै मिलेको पहिलो एलिमेन्ट मात्र लिइन्छ।
+    """
+    mode = parse_mode(mode)
+    texts = {}
+
+    if mode == 'lxml':
+        tree = make_tree(html)
+        if tree is None:
+            return texts
+
+        for element in ID_XPATH(tree):
+            element_id = element.get('id')
+            spec = fields.get(element_id)
+            if spec and spec[0] == element.tag and element_id not in texts:
+                texts[element_id] = element_text(element)
+        return texts
+
+    soup = make_soup(html, mode, SoupStrainer(id=fields.__contains__))
+    for element in soup.find_all(id=fields.__contains__):
+        element_id = element.get('id')
+        if fields[element_id][0] == element.name and element_id not in texts:
+            texts[element_id] = element.text.strip()
+    return texts
+
+def parse_float(text):
+    """कम्मा सहितको टेक्स्टलाई float मा परिवर्तन गर्ने (असफल भए 0.0)"""
+    try:
+        return float(text.replace(',', ''))
+    except:
+        return 0.0
+
+def parse_change_percent(text):
+    """"12.3 (1.5%)" बाट प्रतिशत परिवर्तन निकाल्ने"""
+    try:
+        if '(' in text and ')' in text:
+            return float(text.split('(')[1].split(')')[0].replace('%', ''))
+    except:
+        pass
+    return 0.0
+
+def parse_high_low(text):
+    """"1,200 / 800" बाट ५२ हप्ते उच्च र न्यून मूल्य निकाल्ने"""
+    try:
+        if '/' in text:
+            high, low = text.split('/')
+            return float(high.strip().replace(',', '')), float(low.strip().replace(',', ''))
+    except:
+        pass
+    return 0.0, 0.0
+
+def parse_percent(text):
+    """"4.5%" लाई float मा परिवर्तन गर्ने"""
+    try:
+        if '%' in text:
+            return float(text.replace('%', ''))
+    except:
+        pass
+    return 0.0
+
+# DETAIL_FIELDS का कन्भर्टरहरू
+CONVERTERS = {
+    'float': parse_float,
+    'change_percent': parse_change_percent,
+    'high_low': parse_high_low,
+    'percent': parse_percent
+}
+
+def parse_todays_price(html, mode=None):
+    """nepalstock.com को todays_price पेजबाट स्टक डाटा निकाल्ने"""
+    rows = table_rows(html, PRICE_TABLE, mode)
+    if not rows:
+        return []
+
+    stock_data = []
+
+    for columns in rows:
+        if len(columns) >= 10:
+            try:
+                symbol = columns[1]
+
+                # मूल्य डाटा प्राप्त गर्ने
+                ltp = columns[6]
+                change_text = columns[7]
+                change = float(change_text) if change_text else 0
+                high = columns[4]
+                low = columns[5]
+                open_price = columns[3]
+                qty = columns[10].replace(',', '')
+
+                # प्रतिशत परिवर्तन गणना गर्ने
+                percent_change = 0
+                if change != 0 and ltp:
+                    try:
+                        ltp_value = float(ltp.replace(',', ''))
+                        percent_change = round((change / (ltp_value - change)) * 100, 2)
+                    except:
+                        percent_change = 0
+
+                stock_data.append({
+                    'symbol': symbol,
+                    'ltp': ltp,
+                    'change': change,
+                    'percent_change': percent_change,
+                    'high': high,
+                    'low': low,
+                    'open': open_price,
+                    'qty': qty
+                })
+            except Exception as e:
+                print(f"Error processing row: {str(e)}")
+                continue
+
+    return stock_data
+
+def parse_stock_list(html, mode=None):
+    """nepalstock.com को company पेजबाट सूचीकृत शेयरहरू निकाल्ने"""
+    rows = table_rows(html, PRICE_TABLE, mode)
+    if not rows:
+        return []
+
+    stocks = []
+
+    for columns in rows:
+        if len(columns) >= 3:
+            stocks.append({
+                'symbol': columns[1],
+                'company_name': columns[2],
+                'sector': columns[3] if len(columns) > 3 else "N/A"
+            })
+
+    return stocks
+
+def parse_company_list(html, mode=None):
+    """merolagani.com को CompanyList पेजबाट कम्पनीहरूको सूची निकाल्ने"""
+    rows = table_rows(html, COMPANY_TABLE, mode, anchor_column=0)
+    if not rows:
+        return []
+
+    companies = []
+
+    for cols in rows:
+        # पहिलो सेलमा सिम्बलको लिङ्क भएका रोहरू मात्र
+        if len(cols) >= 7 and cols[0] is not None:
+            companies.append({
+                'symbol': cols[0],
+                'company_name': cols[1],
+                'sector': cols[2],
+                'ltp': parse_float(cols[3]),
+                'change_percent': parse_float(cols[4].replace('%', '')),
+                'high_52_week': parse_float(cols[5]),
+                'low_52_week': parse_float(cols[6])
+            })
+
+    return companies
+
+def parse_company_detail(html, symbol, mode=None):
+    """merolagani.com को CompanyDetail पेजबाट कम्पनी विवरण निकाल्ने"""
+    texts = element_texts(html, DETAIL_FIELDS, mode)
+
+    company_detail = {'company_name': symbol, 'sector': "N/A"}
+    sections = {'price_info': {}, 'fundamentals': {}, 'description': {}, 'contact_info': {}}
+
+    # पहिले नै कम्पाइल गरिएको ID→फिल्ड म्याप अनुसार मानहरू राख्ने
+    for element_id, (tag, section, field, convert) in DETAIL_FIELDS.items():
+        text = texts.get(element_id)
+        if text is None or field is None:
+            continue
+
+        target = company_detail if section is None else sections[section]
+        value = CONVERTERS[convert](text) if convert else text
+
+        if isinstance(field, tuple):
+            target.update(zip(field, value))
+        else:
+            target[field] = value
+
+    # सम्पर्क विवरण सम्पर्क खण्ड भएमा मात्र
+    if DETAIL_CONTACT_ID in texts:
+        sections['description']['contact_info'] = sections['contact_info']
+
+    company_detail['price_info'] = sections['price_info']
+    company_detail['fundamentals'] = sections['fundamentals']
+    company_detail['description'] = sections['description']
+
+    return company_detail
+
+def build_market_overview(nepse_index, nepse_change, nepse_change_percent, turnover, shares_traded,
+                          transactions, market_cap, market_status, data_source):
+    """बजार अवलोकन डाटा संरचना तयार गर्ने"""
+    return {
+        'nepse_index': nepse_index,
+        'nepse_change': nepse_change,
+        'nepse_change_percent': nepse_change_percent,
+        'turnover': turnover,
+        'turnover_formatted': format_large_number(turnover),
+        'shares_traded': shares_traded,
+        'shares_traded_formatted': format_large_number(shares_traded),
+        'transactions': transactions,
+        'transactions_formatted': format_number(transactions),
+        'market_cap': market_cap,
+        'market_cap_formatted': format_large_number(market_cap),
+        'market_status': market_status,
+        'last_updated': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'data_source': data_source
+    }
+
+def default_market_overview():
+    """स्क्र्याप असफल हुँदा फर्काइने डिफल्ट बजार अवलोकन"""
+    return {
+        'nepse_index': 0.0,
+        'nepse_change': 0.0,
+        'nepse_change_percent': 0.0,
+        'turnover': 0.0,
+        'turnover_formatted': 'Rs. 0',
+        'shares_traded': 0,
+        'shares_traded_formatted': '0',
+        'transactions': 0,
+        'transactions_formatted': '0',
+        'market_cap': 0.0,
+        'market_cap_formatted': 'Rs. 0',
+        'market_status': 'Unknown',
+        'last_updated': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'data_source': 'default'
+    }
+
+def live_values(html, mode=None):
+    """मेरोलगानी बजार सारांशका लाइभ बक्सहरूबाट (मूल्य, परिवर्तन) टेक्स्ट निकाल्ने"""
+    mode = parse_mode(mode)
+    values = {}
+
+    if mode == 'lxml':
+        tree = make_tree(html)
+        for element in (ID_XPATH(tree) if tree is not None else []):
+            name = SUMMARY_IDS.get(element.get('id'))
+            if name and name not in values:
+                price = CLASS_XPATH(element, name='price')
+                change = CLASS_XPATH(element, name='change')
+                values[name] = (
+                    element_text(price[0]) if price else None,
+                    element_text(change[0]) if change else None
+                )
+        return values
+
+    soup = make_soup(html, mode, SoupStrainer(id=SUMMARY_IDS.__contains__))
+    for element in soup.find_all(id=SUMMARY_IDS.__contains__):
+        name = SUMMARY_IDS[element.get('id')]
+        if name not in values:
+            price = element.select_one('.price')
+            change = element.select_one('.change')
+            values[name] = (
+                price.text.strip() if price else None,
+                change.text.strip() if change else None
+            )
+    return values
+
+def parse_merolagani_summary(html, market_status, mode=None):
+    """merolagani.com को MarketSummary पेजबाट बजार अवलोकन निकाल्ने"""
+    values = live_values(html, mode)
+
+    def live_price(name):
+        # बक्स नभए 0, बक्स भएर मूल्य नभए पेज ढाँचा बदलिएको मान्ने
+        if name not in values:
+            return "0"
+        if values[name][0] is None:
+            raise ValueError(f"मेरोलगानी {name} मूल्य फेला परेन")
+        return values[name][0]
+
+    # नेप्से इन्डेक्स र परिवर्तन प्राप्त गर्ने
+    nepse_index = float(live_price('nepse').replace(',', '')) if 'nepse' in values else None
+    nepse_change_text = values['nepse'][1] if 'nepse' in values and values['nepse'][1] is not None else "0.00 (0.00%)"
+    nepse_change, nepse_change_percent = parse_change(nepse_change_text)
+
+    return build_market_overview(
+        nepse_index,
+        nepse_change,
+        nepse_change_percent,
+        parse_amount(live_price('turnover'), TURNOVER_UNITS),
+        parse_amount(live_price('shares'), SHARES_UNITS),
+        int(live_price('transactions').replace(',', '')),
+        parse_amount(live_price('market_cap'), MARKET_CAP_UNITS),
+        market_status,
+        'merolagani'
+    )
+
+def parse_nepalipaisa_summary(html, market_status):
+    """nepalipaisa.com को गृहपृष्ठबाट बजार अवलोकन निकाल्ने"""
+    soup = BeautifulSoup(html, 'html.parser')
+
+    # नेप्से इन्डेक्स डाटा प्राप्त गर्ने
+    nepse_index_div = soup.select_one('.market-status')
+    nepse_index_text = nepse_index_div.select_one('.nepse-index').text.strip() if nepse_index_div else "0"
+    nepse_index = float(nepse_index_text.replace(',', ''))
+
+    # नेप्से परिवर्तन प्राप्त गर्ने
+    nepse_change_div = nepse_index_div.select_one('.nepse-change') if nepse_index_div else None
+    nepse_change_text = nepse_change_div.text.strip() if nepse_change_div else "0.00 (0.00%)"
+    nepse_change, nepse_change_percent = parse_change(nepse_change_text)
+
+    # अन्य बजार डाटा प्राप्त गर्ने
+    turnover_value = 0.0
+    shares_value = 0.0
+    transactions = 0
+    market_cap_value = 0.0
+
+    for div in soup.select('.market-data .data-item'):
+        label = div.select_one('.label').text.strip().lower() if div.select_one('.label') else ""
+        value_text = div.select_one('.value').text.strip() if div.select_one('.value') else "0"
+
+        if 'turnover' in label:
+            turnover_value = parse_amount(value_text, TURNOVER_UNITS)
+        elif 'shares' in label or 'traded' in label:
+            shares_value = parse_amount(value_text, SHARES_UNITS)
+        elif 'transactions' in label:
+            transactions = int(value_text.replace(',', ''))
+        elif 'market cap' in label or 'capitalization' in label:
+            market_cap_value = parse_amount(value_text, MARKET_CAP_UNITS)
+
+    return build_market_overview(
+        nepse_index,
+        nepse_change,
+        nepse_change_percent,
+        turnover_value,
+        shares_value,
+        transactions,
+        market_cap_value,
+        market_status,
+        'nepalipaisa'
+    )
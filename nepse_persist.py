@@ -0,0 +1,195 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+क्यास फाइल पर्सिस्टेन्स
+
+यो मोड्युलको CacheStore ले क्यासहरूलाई कम्प्याक्ट बाइनरी फाइलमा (msgpack उपलब्ध भए msgpack,
+नभए JSON, दुवै zlib ले कम्प्रेस गरिएको) सेभ गर्छ। रिफ्रेसले क्यासलाई dirty मात्र चिन्ह लगाउँछ, र
+ब्याकग्राउन्ड थ्रेडले केही सेकेन्डभित्रका परिवर्तनहरू एकै पटक (write-behind) लेख्छ। फेरिएको क्यास
+मात्र लेखिन्छ र हरेक फाइल अस्थायी फाइलमा लेखेर rename गरिन्छ, त्यसैले लेख्दै गर्दा क्र्यास भए
+पनि पुरानो फाइल बिग्रँदैन। बाइनरी फाइल नभए पुरानो JSON फाइलबाट इम्पोर्ट गरिन्छ।
+"""
+
+import os
+import json
+import time
+import zlib
+import atexit
+import threading
+
+# msgpack उपलब्ध भए कम्प्याक्ट बाइनरी एन्कोडिङ
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# फाइल हेडर: म्याजिक + एन्कोडिङ कोड
+MAGIC = b'NPC1'
+CODEC_MSGPACK = b'm'
+CODEC_JSON = b'j'
+
+# परिवर्तन भएपछि यति समय पर्खेर एकै पटक लेख्ने (सेकेन्डमा)
+DEFAULT_WRITE_DELAY = 2.0
+COMPRESS_LEVEL = 6
+
+def encode(value):
+    """मानलाई हेडर सहितको कम्प्रेस गरिएको बाइटमा बदल्ने"""
+    if msgpack is not None:
+        codec, body = CODEC_MSGPACK, msgpack.packb(value, use_bin_type=True)
+    else:
+        codec, body = CODEC_JSON, json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    return MAGIC + codec + zlib.compress(body, COMPRESS_LEVEL)
+
+def decode(data):
+    """encode() ले बनाएको बाइटबाट मान निकाल्ने"""
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError('not a cache file')
+
+    codec = data[len(MAGIC):len(MAGIC) + 1]
+    body = zlib.decompress(data[len(MAGIC) + 1:])
+
+    if codec == CODEC_MSGPACK:
+        if msgpack is None:
+            raise ValueError('msgpack is not installed')
+        return msgpack.unpackb(body, raw=False)
+
+    if codec == CODEC_JSON:
+        return json.loads(body.decode('utf-8'))
+
+    raise ValueError(f'unknown codec {codec!r}')
+
+def write_atomic(path, data):
+    """अस्थायी फाइलमा लेखेर rename गर्ने (लेख्दै गर्दा क्र्यास भए पुरानो फाइल जस्ताको तस्तै)"""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+class CacheStore:
+    """नाम अनुसार क्यासहरू बाइनरी फाइलमा write-behind गर्ने स्टोर
+
+    paths मा नाम → बाइनरी फाइल, legacy_paths मा नाम → पुरानो JSON फाइल हुन्छ।
+    """
+
+    def __init__(self, paths, legacy_paths=None, delay=DEFAULT_WRITE_DELAY):
+        """इनिसियलाइजर"""
+        self.paths = dict(paths)
+        self.legacy_paths = dict(legacy_paths or {})
+        self.delay = max(float(delay), 0.0)
+
+        self.condition = threading.Condition()
+        self.write_lock = threading.Lock()
+        # नाम → लेख्न बाँकी मान (dirty क्यासहरू)
+        self.pending = {}
+        self.thread = None
+        self.closed = False
+
+        # तथ्याङ्क
+        self.writes = 0
+        self.errors = 0
+
+    def load(self, name):
+        """क्यास लोड गर्ने (बाइनरी नभए वा बिग्रिए पुरानो JSON, त्यो पनि नभए None)"""
+        path = self.paths[name]
+
+        if os.path.exists(path):
+            try:
+                with open(path, 'rb') as f:
+                    return decode(f.read())
+            except Exception as e:
+                print(f"क्यास फाइल लोड गर्न त्रुटि ({path}): {str(e)}")
+
+        legacy_path = self.legacy_paths.get(name)
+        if legacy_path and os.path.exists(legacy_path):
+            try:
+                with open(legacy_path, 'r') as f:
+                    value = json.load(f)
+            except Exception as e:
+                print(f"पुरानो क्यास फाइल लोड गर्न त्रुटि ({legacy_path}): {str(e)}")
+                return None
+
+            # अर्को पटकदेखि बाइनरी फाइलबाटै लोड होस्
+            self.mark(name, value)
+            return value
+
+        return None
+
+    def mark(self, name, value):
+        """क्यास फेरिएको चिन्ह लगाउने (ब्याकग्राउन्डमा पछि लेखिन्छ)"""
+        with self.condition:
+            self.pending[name] = value
+            self.condition.notify()
+
+        self.start()
+
+    def flush(self):
+        """लेख्न बाँकी सबै क्यासहरू अहिले नै लेख्ने"""
+        with self.write_lock:
+            with self.condition:
+                pending, self.pending = self.pending, {}
+
+            for name, value in pending.items():
+                try:
+                    write_atomic(self.paths[name], encode(value))
+                    self.writes += 1
+                except Exception as e:
+                    self.errors += 1
+                    print(f"क्यास फाइल सेभ गर्न त्रुटि ({self.paths[name]}): {str(e)}")
+
+        return len(pending)
+
+    def run(self):
+        """dirty क्यासहरू पर्खेर delay पछि एकै पटक लेख्ने लुप"""
+        while True:
+            with self.condition:
+                while not self.pending and not self.closed:
+                    self.condition.wait()
+
+                # यो समयभित्र आएका परिवर्तनहरू पनि एकै पटक लेख्ने
+                deadline = time.monotonic() + self.delay
+                while not self.closed and time.monotonic() < deadline:
+                    self.condition.wait(deadline - time.monotonic())
+
+                # बन्द हुँदा close() आफैले बाँकी लेख्छ
+                if self.closed:
+                    return
+
+            self.flush()
+
+    def start(self):
+        """लेख्ने थ्रेड सुरु गर्ने (पहिले नै चलिरहेको भए केही नगर्ने)"""
+        with self.condition:
+            if self.thread is not None or self.closed:
+                return
+
+            self.thread = threading.Thread(target=self.run, name='cache-store')
+            self.thread.daemon = True
+            self.thread.start()
+
+        # प्रोसेस बन्द हुँदा बाँकी परिवर्तनहरू नहराऊन्
+        atexit.register(self.close)
+
+    def close(self):
+        """थ्रेड रोकेर बाँकी परिवर्तनहरू लेख्ने"""
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
+
+        self.flush()
+
+    def stats(self):
+        """तथ्याङ्क प्राप्त गर्ने"""
+        with self.condition:
+            return {'pending': sorted(self.pending), 'writes': self.writes, 'errors': self.errors,
+                    'encoding': 'msgpack' if msgpack is not None else 'json'}
@@ -8,7 +8,6 @@ NEPSE स्टक मार्केट डाटा स्क्र्या
 यसले स्टक सिम्बल, मूल्य, परिवर्तन, भोल्युम आदि जानकारी प्राप्त गर्छ।
 """
 
-import requests
 from bs4 import BeautifulSoup
 import pandas as pd
 import json
@@ -17,12 +16,18 @@ import os
 import csv
 from datetime import datetime
 import random
+from nepse_snapshot import NepseSnapshot
+from nepse_fetch import fetch
+from nepse_parsers import parse_todays_price, parse_stock_list
+from nepse_cache import SingleFlight
 
 # कन्फिगरेसन
 CACHE_DIR = 'cache'
 DATA_CACHE_FILE = os.path.join(CACHE_DIR, 'nepse_data_cache.json')
 STOCKS_LIST_FILE = os.path.join(CACHE_DIR, 'nepse_stocks_list.json')
 CACHE_EXPIRY = 15 * 60  # 15 मिनेट (सेकेन्डमा)
+STOCKS_LIST_EXPIRY = 24 * 60 * 60  # 24 घण्टा
+MAX_STALE = 60 * 60  # म्याद सकिएपछि पनि यति समयसम्म पुरानो डाटा तुरुन्तै दिने (सेकेन्डमा)
 USER_AGENTS = [
     'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
     'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:89.0) Gecko/20100101 Firefox/89.0',
@@ -40,6 +45,8 @@ class NepseDataScraper:
         """इनिसियलाइजर"""
         self.nepse_data_cache = {'data': [], 'last_updated': 0}
         self.stocks_list_cache = {'data': [], 'last_updated': 0}
+        self.nepse_snapshot = NepseSnapshot([], 0)
+        self.refresher = SingleFlight()
         self.load_cache_files()
     
     def load_cache_files(self):
@@ -49,8 +56,10 @@ class NepseDataScraper:
             try:
                 with open(DATA_CACHE_FILE, 'r') as f:
                     self.nepse_data_cache = json.load(f)
+                self.nepse_snapshot = NepseSnapshot(self.nepse_data_cache['data'], self.nepse_data_cache['last_updated'])
             except:
                 self.nepse_data_cache = {'data': [], 'last_updated': 0}
+                self.nepse_snapshot = NepseSnapshot([], 0)
         
         # स्टक्स लिस्ट क्यास लोड गर्ने
         if os.path.exists(STOCKS_LIST_FILE):
@@ -91,7 +100,11 @@ class NepseDataScraper:
         current_time = time.time()
         
         # क्यास अवधि समाप्त नभएको छ र फोर्स रिफ्रेस छैन भने क्यास डाटा फर्काउने
-        if not force_refresh and self.stocks_list_cache['data'] and current_time - self.stocks_list_cache['last_updated'] < 24 * 60 * 60:  # 24 घण्टा
+        if not force_refresh and self.stocks_list_cache['data'] and current_time - self.stocks_list_cache['last_updated'] < STOCKS_LIST_EXPIRY:
+            return self.stocks_list_cache['data']
+        
+        # म्याद भर्खरै सकिएको भए पुरानै डाटा दिएर ब्याकग्राउन्डमा रिफ्रेस गर्ने
+        if not force_refresh and self.serve_stale('stocks_list', self.stocks_list_cache, STOCKS_LIST_EXPIRY, self.fetch_all_stocks):
             return self.stocks_list_cache['data']
         
         try:
@@ -101,32 +114,10 @@ class NepseDataScraper:
                 'User-Agent': self.get_random_user_agent()
             }
             
-            response = requests.get(url, headers=headers)
+            response = fetch(url, headers=headers)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # कम्पनी टेबल फेला पार्ने
-            table = soup.find('table', class_='table table-bordered table-striped table-hover')
-            
-            if not table:
-                return self.stocks_list_cache['data'] if self.stocks_list_cache['data'] else []
-            
-            stocks = []
-            rows = table.find_all('tr')[1:]  # हेडर रो छोड्ने
-            
-            for row in rows:
-                columns = row.find_all('td')
-                if len(columns) >= 3:
-                    symbol = columns[1].text.strip()
-                    company_name = columns[2].text.strip()
-                    sector = columns[3].text.strip() if len(columns) > 3 else "N/A"
-                    
-                    stocks.append({
-                        'symbol': symbol,
-                        'company_name': company_name,
-                        'sector': sector
-                    })
+            stocks = parse_stock_list(response.text)
             
             # यदि कुनै शेयर फेला परेन भने पुरानो क्यास फर्काउने
             if not stocks:
@@ -156,6 +147,10 @@ class NepseDataScraper:
         if not force_refresh and self.nepse_data_cache['data'] and current_time - self.nepse_data_cache['last_updated'] < CACHE_EXPIRY:
             return self.nepse_data_cache['data']
         
+        # म्याद भर्खरै सकिएको भए पुरानै डाटा दिएर ब्याकग्राउन्डमा रिफ्रेस गर्ने
+        if not force_refresh and self.serve_stale('nepse_data', self.nepse_data_cache, CACHE_EXPIRY, self.fetch_nepse_data):
+            return self.nepse_data_cache['data']
+        
         try:
             print("NEPSE डाटा प्राप्त गर्दै...")
             url = 'https://www.nepalstock.com/todays_price'
@@ -163,57 +158,10 @@ class NepseDataScraper:
                 'User-Agent': self.get_random_user_agent()
             }
             
-            response = requests.get(url, headers=headers)
+            response = fetch(url, headers=headers)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # टेबल फेला पार्ने
-            table = soup.find('table', class_='table table-bordered table-striped table-hover')
-            
-            if not table:
-                return self.nepse_data_cache['data'] if self.nepse_data_cache['data'] else []
-            
-            stock_data = []
-            rows = table.find_all('tr')[1:]  # हेडर रो छोड्ने
-            
-            for row in rows:
-                columns = row.find_all('td')
-                if len(columns) >= 10:
-                    try:
-                        symbol = columns[1].text.strip()
-                        
-                        # मूल्य डाटा प्राप्त गर्ने
-                        ltp = columns[6].text.strip()
-                        change_text = columns[7].text.strip()
-                        change = float(change_text) if change_text else 0
-                        high = columns[4].text.strip()
-                        low = columns[5].text.strip()
-                        open_price = columns[3].text.strip()
-                        qty = columns[10].text.strip().replace(',', '')
-                        
-                        # प्रतिशत परिवर्तन गणना गर्ने
-                        percent_change = 0
-                        if change != 0 and ltp:
-                            try:
-                                ltp_value = float(ltp.replace(',', ''))
-                                percent_change = round((change / (ltp_value - change)) * 100, 2)
-                            except:
-                                percent_change = 0
-                        
-                        stock_data.append({
-                            'symbol': symbol,
-                            'ltp': ltp,
-                            'change': change,
-                            'percent_change': percent_change,
-                            'high': high,
-                            'low': low,
-                            'open': open_price,
-                            'qty': qty
-                        })
-                    except Exception as e:
-                        print(f"रो प्रोसेसिङमा समस्या: {str(e)}")
-                        continue
+            stock_data = parse_todays_price(response.text)
             
             # यदि कुनै डाटा फेला परेन भने पुरानो क्यास फर्काउने
             if not stock_data:
@@ -225,6 +173,9 @@ class NepseDataScraper:
                 'last_updated': current_time
             }
             
+            # स्न्यापसट र लिडरबोर्ड बनाउने
+            self.nepse_snapshot = NepseSnapshot(stock_data, current_time)
+            
             # क्यास फाइल सेभ गर्ने
             self.save_cache_files()
             
@@ -235,6 +186,16 @@ class NepseDataScraper:
             print(f"NEPSE डाटा प्राप्त गर्न समस्या: {str(e)}")
             return self.nepse_data_cache['data'] if self.nepse_data_cache['data'] else []
     
+    def serve_stale(self, key, cache, expiry, refresh):
+        """म्याद सकिएको तर MAX_STALE भित्रको क्यास भए ब्याकग्राउन्ड रिफ्रेस सुरु गरी True फर्काउने"""
+        age = time.time() - cache['last_updated']
+        
+        if not cache['data'] or age >= expiry + MAX_STALE:
+            return False
+        
+        self.refresher.background(key, refresh, True)
+        return True
+    
     def get_market_status(self):
         """बजार स्थिति प्राप्त गर्ने"""
         try:
@@ -243,7 +204,7 @@ class NepseDataScraper:
                 'User-Agent': self.get_random_user_agent()
             }
             
-            response = requests.get(url, headers=headers)
+            response = fetch(url, headers=headers)
             response.raise_for_status()
             
             soup = BeautifulSoup(response.text, 'html.parser')
@@ -275,25 +236,24 @@ class NepseDataScraper:
                 'status_text': 'Market Open' if is_open else 'Market Closed'
             }
     
+    def get_snapshot(self):
+        """हालको डाटा स्न्यापसट प्राप्त गर्ने"""
+        self.fetch_nepse_data()
+        return self.nepse_snapshot
+    
     def get_top_gainers(self, limit=10):
         """टप गेनर्स प्राप्त गर्ने"""
-        stocks = self.fetch_nepse_data()
-        
-        # प्रतिशत परिवर्तनको आधारमा सर्ट गर्ने
-        gainers = [stock for stock in stocks if float(stock['percent_change']) > 0]
-        gainers.sort(key=lambda x: float(x['percent_change']), reverse=True)
-        
-        return gainers[:limit]
+        # रिफ्रेसमा तयार गरिएको लिडरबोर्डबाट प्राप्त गर्ने
+        return self.get_snapshot().leaderboard.gainers(limit)
     
     def get_top_losers(self, limit=10):
         """टप लुजर्स प्राप्त गर्ने"""
-        stocks = self.fetch_nepse_data()
-        
-        # प्रतिशत परिवर्तनको आधारमा सर्ट गर्ने
-        losers = [stock for stock in stocks if float(stock['percent_change']) < 0]
-        losers.sort(key=lambda x: float(x['percent_change']))
-        
-        return losers[:limit]
+        # रिफ्रेसमा तयार गरिएको लिडरबोर्डबाट प्राप्त गर्ने
+        return self.get_snapshot().leaderboard.losers(limit)
+    
+    def get_leaders(self, metric='percent_change', direction='top', k=10):
+        """मेट्रिक अनुसार टप/बटम k स्टक्स प्राप्त गर्ने"""
+        return self.get_snapshot().leaderboard.leaders(metric, direction, k)
     
     def get_sectors(self):
         """सबै क्षेत्रहरू प्राप्त गर्ने"""
@@ -0,0 +1,278 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+NEPSE डाटा स्न्यापसट
+
+यो मोड्युलले todays_price बाट आएको स्टक डाटालाई हरेक रिफ्रेसमा एक पटक मात्र पार्स गरेर
+टाइप गरिएका NumPy कलमहरूमा राख्छ। API एन्डपोइन्टहरूले यही कलमहरूमा फिल्टर, सर्ट र स्लाइस
+गर्छन्, त्यसैले हरेक रिक्वेस्टमा कम्मा भएका स्ट्रिङहरू फेरि पार्स गर्नु पर्दैन।
+"""
+
+import time
+import itertools
+import numpy as np
+from nepse_leaderboard import Leaderboard
+
+# संख्यात्मक कलमहरू
+NUMERIC_FIELDS = ['ltp', 'change', 'percent_change', 'high', 'low', 'open', 'qty']
+
+# सर्ट गर्न मिल्ने फिल्डहरू
+SORT_FIELDS = ['symbol'] + NUMERIC_FIELDS
+COMPANY_TEXT_FIELDS = ['symbol', 'company_name', 'sector']
+COMPANY_NUMERIC_FIELDS = ['ltp', 'change_percent', 'high_52_week', 'low_52_week']
+COMPANY_SORT_FIELDS = ['symbol', 'company_name', 'sector', 'ltp', 'change_percent']
+
+# स्न्यापसट भर्सन काउन्टर (हरेक नयाँ स्न्यापसटमा बढ्छ)
+# प्रोसेस सुरु भएको समय (मिलिसेकेन्ड) बाट सुरु गर्ने, ताकि रिस्टार्टअघिको भर्सन नयाँ प्रोसेसको
+# [base_version, version] भित्र नपरोस् र त्यस्तो since लाई पूरा डाटा दिइयोस्
+snapshot_versions = itertools.count(int(time.time() * 1000))
+
+# डेल्टाको लागि यति भर्सनसम्मका हटाइएका सिम्बलहरू सम्झने
+DELTA_HISTORY = 100
+
+def parse_number(value):
+    """कम्मा सहितको स्ट्रिङ वा संख्यालाई float मा परिवर्तन गर्ने"""
+    if value is None or value == '':
+        return 0.0
+
+    if isinstance(value, (int, float)):
+        return float(value)
+
+    try:
+        return float(str(value).replace(',', '').strip())
+    except ValueError:
+        return 0.0
+
+def build_orders(columns, fields):
+    """हरेक फिल्डको बढ्दो र घट्दो क्रमको argsort पर्म्युटेसन एक पटक बनाउने"""
+    orders = {}
+
+    for field in fields:
+        values = columns[field]
+
+        # स्ट्रिङ कलमलाई रैंक कोडमा बदल्ने, ताकि घट्दो क्रम पनि स्टेबल होस्
+        if values.dtype.kind in ('U', 'S'):
+            values = np.unique(values, return_inverse=True)[1]
+
+        orders[(field, False)] = np.argsort(values, kind='stable')
+        orders[(field, True)] = np.argsort(-values, kind='stable')
+
+    return orders
+
+def page(indices, limit=None, offset=0):
+    """इन्डेक्सहरूमा offset र limit लागू गर्ने"""
+    offset = max(offset or 0, 0)
+
+    if limit:
+        return indices[offset:offset + limit]
+
+    return indices[offset:]
+
+class NepseSnapshot:
+    """एक रिफ्रेसको स्टक डाटा कलमहरूमा राख्ने क्लास"""
+
+    def __init__(self, records, last_updated=0):
+        """इनिसियलाइजर"""
+        # मूल रेकर्डहरू (API रेस्पोन्सको लागि)
+        self.records = list(records)
+        self.last_updated = last_updated
+        self.version = next(snapshot_versions)
+
+        # सिम्बल कलम र सिम्बल→रो इन्डेक्सहरू (ठूलो अक्षरको इन्डेक्स केस नहेरी खोज्न)
+        self.symbols = np.array([record['symbol'] for record in self.records], dtype=str)
+        self.upper_symbols = np.char.upper(self.symbols) if len(self.symbols) else self.symbols
+        self.index = {symbol: i for i, symbol in enumerate(self.symbols.tolist())}
+        self.upper_index = {symbol: i for i, symbol in enumerate(self.upper_symbols.tolist())}
+
+        # संख्यात्मक कलमहरू
+        self.columns = {}
+        for field in NUMERIC_FIELDS:
+            values = np.array([parse_number(record.get(field)) for record in self.records], dtype=np.float64)
+            self.columns[field] = values.astype(np.int64) if field == 'qty' else values
+
+        # सबै सर्ट फिल्डहरूको क्रम रिफ्रेसमा एक पटक मात्र गणना गर्ने
+        self.orders = build_orders(dict(self.columns, symbol=self.symbols), SORT_FIELDS)
+
+        # टप/बटम k लिडरबोर्ड
+        self.leaderboard = Leaderboard(self)
+
+        # रो अनुसार अन्तिम पटक फेरिएको भर्सन र हटाइएका सिम्बलहरू (link() ले अघिल्लो स्न्यापसटबाट भर्छ)
+        self.changed_at = np.full(len(self.records), self.version, dtype=np.int64)
+        self.removed = {}
+        self.base_version = self.version
+
+    def __len__(self):
+        return len(self.records)
+
+    def link(self, previous, history=DELTA_HISTORY):
+        """अघिल्लो स्न्यापसटसँग तुलना गरी रो अनुसारको परिवर्तन भर्सन र हटाइएका सिम्बलहरू राख्ने"""
+        if previous is None:
+            return self
+
+        # प्रकाशन क्रममा भर्सन सधैं बढ्दो रहोस्
+        if self.version <= previous.version:
+            self.version = next(snapshot_versions)
+            self.changed_at[:] = self.version
+
+        # अघिल्लो स्न्यापसटमा सिम्बलको रो (नभए -1)
+        old_rows = np.array([previous.index.get(symbol, -1) for symbol in self.symbols.tolist()], dtype=np.int64)
+        known = np.flatnonzero(old_rows >= 0)
+        matched = old_rows[known]
+
+        same = np.ones(len(known), dtype=bool)
+        for field in NUMERIC_FIELDS:
+            same &= self.columns[field][known] == previous.columns[field][matched]
+
+        # नफेरिएका रोहरूले अघिल्लो परिवर्तन भर्सन नै राख्छन्
+        self.changed_at[known[same]] = previous.changed_at[matched[same]]
+
+        # हटाइएका सिम्बलहरू (पुराना र फेरि थपिएकाहरू छोडेर)
+        horizon = self.version - history
+        self.removed = {
+            symbol: version for symbol, version in previous.removed.items()
+            if version > horizon and symbol not in self.index
+        }
+        for symbol in previous.index:
+            if symbol not in self.index:
+                self.removed[symbol] = self.version
+
+        self.base_version = max(previous.base_version, horizon)
+        return self
+
+    def can_diff(self, version):
+        """भर्सनदेखिको डेल्टा यो स्न्यापसटबाट दिन मिल्छ कि मिल्दैन"""
+        return self.base_version <= version <= self.version
+
+    def changed_mask(self, version):
+        """भर्सनपछि फेरिएका वा थपिएका रोहरूको मास्क"""
+        return self.changed_at > version
+
+    def removed_since(self, version):
+        """भर्सनपछि हटाइएका सिम्बलहरू"""
+        return sorted(symbol for symbol, removed in self.removed.items() if removed > version)
+
+    def column(self, field):
+        """फिल्डको कलम प्राप्त गर्ने"""
+        if field == 'symbol':
+            return self.symbols
+        return self.columns[field]
+
+    def get(self, symbol):
+        """सिम्बलको रेकर्ड प्राप्त गर्ने"""
+        i = self.index.get(symbol)
+        return self.records[i] if i is not None else None
+
+    def find(self, symbol):
+        """सिम्बलको रेकर्ड केस नहेरी प्राप्त गर्ने"""
+        i = self.index.get(symbol)
+        if i is None:
+            i = self.upper_index.get(symbol.upper())
+        return self.records[i] if i is not None else None
+
+    def lookup(self, symbols):
+        """धेरै सिम्बलका रेकर्डहरू एकै पटक (माग गरिएको क्रममा), र नभेटिएका सिम्बलहरू"""
+        found = {}
+        missing = []
+
+        for symbol in symbols:
+            record = self.find(symbol)
+            if record is None:
+                missing.append(symbol)
+            else:
+                found[symbol] = record
+
+        return found, missing
+
+    def rows(self, indices):
+        """इन्डेक्सहरू अनुसार रेकर्डहरू प्राप्त गर्ने"""
+        records = self.records
+        return [records[i] for i in indices]
+
+    def all_mask(self):
+        """सबै रो छान्ने मास्क"""
+        return np.ones(len(self.records), dtype=bool)
+
+    def symbol_mask(self, text):
+        """सिम्बलमा टेक्स्ट भएका रोहरूको मास्क"""
+        if not len(self.records):
+            return self.all_mask()
+        return np.char.find(self.upper_symbols, text.upper()) >= 0
+
+    def symbols_mask(self, symbols):
+        """दिइएका सिम्बलहरूको मास्क"""
+        return np.isin(self.symbols, list(symbols))
+
+    def range_mask(self, field, min_value=None, max_value=None):
+        """फिल्डको मान दायरा भित्र भएका रोहरूको मास्क (खाली सीमा बेवास्ता, अमान्य भए ValueError)"""
+        values = self.columns[field]
+        mask = self.all_mask()
+
+        if min_value is not None and min_value != '':
+            mask &= values >= float(min_value)
+
+        if max_value is not None and max_value != '':
+            mask &= values <= float(max_value)
+
+        return mask
+
+    def order(self, field, descending=False):
+        """फिल्ड अनुसार पहिले नै सर्ट गरिएको रो क्रम प्राप्त गर्ने"""
+        return self.orders[(field, descending)]
+
+    def select(self, mask=None, sort_by='symbol', descending=False, limit=None, offset=0):
+        """मास्क अनुसार फिल्टर गरी सर्ट गरिएको क्रमबाट पेज फर्काउने"""
+        indices = self.order(sort_by, descending)
+
+        if mask is not None:
+            indices = indices[mask[indices]]
+
+        return self.rows(page(indices, limit, offset))
+
+class CompanyList:
+    """मेरोलगानी कम्पनी सूचीको सर्ट क्रमहरू राख्ने क्लास"""
+
+    def __init__(self, records, last_updated=0):
+        """इनिसियलाइजर"""
+        self.records = list(records)
+        self.last_updated = last_updated
+
+        # कलमहरू बनाउने
+        self.columns = {}
+        for field in COMPANY_TEXT_FIELDS:
+            self.columns[field] = np.array([record.get(field, '') for record in self.records], dtype=str)
+
+        # सिम्बल→रो इन्डेक्स
+        self.index = {symbol: i for i, symbol in enumerate(self.columns['symbol'].tolist())}
+        for field in COMPANY_NUMERIC_FIELDS:
+            self.columns[field] = np.array([parse_number(record.get(field)) for record in self.records], dtype=np.float64)
+
+        # खोजको लागि सानो अक्षरका कलमहरू
+        self.lower = {field: np.char.lower(self.columns[field]) for field in COMPANY_TEXT_FIELDS}
+
+        # सबै सर्ट फिल्डहरूको क्रम
+        self.orders = build_orders(self.columns, COMPANY_SORT_FIELDS)
+
+    def __len__(self):
+        return len(self.records)
+
+    def sector_mask(self, sector):
+        """क्षेत्र मिल्ने कम्पनीहरूको मास्क"""
+        return self.lower['sector'] == sector.lower()
+
+    def search_mask(self, text):
+        """सिम्बल वा नाममा टेक्स्ट भएका कम्पनीहरूको मास्क"""
+        text = text.lower()
+        return (np.char.find(self.lower['symbol'], text) >= 0) | (np.char.find(self.lower['company_name'], text) >= 0)
+
+    def select(self, mask=None, sort_by='symbol', descending=False, limit=None, offset=0):
+        """मास्क अनुसार फिल्टर गरी सर्ट गरिएको क्रमबाट पेज फर्काउने"""
+        # थाहा नभएको फिल्ड भए मूल क्रम राख्ने
+        indices = self.orders.get((sort_by, descending))
+        if indices is None:
+            indices = np.arange(len(self.records))
+
+        if mask is not None:
+            indices = indices[mask[indices]]
+
+        return [self.records[i] for i in page(indices, limit, offset)]
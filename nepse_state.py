@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+सर्भर स्टेट
+
+यो मोड्युलको MarketState ले एक पटकको रिफ्रेसका सबै क्यासहरू (NEPSE डाटा, स्टक्स लिस्ट, बजार
+अवलोकन, कम्पनी सूची) र तिनका स्न्यापसटहरू एउटै अपरिवर्तनीय (immutable) वस्तुमा
+राख्छ। लेखकहरूले पुरानो स्टेटको प्रतिलिपिमा परिवर्तन गरी नयाँ स्टेट बनाउँछन् (copy-on-write) र
+StateHolder मा एउटै रेफरेन्स साटेर प्रकाशित गर्छन्, त्यसैले पाठकहरूले लक नलिई सधैं एउटै
+रिफ्रेसको डाटा र मेटाडाटा देख्छन्। सिम्बल अनुसारका कम्पनी विवरणहरू यहाँ होइन, सीमित LRU क्यासमा
+(nepse_cache.LRUCache) राखिन्छन्।
+"""
+
+import threading
+from nepse_snapshot import NepseSnapshot, CompanyList
+
+# क्यास नभएको स्रोतको खाली प्रविष्टि
+EMPTY_CACHE = {'data': None, 'last_updated': 0}
+
+def cache_entry(data, last_updated):
+    """क्यास प्रविष्टि बनाउने (प्रकाशित भएपछि परिवर्तन गरिँदैन)"""
+    return {'data': data, 'last_updated': last_updated}
+
+class MarketState:
+    """एक पटक प्रकाशित भएका सबै क्यासहरूको अपरिवर्तनीय स्टेट"""
+
+    __slots__ = ('nepse_data', 'stocks_list', 'market_overview', 'companies', 'snapshot', 'company_list')
+
+    def __init__(self, nepse_data=None, stocks_list=None, market_overview=None, companies=None,
+                 snapshot=None, company_list=None):
+        """इनिसियलाइजर"""
+        fields = {
+            'nepse_data': nepse_data or cache_entry([], 0),
+            'stocks_list': stocks_list or cache_entry([], 0),
+            'market_overview': market_overview or cache_entry({}, 0),
+            'companies': companies or cache_entry([], 0),
+            'snapshot': NepseSnapshot([], 0) if snapshot is None else snapshot,
+            'company_list': CompanyList([], 0) if company_list is None else company_list
+        }
+
+        for name, value in fields.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('MarketState is immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError('MarketState is immutable')
+
+    def replace(self, **changes):
+        """केही फिल्डहरू मात्र बदलिएको नयाँ स्टेट बनाउने"""
+        fields = {name: getattr(self, name) for name in self.__slots__}
+        fields.update(changes)
+        return MarketState(**fields)
+
+class StateHolder:
+    """हालको MarketState राख्ने क्लास
+
+    पढ्दा लक चाहिँदैन (रेफरेन्स पढाइ एटोमिक हुन्छ)। लेखकहरू मात्र लकले क्रमबद्ध हुन्छन्, ताकि
+    एकै साथ भएका दुई प्रकाशनमध्ये एउटाको परिवर्तन अर्कोले नमेटोस्।
+    """
+
+    def __init__(self, state=None):
+        """इनिसियलाइजर"""
+        self.state = state or MarketState()
+        self.lock = threading.Lock()
+
+    def current(self):
+        """हालको स्टेट प्राप्त गर्ने"""
+        return self.state
+
+    def update(self, func):
+        """func(हालको स्टेट) ले फर्काएको नयाँ स्टेट प्रकाशित गर्ने"""
+        with self.lock:
+            self.state = func(self.state)
+            return self.state
+
+    def publish(self, **changes):
+        """केही फिल्डहरू बदलेर नयाँ स्टेट प्रकाशित गर्ने"""
+        with self.lock:
+            self.state = self.state.replace(**changes)
+            return self.state
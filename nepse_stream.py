@@ -0,0 +1,484 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+रियल-टाइम पुश स्ट्रिम
+
+यो मोड्युलले js/realtime_data.js को WebSocket प्रोटोकल लागू गर्छ। क्लाइन्टले
+{action: 'subscribe' | 'unsubscribe', type: 'stock', symbol} (वा type: 'index', index) पठाउँछ, र
+सर्भरले stock_update, index_update, market_status र error सन्देशहरू पठाउँछ।
+
+सबै कनेक्सनहरू एउटै asyncio इभेन्ट लुपमा (छुट्टै थ्रेडमा) चल्छन्, त्यसैले हजारौं निष्क्रिय
+कनेक्सनको लागि हजारौं थ्रेड चाहिँदैन। नयाँ स्न्यापसट प्रकाशित हुँदा फेरिएका कोटहरू मात्र
+एक पटक फ्रेममा सिरियलाइज गरिन्छन् र ती सिम्बलका सब्स्क्राइबरहरूलाई मात्र पठाइन्छन्।
+WebSocket (RFC 6455) को आवश्यक भाग मात्र stdlib बाटै लागू गरिएको छ।
+"""
+
+import json
+import base64
+import struct
+import asyncio
+import hashlib
+import threading
+import numpy as np
+
+WEBSOCKET_GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+STREAM_PATH = '/ws'
+
+# WebSocket opcode हरू
+OP_CONTINUATION = 0x0
+OP_TEXT = 0x1
+OP_BINARY = 0x2
+OP_CLOSE = 0x8
+OP_PING = 0x9
+OP_PONG = 0xA
+
+# सीमाहरू
+MAX_HANDSHAKE = 8 * 1024
+MAX_MESSAGE = 64 * 1024
+MAX_CLIENTS = 10000
+MAX_SUBSCRIPTIONS = 500
+MAX_WRITE_BUFFER = 1024 * 1024  # यति भन्दा बढी नपठाइएको डाटा भए ढिलो क्लाइन्ट बन्द गर्ने
+PING_INTERVAL = 30  # सेकेन्ड
+
+# stock_update पेलोडका फिल्डहरू (क्रम quote_payload अनुसार)
+QUOTE_FIELDS = ['ltp', 'change', 'percent_change', 'high', 'low', 'open', 'qty']
+
+def accept_key(key):
+    """Sec-WebSocket-Key बाट Sec-WebSocket-Accept बनाउने"""
+    return base64.b64encode(hashlib.sha1((key + WEBSOCKET_GUID).encode('ascii')).digest()).decode('ascii')
+
+def encode_frame(payload, opcode=OP_TEXT):
+    """सर्भरबाट पठाइने (मास्क नगरिएको) फ्रेम बनाउने"""
+    length = len(payload)
+
+    if length < 126:
+        header = struct.pack('!BB', 0x80 | opcode, length)
+    elif length < 1 << 16:
+        header = struct.pack('!BBH', 0x80 | opcode, 126, length)
+    else:
+        header = struct.pack('!BBQ', 0x80 | opcode, 127, length)
+
+    return header + payload
+
+def message_frame(message):
+    """सन्देशलाई JSON टेक्स्ट फ्रेममा बदल्ने"""
+    return encode_frame(json.dumps(message, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+
+def unmask(payload, mask):
+    """क्लाइन्टको मास्क गरिएको पेलोड खोल्ने"""
+    length = len(payload)
+    if not length:
+        return payload
+
+    key = int.from_bytes((mask * (length // 4 + 1))[:length], 'big')
+    return (int.from_bytes(payload, 'big') ^ key).to_bytes(length, 'big')
+
+def error_frame(message):
+    """error सन्देश फ्रेम"""
+    return message_frame({'type': 'error', 'message': message})
+
+def quote_payload(record, values):
+    """realtime_data.js ले अपेक्षा गर्ने stock_update पेलोड"""
+    ltp, change, percent_change, high, low, open_price, qty = values
+    return {
+        'symbol': record['symbol'],
+        'ltp': ltp,
+        'change': change,
+        'changePercent': percent_change,
+        'high': high,
+        'low': low,
+        'open': open_price,
+        'volume': qty
+    }
+
+def changed_rows(snapshot, previous):
+    """अघिल्लो पठाइएको स्न्यापसटपछि फेरिएका (वा नयाँ) रोहरूको इन्डेक्स"""
+    if previous is None or not len(previous) or not snapshot.can_diff(previous.version):
+        return np.arange(len(snapshot))
+
+    return np.flatnonzero(snapshot.changed_mask(previous.version))
+
+class StreamClient:
+    """एउटा WebSocket कनेक्सन र त्यसका सब्स्क्रिप्सनहरू"""
+
+    __slots__ = ('reader', 'writer', 'symbols', 'indices', 'closed')
+
+    def __init__(self, reader, writer):
+        """इनिसियलाइजर"""
+        self.reader = reader
+        self.writer = writer
+        self.symbols = set()
+        self.indices = set()
+        self.closed = False
+
+    def send(self, frame):
+        """फ्रेम पठाउने (ढिलो क्लाइन्ट भए बन्द गर्ने)"""
+        if self.closed:
+            return False
+
+        transport = self.writer.transport
+        if transport.is_closing() or transport.get_write_buffer_size() > MAX_WRITE_BUFFER:
+            self.close()
+            return False
+
+        self.writer.write(frame)
+        return True
+
+    def close(self):
+        """कनेक्सन बन्द गर्ने"""
+        if not self.closed:
+            self.closed = True
+            self.writer.close()
+
+class StreamHub:
+    """सब्स्क्राइबरहरूलाई कोट, इन्डेक्स र बजार स्थिति पुश गर्ने WebSocket सर्भर"""
+
+    def __init__(self, host='0.0.0.0', port=5001, max_clients=MAX_CLIENTS):
+        """इनिसियलाइजर"""
+        self.host = host
+        self.port = port
+        self.max_clients = max_clients
+
+        self.loop = None
+        self.thread = None
+        self.ready = threading.Event()
+
+        # लुप थ्रेडमा मात्र प्रयोग हुने स्टेट
+        self.clients = set()
+        self.subscribers = {}  # सिम्बल → क्लाइन्टहरू
+        self.index_subscribers = {}  # इन्डेक्स → क्लाइन्टहरू
+
+        # नयाँ सब्स्क्राइबरलाई तुरुन्तै पठाइने पछिल्ला फ्रेमहरू
+        self.quote_frames = {}
+        self.index_frames = {}
+        self.status_frame = None
+        self.market_open = None
+
+        # स्न्यापसट भिन्नता (जुनसुकै थ्रेडबाट publish हुन सक्छ)
+        self.lock = threading.Lock()
+        self.snapshot = None
+
+        # तथ्याङ्क
+        self.messages = 0
+        self.dropped = 0
+
+    # ---- प्रकाशन (जुनसुकै थ्रेडबाट) ----
+
+    def call(self, func, *args):
+        """लुप थ्रेडमा func चलाउने (सर्भर सुरु नभएको भए सिधै)"""
+        if self.loop is None:
+            func(*args)
+        else:
+            self.loop.call_soon_threadsafe(func, *args)
+
+    def publish_quotes(self, snapshot):
+        """नयाँ स्न्यापसटका फेरिएका कोटहरू सब्स्क्राइबरहरूलाई पठाउने"""
+        with self.lock:
+            if self.snapshot is not None and snapshot.version <= self.snapshot.version:
+                return 0
+            rows = changed_rows(snapshot, self.snapshot)
+            self.snapshot = snapshot
+
+        if not len(rows):
+            return 0
+
+        columns = [snapshot.column(field)[rows].tolist() for field in QUOTE_FIELDS]
+
+        # हरेक फेरिएको कोट एक पटक मात्र सिरियलाइज गर्ने
+        frames = {}
+        for i, row in enumerate(rows.tolist()):
+            record = snapshot.records[row]
+            payload = quote_payload(record, [column[i] for column in columns])
+            frames[record['symbol']] = message_frame({'type': 'stock_update', 'payload': payload})
+
+        self.call(self.broadcast_quotes, frames)
+        return len(frames)
+
+    def publish_index(self, index, value, change, change_percent):
+        """इन्डेक्स अपडेट पठाउने"""
+        frame = message_frame({
+            'type': 'index_update',
+            'payload': {'index': index, 'value': value, 'change': change, 'changePercent': change_percent}
+        })
+        self.call(self.broadcast_index, index, frame)
+
+    def publish_market_status(self, is_open):
+        """बजार स्थिति फेरिएमा सबै क्लाइन्टलाई पठाउने"""
+        self.call(self.broadcast_status, bool(is_open))
+
+    # ---- लुप थ्रेडमा चल्ने ----
+
+    def broadcast_quotes(self, frames):
+        """फेरिएका सिम्बलहरूका सब्स्क्राइबरहरूलाई मात्र पठाउने"""
+        self.quote_frames.update(frames)
+
+        for symbol, frame in frames.items():
+            for client in tuple(self.subscribers.get(symbol, ())):
+                self.deliver(client, frame)
+
+    def broadcast_index(self, index, frame):
+        """इन्डेक्सका सब्स्क्राइबरहरूलाई पठाउने"""
+        self.index_frames[index] = frame
+
+        for client in tuple(self.index_subscribers.get(index, ())):
+            self.deliver(client, frame)
+
+    def broadcast_status(self, is_open):
+        """बजार स्थिति फेरिएमा मात्र सबैलाई पठाउने"""
+        if is_open == self.market_open:
+            return
+
+        self.market_open = is_open
+        self.status_frame = message_frame({
+            'type': 'market_status',
+            'payload': {'isOpen': is_open, 'message': 'बजार खुला छ' if is_open else 'बजार बन्द छ'}
+        })
+
+        for client in tuple(self.clients):
+            self.deliver(client, self.status_frame)
+
+    def deliver(self, client, frame):
+        """एउटा क्लाइन्टलाई फ्रेम पठाउने"""
+        if client.send(frame):
+            self.messages += 1
+        else:
+            self.dropped += 1
+            self.remove(client)
+
+    def remove(self, client):
+        """क्लाइन्ट र त्यसका सब्स्क्रिप्सनहरू हटाउने"""
+        self.clients.discard(client)
+
+        for symbol in client.symbols:
+            subscribers = self.subscribers.get(symbol)
+            if subscribers is not None:
+                subscribers.discard(client)
+                if not subscribers:
+                    del self.subscribers[symbol]
+
+        for index in client.indices:
+            subscribers = self.index_subscribers.get(index)
+            if subscribers is not None:
+                subscribers.discard(client)
+                if not subscribers:
+                    del self.index_subscribers[index]
+
+        client.symbols.clear()
+        client.indices.clear()
+
+    def handle_message(self, client, text):
+        """क्लाइन्टको subscribe/unsubscribe सन्देश प्रोसेस गर्ने"""
+        try:
+            message = json.loads(text)
+        except ValueError:
+            client.send(error_frame('Invalid JSON message'))
+            return
+
+        if not isinstance(message, dict):
+            client.send(error_frame('Invalid message'))
+            return
+
+        action = message.get('action')
+        kind = message.get('type')
+
+        if action not in ('subscribe', 'unsubscribe'):
+            client.send(error_frame(f'Unknown action: {action}'))
+            return
+
+        if kind == 'stock':
+            name = str(message.get('symbol') or '').strip().upper()
+            owned, registry, frames = client.symbols, self.subscribers, self.quote_frames
+        elif kind == 'index':
+            name = str(message.get('index') or '').strip().upper()
+            owned, registry, frames = client.indices, self.index_subscribers, self.index_frames
+        else:
+            client.send(error_frame(f'Unknown type: {kind}'))
+            return
+
+        if not name:
+            client.send(error_frame('Symbol is required' if kind == 'stock' else 'Index is required'))
+            return
+
+        if action == 'unsubscribe':
+            owned.discard(name)
+            subscribers = registry.get(name)
+            if subscribers is not None:
+                subscribers.discard(client)
+                if not subscribers:
+                    del registry[name]
+            return
+
+        if name not in owned and len(client.symbols) + len(client.indices) >= MAX_SUBSCRIPTIONS:
+            client.send(error_frame(f'At most {MAX_SUBSCRIPTIONS} subscriptions are allowed'))
+            return
+
+        # अज्ञात सिम्बल (स्न्यापसट भइसकेपछि मात्र जाँच्न मिल्छ)
+        snapshot = self.snapshot
+        if kind == 'stock' and snapshot is not None and len(snapshot) and name not in snapshot.index:
+            client.send(error_frame(f'Unknown symbol: {name}'))
+            return
+
+        owned.add(name)
+        registry.setdefault(name, set()).add(client)
+
+        # हालको मान तुरुन्तै पठाउने
+        frame = frames.get(name)
+        if frame is not None:
+            self.deliver(client, frame)
+
+    async def read_frame(self, reader):
+        """एउटा फ्रेम पढ्ने: (fin, opcode, पेलोड)"""
+        first, second = await reader.readexactly(2)
+        fin = bool(first & 0x80)
+        opcode = first & 0x0F
+        masked = bool(second & 0x80)
+        length = second & 0x7F
+
+        if length == 126:
+            length = struct.unpack('!H', await reader.readexactly(2))[0]
+        elif length == 127:
+            length = struct.unpack('!Q', await reader.readexactly(8))[0]
+
+        if length > MAX_MESSAGE:
+            raise ValueError('message too big')
+
+        # क्लाइन्टका फ्रेमहरू मास्क गरिएका हुनुपर्छ
+        if not masked:
+            raise ValueError('unmasked client frame')
+
+        mask = await reader.readexactly(4)
+        payload = unmask(await reader.readexactly(length), mask)
+        return fin, opcode, payload
+
+    async def handshake(self, reader, writer):
+        """HTTP अपग्रेड ह्यान्डसेक (सफल भए True)"""
+        request = await reader.readuntil(b'\r\n\r\n')
+        lines = request.decode('latin-1').split('\r\n')
+        parts = lines[0].split()
+
+        headers = {}
+        for line in lines[1:]:
+            if ':' in line:
+                name, value = line.split(':', 1)
+                headers[name.strip().lower()] = value.strip()
+
+        key = headers.get('sec-websocket-key')
+        path = parts[1].split('?')[0] if len(parts) >= 2 else ''
+
+        if len(parts) < 3 or parts[0] != 'GET' or path != STREAM_PATH:
+            writer.write(b'HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\nConnection: close\r\n\r\n')
+            return False
+
+        if headers.get('upgrade', '').lower() != 'websocket' or not key:
+            writer.write(b'HTTP/1.1 426 Upgrade Required\r\nSec-WebSocket-Version: 13\r\n'
+                         b'Content-Length: 0\r\nConnection: close\r\n\r\n')
+            return False
+
+        if len(self.clients) >= self.max_clients:
+            writer.write(b'HTTP/1.1 503 Service Unavailable\r\nContent-Length: 0\r\nConnection: close\r\n\r\n')
+            return False
+
+        writer.write(
+            'HTTP/1.1 101 Switching Protocols\r\n'
+            'Upgrade: websocket\r\n'
+            'Connection: Upgrade\r\n'
+            f'Sec-WebSocket-Accept: {accept_key(key)}\r\n\r\n'.encode('ascii')
+        )
+        return True
+
+    async def handle(self, reader, writer):
+        """एउटा कनेक्सन ह्यान्डल गर्ने"""
+        client = None
+
+        try:
+            if not await self.handshake(reader, writer):
+                await writer.drain()
+                return
+
+            client = StreamClient(reader, writer)
+            self.clients.add(client)
+
+            # जोडिनेबित्तिकै बजार स्थिति पठाउने
+            if self.status_frame is not None:
+                self.deliver(client, self.status_frame)
+
+            fragments = []
+            while not client.closed:
+                fin, opcode, payload = await self.read_frame(reader)
+
+                if opcode == OP_CLOSE:
+                    client.send(encode_frame(payload[:2], OP_CLOSE))
+                    break
+                elif opcode == OP_PING:
+                    client.send(encode_frame(payload, OP_PONG))
+                elif opcode in (OP_TEXT, OP_BINARY, OP_CONTINUATION):
+                    fragments.append(payload)
+                    if sum(len(fragment) for fragment in fragments) > MAX_MESSAGE:
+                        raise ValueError('message too big')
+
+                    if fin:
+                        message, fragments = b''.join(fragments), []
+                        if opcode != OP_BINARY:
+                            self.handle_message(client, message.decode('utf-8', 'replace'))
+
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            pass
+        except ValueError as e:
+            # प्रोटोकल त्रुटि: 1002 सहित बन्द गर्ने
+            if client is not None:
+                client.send(encode_frame(struct.pack('!H', 1002) + str(e).encode('utf-8')[:100], OP_CLOSE))
+        finally:
+            if client is not None:
+                self.remove(client)
+                client.close()
+            else:
+                writer.close()
+
+    async def keepalive(self):
+        """निष्क्रिय कनेक्सनहरू (र बीचका प्रोक्सीहरू) जीवित राख्न ping पठाउने"""
+        ping = encode_frame(b'', OP_PING)
+
+        while True:
+            await asyncio.sleep(PING_INTERVAL)
+            for client in tuple(self.clients):
+                if not client.send(ping):
+                    self.remove(client)
+
+    async def serve(self):
+        """सर्भर चलाउने"""
+        self.loop = asyncio.get_running_loop()
+        server = await asyncio.start_server(self.handle, self.host, self.port, limit=MAX_HANDSHAKE, backlog=1024)
+        self.ready.set()
+
+        async with server:
+            await asyncio.gather(server.serve_forever(), self.keepalive())
+
+    def run(self):
+        """थ्रेडमा इभेन्ट लुप चलाउने"""
+        try:
+            asyncio.run(self.serve())
+        except Exception as e:
+            print(f"पुश स्ट्रिम सर्भर त्रुटि: {str(e)}")
+        finally:
+            self.loop = None
+            self.ready.set()
+
+    def start(self):
+        """ब्याकग्राउन्ड थ्रेडमा सर्भर सुरु गर्ने"""
+        if self.thread is not None:
+            return
+
+        self.thread = threading.Thread(target=self.run, name='push-stream')
+        self.thread.daemon = True
+        self.thread.start()
+        self.ready.wait()
+
+    def stats(self):
+        """तथ्याङ्क प्राप्त गर्ने"""
+        return {
+            'clients': len(self.clients),
+            'symbols': len(self.subscribers),
+            'messages': self.messages,
+            'dropped': self.dropped
+        }
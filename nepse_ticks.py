@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+इन्ट्राडे टिक रिङ बफरहरू
+
+यो मोड्युलको TickBuffers ले हरेक सिम्बलको लागि निश्चित साइजको रिङ बफरमा हरेक रिफ्रेसको
+(समय, LTP, कुल कारोबार परिमाण) राख्छ। सबै बफरहरू सुरुमै एउटै NumPy एरेमा (सिम्बल × क्षमता)
+छुट्याइन्छन्, त्यसैले मेमोरी स्थिर रहन्छ र पूरा ट्रेडिङ सेसन केही MB मै अटाउँछ। नयाँ दिनको पहिलो
+टिक आउँदा बफरहरू खाली गरिन्छन्, त्यसैले बफरमा सधैं हालको (वा अन्तिम) सेसन मात्र हुन्छ।
+"""
+
+import time
+import threading
+from datetime import datetime
+import numpy as np
+
+# डिफल्ट साइज: 512 सिम्बल × 256 टिक × 3 कलम × 8 बाइट ≈ 3 MB
+DEFAULT_MAX_SYMBOLS = 512
+DEFAULT_CAPACITY = 256
+
+def session_day(ts):
+    """टाइमस्ट्याम्पको स्थानीय मिति (सेसन छुट्याउन)"""
+    return datetime.fromtimestamp(ts).date()
+
+def downsample(values, points):
+    """सूचीलाई बढीमा points वटा समान दूरीका बिन्दुहरूमा घटाउने (पहिलो र अन्तिम राखेर)"""
+    if not points or len(values) <= points:
+        return values
+
+    indices = np.linspace(0, len(values) - 1, points).round().astype(np.int64)
+    return values[indices]
+
+class TickBuffers:
+    """सिम्बल अनुसार (समय, LTP, परिमाण) राख्ने पहिल्यै छुट्याइएका रिङ बफरहरू"""
+
+    def __init__(self, max_symbols=DEFAULT_MAX_SYMBOLS, capacity=DEFAULT_CAPACITY):
+        """इनिसियलाइजर"""
+        self.max_symbols = max(int(max_symbols), 1)
+        self.capacity = max(int(capacity), 2)
+
+        shape = (self.max_symbols, self.capacity)
+        self.times = np.zeros(shape, dtype=np.float64)
+        self.ltp = np.zeros(shape, dtype=np.float64)
+        self.qty = np.zeros(shape, dtype=np.float64)
+
+        # रो अनुसार अर्को लेख्ने स्थान र भरिएका टिक संख्या
+        self.heads = np.zeros(self.max_symbols, dtype=np.int64)
+        self.counts = np.zeros(self.max_symbols, dtype=np.int64)
+
+        # सिम्बल → रो
+        self.rows = {}
+
+        self.lock = threading.Lock()
+        self.last_updated = 0
+        self.version = 0
+        self.dropped = 0
+
+    def nbytes(self):
+        """बफरहरूले ओगटेको मेमोरी (बाइटमा)"""
+        return self.times.nbytes + self.ltp.nbytes + self.qty.nbytes + self.heads.nbytes + self.counts.nbytes
+
+    def clear(self):
+        """सबै बफरहरू खाली गर्ने (मेमोरी फेरि छुट्याउँदैन)"""
+        with self.lock:
+            self.reset()
+
+    def reset(self):
+        """लक लिएर मात्र कल गर्ने"""
+        self.heads[:] = 0
+        self.counts[:] = 0
+        self.rows.clear()
+        self.version += 1
+
+    def row_indices(self, symbols):
+        """सिम्बलहरूको रो (नभए नयाँ दिने, ठाउँ नभए -1) — लक लिएर मात्र कल गर्ने"""
+        indices = np.empty(len(symbols), dtype=np.int64)
+
+        for i, symbol in enumerate(symbols):
+            row = self.rows.get(symbol)
+            if row is None:
+                if len(self.rows) < self.max_symbols:
+                    row = len(self.rows)
+                    self.rows[symbol] = row
+                else:
+                    row = -1
+                    self.dropped += 1
+            indices[i] = row
+
+        return indices
+
+    def record(self, snapshot):
+        """स्न्यापसटको हरेक सिम्बलको LTP र परिमाण एउटा टिकको रूपमा थप्ने"""
+        ts = snapshot.last_updated or time.time()
+        if not len(snapshot):
+            return False
+
+        with self.lock:
+            # एउटै स्न्यापसट दोहोरो नथप्ने
+            if ts <= self.last_updated:
+                return False
+
+            # नयाँ सेसन सुरु भए पुरानो सेसन हटाउने
+            if self.last_updated and session_day(ts) != session_day(self.last_updated):
+                self.reset()
+
+            rows = self.row_indices(snapshot.column('symbol').tolist())
+            valid = rows >= 0
+            rows = rows[valid]
+            positions = self.heads[rows]
+
+            self.times[rows, positions] = ts
+            self.ltp[rows, positions] = snapshot.column('ltp')[valid]
+            self.qty[rows, positions] = snapshot.column('qty')[valid]
+
+            self.heads[rows] = (positions + 1) % self.capacity
+            self.counts[rows] = np.minimum(self.counts[rows] + 1, self.capacity)
+
+            self.last_updated = ts
+            self.version += 1
+            return True
+
+    def order(self, row):
+        """रोका टिकहरू पुरानोदेखि नयाँ क्रमका इन्डेक्सहरू — लक लिएर मात्र कल गर्ने"""
+        count = self.counts[row]
+        return (self.heads[row] - count + np.arange(count)) % self.capacity
+
+    def series(self, symbol):
+        """सिम्बलका टिकहरू (समय, LTP, परिमाण) को प्रतिलिपि, नभए None"""
+        with self.lock:
+            row = self.rows.get(symbol)
+            if row is None:
+                return None
+
+            indices = self.order(row)
+            return {
+                'time': self.times[row, indices],
+                'ltp': self.ltp[row, indices],
+                'qty': self.qty[row, indices]
+            }
+
+    def sparklines(self, symbols, points=None):
+        """धेरै सिम्बलका LTP शृङ्खलाहरू एकै पटक (नभएका सिम्बलहरू छुट्याएर)"""
+        lines = {}
+        missing = []
+
+        with self.lock:
+            for symbol in symbols:
+                row = self.rows.get(symbol)
+                if row is None:
+                    missing.append(symbol)
+                    continue
+                lines[symbol] = self.ltp[row, self.order(row)]
+
+        return {symbol: downsample(values, points) for symbol, values in lines.items()}, missing
+
+    def stats(self):
+        """तथ्याङ्क प्राप्त गर्ने"""
+        with self.lock:
+            return {
+                'symbols': len(self.rows),
+                'max_symbols': self.max_symbols,
+                'capacity': self.capacity,
+                'ticks': int(self.counts.sum()),
+                'dropped': self.dropped,
+                'bytes': self.nbytes(),
+                'last_updated': self.last_updated
+            }